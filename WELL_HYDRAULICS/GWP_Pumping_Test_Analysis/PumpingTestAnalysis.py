@@ -1,4 +1,8 @@
 import streamlit as st
+from engine import start_warm_up
+
+# Libraries, type curves and data sets of the pages are prepared in the background while the landing page is read
+start_warm_up()
 
 # Authors, institutions, and year
 year = 2025 
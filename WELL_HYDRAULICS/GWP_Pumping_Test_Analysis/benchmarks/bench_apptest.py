@@ -0,0 +1,344 @@
+"""Headless load test of all pages of both apps with Streamlit AppTest.
+
+Every page of the Pumping Test Analysis and the Well capture app is run
+without a browser (streamlit.testing.v1.AppTest) through a scripted
+sequence of interactions as a class would use it: slider sweeps, data set
+and solution switches, toggles, a CSV upload and button clicks (SCENARIOS).
+Each interaction is one rerun of the page script. Each page runs in a fresh
+process, so the first run includes the imports and the tables built once per
+server process and the memory of the pages is not mixed up. With
+--after-landing the landing page of the app is run first and its warm-up
+(engine.warmup) is awaited, as for a student who opens the app after a
+restart and then selects the page.
+
+Per page the report gives the time of the first run, p50, p95 and max of
+the rerun latency, the CPU time of the process (all threads, process_time),
+the resident set size after the sequence, its growth during the sequence
+and the peak (psutil and getrusage), and the exceptions raised by the page.
+The results are written as JSON together with the commit, the Python and
+the Streamlit version. With --baseline the p50 and p95 are compared with an
+earlier result file and pages that are slower than --tolerance are listed;
+--fail-on-error and --fail-on-regression set the exit status to 1 for CI.
+Nothing is fetched from the network, so the suite runs offline.
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Pumping_Test_Analysis/benchmarks/bench_apptest.py [--output bench_apptest.json]
+        [--repeat 1] [--pages 03 06 ...] [--baseline earlier.json [--tolerance 0.25]]
+        [--after-landing] [--fail-on-error] [--fail-on-regression]
+"""
+import argparse
+import concurrent.futures
+import datetime
+import glob
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+import warnings
+
+import numpy as np
+import psutil
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+APPS = {
+    'Pumping Test Analysis': os.path.join('WELL_HYDRAULICS', 'GWP_Pumping_Test_Analysis'),
+    'Well capture': os.path.join('WELL_HYDRAULICS', 'GWP_Well_capture'),
+}
+LANDING_PAGES = {'Pumping Test Analysis': 'PumpingTestAnalysis.py', 'Well capture': 'WellCapture.py'}
+TIMEOUT = 300  # s per rerun (the misfit map and the process-pool fits are the slowest)
+OUTPUT = 'bench_apptest.json'
+TOLERANCE = 0.25  # slower by more than 25 % than the baseline is reported as a regression
+CSV_ROWS = 20000  # rows of the uploaded logger file
+
+
+def logger_csv(rows=CSV_ROWS, seed=0):
+    # CSV of a dense pressure logger record (time in minutes, drawdown in meters) as uploaded on page 06
+    sys.path.insert(0, os.path.join(ROOT, APPS['Pumping Test Analysis']))
+    from engine import compute_s_Theis
+    rng = np.random.default_rng(seed)
+    time_min = np.linspace(1 / 60, rows / 60, rows)
+    drawdown = compute_s_Theis(5E-3, 2E-4, time_min * 60, 0.005, 50) + rng.normal(0, 0.002, rows)
+    lines = ['time_min,drawdown_m'] + [f'{t:.6f},{s:.6f}' for t, s in zip(time_min, drawdown)]
+    return ('logger.csv', '\n'.join(lines).encode(), 'text/csv')
+
+
+def sweep(name, values):
+    return [('slider', name, value) for value in values]
+
+
+# Interactions per page (app, file name pattern): (widget type, key or part of the label, value)
+# The quizzes (streamlit_book) are answered once, each page gets at least one interaction
+SCENARIOS = {
+    ('Pumping Test Analysis', 'PumpingTestAnalysis.py'): [],
+    ('Pumping Test Analysis', 'pages/01_*.py'): [
+        ('radio', 'What is considered as transient', 'A system in which head changes over time.'),
+        ('radio', 'ability of an aquifer to transmit water', 'Transmissivity'),
+    ],
+    ('Pumping Test Analysis', 'pages/02_*.py'): [
+        *sweep('Q_input', (0.005, 0.01, 0.015, 0.02)),
+        *sweep('T_input', (-3.5, -3.0, -2.5, -2.0)),
+        *sweep('S_input', (-5.0, -4.0, -3.0)),
+        ('slider', 'Distance $r$', 250),
+        ('slider', 'Time $t$', 3 * 86400.),
+        ('toggle', 'Second set of $T$ and $S$', True),
+    ],
+    ('Pumping Test Analysis', 'pages/03_*.py'): [
+        *sweep('T_input_1', (-3.0, -2.8, -2.6, -2.4, -2.2, -2.0)),
+        *sweep('S_input_1', (-4.5, -4.0, -3.5)),
+        ('toggle', '31', True),
+        ('toggle', '16', True),
+        ('toggle', '41', True),
+        ('toggle', '51', True),
+        ('toggle', '36', True),
+        *sweep('T_input_3', (-2.5, -2.0)),
+    ],
+    ('Pumping Test Analysis', 'pages/04_*.py'): [
+        *sweep('T_input_1', (-3.0, -2.6, -2.2)),
+        *sweep('r_div_B_input_1', (-1.0, -0.7, -0.4, -0.1)),
+        ('toggle', '31', True),
+        ('toggle', '26', True),
+        *sweep('r_div_B_input_1', (-0.9, -0.6, -0.3)),
+        ('toggle', '36', True),
+    ],
+    ('Pumping Test Analysis', 'pages/05_*.py'): [
+        *sweep('T_input', (-2.5, -2.0, -1.5)),
+        *sweep('beta_input', (-2.5, -2.0, -1.5)),
+        *sweep('SY_input', (0.1, 0.2, 0.3)),
+        ('toggle', 'Show scatter plot', True),
+        ('toggle', 'Type-curve mode', True),
+        *sweep('beta_input', (-2.0, -1.0)),
+        ('toggle', 'Interactive plot', True),
+    ],
+    ('Pumping Test Analysis', 'pages/06_*.py'): [
+        *sweep('T_input', (-3.0, -2.5, -2.0)),
+        ('toggle', 'Show scatter plot', True),
+        ('selectbox', 'Data', 'Viterbo (IT) 2023'),
+        ('selectbox', 'Data', 'Varnum (SWE) 2016 - R12'),
+        ('toggle', 'Fit automatically', True),
+        ('toggle', 'misfit map', True),
+        ('toggle', 'misfit map', False),
+        ('selectbox', 'Solution', 'Hantush-Jacob'),
+        ('selectbox', 'Data', 'Pirna (DE) 2024'),
+        ('selectbox', 'Solution', 'Neuman'),
+        ('toggle', 'Fit automatically', False),
+        ('selectbox', 'Solution', 'Theis'),
+        ('selectbox', 'Data', 'Load own CSV dataset'),
+        ('upload', 'Choose a file', logger_csv),
+        ('toggle', 'Decimate', True),
+        *sweep('T_input', (-2.5, -2.0)),
+    ],
+    ('Pumping Test Analysis', 'pages/07_*.py'): [
+        *sweep('T_input', (-2.5, -2.0, -1.5)),
+        *sweep('S_input', (-4.5, -3.5)),
+        ('toggle', 'Show scatter plot', True),
+        ('toggle', 'Define the noise', True),
+        ('toggle', 'longer pumping test', True),
+        ('button', 'Regenerate data', None),
+        ('toggle', 'Make the prediction', True),
+    ],
+    ('Pumping Test Analysis', 'pages/08_*.py'): [],
+    ('Well capture', 'WellCapture.py'): [],
+    ('Well capture', 'pages/01_*.py'): [],
+    ('Well capture', 'pages/02_*.py'): [
+        *sweep('Pumping rate', (0.01, 0.02, 0.05)),
+        *sweep('Gradient of regional flow', (-3.5, -2.5, -2.0)),
+        *sweep('Hydr. conductivity', (-4.0, -3.5, -2.5)),
+        ('slider', 'Aquifer thickness', 40.),
+        ('slider', 'Plot scaling in x direction', 2.),
+        ('toggle', 'Travel-time capture zones', True),
+        *sweep('Porosity', (0.1, 0.3)),
+        *sweep('Pumping rate', (0.005, 0.1)),
+        ('toggle', 'Multiple wells', True),
+        *sweep('Grid points per axis', (200, 800)),
+        *sweep('Gradient of regional flow', (-3.5, -3.0)),
+        ('toggle', 'Multiple wells', False),
+        ('toggle', 'Capture probability', True),
+        *sweep('Standard deviation of log10 K', (0.5, 0.1)),
+        *sweep('Hydr. conductivity', (-3.0, -4.0)),
+        ('toggle', 'Capture probability', False),
+        ('toggle', 'Capture design', True),
+        ('toggle', 'Optimise the well position', True),
+        *sweep('Largest distance of the well downstream', (0., 500.)),
+        *sweep('Gradient of regional flow', (-2.5, -3.0)),
+    ],
+    ('Well capture', 'pages/03_*.py'): [],
+}
+
+
+def page_files(pages=None):
+    # (app, pattern, file) of the scenarios, optionally only the files whose name starts with one of pages
+    files = []
+    for (app, pattern), _ in SCENARIOS.items():
+        for path in sorted(glob.glob(os.path.join(ROOT, APPS[app], pattern))):
+            if not pages or any(os.path.basename(path).startswith(page) for page in pages):
+                files.append((app, pattern, path))
+    return files
+
+
+def widget(at, kind, name):
+    # First widget of kind whose key is name or whose label contains name
+    widgets = list(getattr(at, kind))
+    for w in widgets:
+        if w.key == name:
+            return w
+    for w in widgets:
+        if name in (w.label or ''):
+            return w
+    raise LookupError(f"No {kind} with key or label {name!r} on the page")
+
+
+def interact(at, kind, name, value):
+    # Set the widget for the next rerun
+    if kind == 'button':
+        widget(at, 'button', name).click()
+    elif kind == 'upload':
+        widget(at, 'file_uploader', name).set_value(value())
+    else:
+        widget(at, kind, name).set_value(value)
+
+
+def run_page(app, pattern, path, repeat, after_landing=False):
+    # Latency, CPU time and memory of one page in this (fresh) process
+    from streamlit.testing.v1 import AppTest
+    os.chdir(ROOT)
+    sys.path.insert(0, os.path.join(ROOT, APPS[app]))
+    warnings.filterwarnings('ignore')
+    process = psutil.Process()
+    errors = []
+    if after_landing:
+        AppTest.from_file(os.path.join(ROOT, APPS[app], LANDING_PAGES[app]), default_timeout=TIMEOUT).run()
+        for thread in threading.enumerate():
+            if 'warm-up' in thread.name:
+                thread.join()
+
+    cpu = time.process_time()
+    start = time.perf_counter()
+    at = AppTest.from_file(path, default_timeout=TIMEOUT).run()
+    first_run = time.perf_counter() - start
+    first_cpu = time.process_time() - cpu
+    errors += [e.message for e in at.exception]
+    rss_before = process.memory_info().rss
+
+    latency = []
+    cpu = time.process_time()
+    for _ in range(repeat):
+        for kind, name, value in SCENARIOS[app, pattern]:
+            try:
+                interact(at, kind, name, value)
+            except LookupError as error:
+                errors.append(str(error))
+                continue
+            start = time.perf_counter()
+            try:
+                at.run()
+            except RuntimeError as error:
+                # The rerun took longer than TIMEOUT
+                errors.append(f"{kind} {name}: {error}")
+                continue
+            latency.append(time.perf_counter() - start)
+            errors += [e.message for e in at.exception]
+    rerun_cpu = time.process_time() - cpu
+    rss = process.memory_info().rss
+    # The workers of the multi-start fits (engine.fitting.process_pool) would keep this process alive
+    fitting = sys.modules.get('engine.fitting')
+    if fitting is not None and fitting.process_pool.cache_info().currsize:
+        fitting.process_pool().shutdown()
+
+    reruns = len(latency)
+    latency = np.array(latency or [0.])
+    return {
+        'app': app,
+        'page': os.path.basename(path),
+        'reruns': reruns,
+        'first run s': round(first_run, 4),
+        'first run cpu s': round(first_cpu, 4),
+        'p50 s': round(float(np.percentile(latency, 50)), 4),
+        'p95 s': round(float(np.percentile(latency, 95)), 4),
+        'max s': round(float(latency.max()), 4),
+        'cpu s per rerun': round(rerun_cpu / max(reruns, 1), 4),
+        'rss MB': round(rss / 2 ** 20, 1),
+        'rss growth MB': round((rss - rss_before) / 2 ** 20, 1),
+        'peak rss MB': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2 ** 10, 1),
+        'errors': sorted(set(errors)),
+    }
+
+
+def commit():
+    # Current commit of the repository (None outside a git checkout)
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    # Pages whose p50 or p95 is more than tolerance slower than in the baseline results
+    before = {(page['app'], page['page']): page for page in baseline['pages']}
+    regressions = []
+    for page in results['pages']:
+        old = before.get((page['app'], page['page']))
+        if old is None:
+            continue
+        for measure in ('p50 s', 'p95 s'):
+            if old[measure] > 0 and page[measure] > old[measure] * (1 + tolerance):
+                regressions.append({'app': page['app'], 'page': page['page'], 'measure': measure,
+                                    'baseline': old[measure], 'now': page[measure]})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', default=OUTPUT, help='JSON file of the results')
+    parser.add_argument('--repeat', type=int, default=1, help='repetitions of the interaction sequence per page')
+    parser.add_argument('--pages', nargs='*', help='only the pages whose file name starts with these prefixes (e.g. 03 06)')
+    parser.add_argument('--baseline', help='JSON results of an earlier commit to compare with')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help='relative slow-down reported as a regression')
+    parser.add_argument('--after-landing', action='store_true', help='run the landing page and its warm-up before each page')
+    parser.add_argument('--fail-on-error', action='store_true', help='exit with 1 if a page raises an exception')
+    parser.add_argument('--fail-on-regression', action='store_true', help='exit with 1 if a page is slower than the baseline')
+    args = parser.parse_args()
+
+    results = {
+        'time': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': commit(),
+        'python': platform.python_version(),
+        'streamlit': __import__('streamlit').__version__,
+        'cpus': os.cpu_count(),
+        'repeat': args.repeat,
+        'after landing': args.after_landing,
+        'pages': [],
+    }
+    print(f"{'page':<44}{'reruns':>7}{'first':>9}{'p50':>9}{'p95':>9}{'cpu/rerun':>11}{'RSS':>9}{'growth':>9}  errors")
+    context = multiprocessing.get_context('spawn')
+    for app, pattern, path in page_files(args.pages):
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            page = pool.submit(run_page, app, pattern, path, args.repeat, args.after_landing).result()
+        results['pages'].append(page)
+        name = f"{app[:5]} {page['page']}"
+        print(f"{name:<44}{page['reruns']:>7}{page['first run s']:>8.2f}s{page['p50 s']:>8.2f}s{page['p95 s']:>8.2f}s"
+              f"{page['cpu s per rerun']:>10.2f}s{page['rss MB']:>7.0f}MB{page['rss growth MB']:>7.0f}MB  {len(page['errors'])}", flush=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            results['regressions'] = compare(results, json.load(f), args.tolerance)
+        for regression in results['regressions']:
+            print(f"slower than {args.baseline}: {regression['app']} {regression['page']} {regression['measure']} "
+                  f"{regression['baseline']:.2f}s -> {regression['now']:.2f}s")
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=1, ensure_ascii=False)
+    print(f"results written to {args.output}")
+    if args.fail_on_error and any(page['errors'] for page in results['pages']):
+        sys.exit(1)
+    if args.fail_on_regression and results.get('regressions'):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
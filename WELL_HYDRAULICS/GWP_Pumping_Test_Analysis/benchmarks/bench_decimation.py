@@ -0,0 +1,58 @@
+"""Cost of the Theis fit and of one redraw with all readings and decimated data.
+
+For the catalog data sets and a synthetic logger record (7 days at 1 Hz) the
+readings are decimated to POINTS_PER_DECADE points per log decade of time
+(median, weighted by the readings per bin). The table lists the points, the
+time of the Theis fit and of the drawdown at the data times (one slider move),
+and the largest difference of the fitted log10(T), log10(S).
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Pumping_Test_Analysis/benchmarks/bench_decimation.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import engine  # noqa: E402
+
+T, S, Q, r = 2.7E-2, 2.0E-4, 0.01317, 38.9
+LOGGER_DAYS = 7
+
+
+def best_of(func, repeat=3):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    series = {}
+    for key, entry in engine.dataset_catalog().items():
+        t, s, _ = engine.load_dataset(key)
+        series[key] = (t, s, entry['Q'], entry['r'])
+    t = np.arange(1, LOGGER_DAYS * 86400 + 1, dtype=float)
+    s = engine.compute_s_Theis(T, S, t, Q, r) + np.random.default_rng(0).normal(0., 0.002, len(t))
+    series[f'logger {LOGGER_DAYS} d, 1 Hz'] = (t, s, Q, r)
+
+    print(f"{'data set':<22}{'points':>16}{'fit':>22}{'redraw':>22}{'difference':>12}")
+    for name, (t, s, Q_data, r_data) in series.items():
+        check = engine.decimation_check(t, s, Q_data, r_data, (-3., -4.))
+        t_bin, s_bin, variance, count = engine.log_decimate(t, s)
+        with np.errstate(divide='ignore'):
+            redraw_full = best_of(lambda: engine.compute_s_Theis(T, S, t, Q_data, r_data))
+        redraw_bin = best_of(lambda: engine.compute_s_Theis(T, S, t_bin, Q_data, r_data))
+        print(f"{name:<22}{check['points full']:>8} ->{check['points decimated']:>5}"
+              f"{check['seconds full'] * 1e3:>9.1f} ->{check['seconds decimated'] * 1e3:>6.1f} ms"
+              f"{redraw_full * 1e3:>9.2f} ->{redraw_bin * 1e3:>6.3f} ms{check['difference']:>12.4f}")
+    print(f"tolerance: {engine.FIT_TOLERANCE}")
+
+
+if __name__ == '__main__':
+    main()
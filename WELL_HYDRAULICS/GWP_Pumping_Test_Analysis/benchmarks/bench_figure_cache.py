@@ -0,0 +1,83 @@
+"""Cost of slider moves with and without the cache of rendered figures.
+
+A student moves the T and S sliders of the Theis page back and forth around
+the match (a random walk of 0.01 steps within +-0.1), so most positions are
+visited more than once. Every move builds the page figure (Theis curve,
+data and scatter plot) and renders it to a PNG; with the cache a position
+that was rendered before is taken from FIGURE_CACHE instead.
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Pumping_Test_Analysis/benchmarks/bench_figure_cache.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import engine  # noqa: E402
+
+LOG_T, LOG_S, Q, r = -1.57, -3.70, 0.01317, 38.9
+MOVES = 60
+STEPS = 10
+
+
+def slider_walk(moves=MOVES, seed=0):
+    # Slider positions (log10 T, log10 S) of a random walk in steps of 0.01 within STEPS steps of the match
+    rng = np.random.default_rng(seed)
+    i = j = 0
+    positions = []
+    for _ in range(moves):
+        if rng.random() < 0.5:
+            i = int(np.clip(i + rng.choice((-1, 1)), -STEPS, STEPS))
+        else:
+            j = int(np.clip(j + rng.choice((-1, 1)), -STEPS, STEPS))
+        positions.append((LOG_T + i * 0.01, LOG_S + j * 0.01))
+    return positions
+
+
+def draw(m_time_s, m_ddown, T, S):
+    u_inv, w_u = engine.type_curve('Theis')
+    fig = engine.new_figure(figsize=(10,14))
+    ax = fig.add_subplot(2, 1, 1)
+    ax.plot(u_inv * r ** 2 * S / 4 / T, w_u * Q / (4 * np.pi * T), label=r'Computed drawdown - Theis')
+    ax.plot(m_time_s, m_ddown,'ro', label=r'measured drawdown')
+    ax.set_yscale("log")
+    ax.set_xscale("log")
+    ax.axis([1E1,1E5,1E-3,1E+1])
+    ax.legend(fontsize=14)
+    ax = fig.add_subplot(2, 1, 2)
+    ax.plot([0, 1], [0, 1], '--')
+    ax.plot(m_ddown, engine.compute_s_Theis(T, S, m_time_s, Q, r), 'ro')
+    ax.set_xlim(0, 0.4)
+    ax.set_ylim(0, 0.4)
+    return fig
+
+
+def main():
+    m_time_s, m_ddown, _ = engine.load_dataset('varnum_2016_r12')
+    positions = slider_walk()
+    cache = engine.ResultCache(engine.FIGURE_CACHE_BYTES)
+
+    start = time.perf_counter()
+    for log_T, log_S in positions:
+        engine.figure_png(draw(m_time_s, m_ddown, 10 ** log_T, 10 ** log_S))
+    uncached = (time.perf_counter() - start) / MOVES
+
+    start = time.perf_counter()
+    for log_T, log_S in positions:
+        T, S = 10 ** log_T, 10 ** log_S
+        engine.cached_figure_png(engine.figure_key('bench', np.log10(T), np.log10(S)),
+                                 lambda: draw(m_time_s, m_ddown, T, S), cache)
+    cached = (time.perf_counter() - start) / MOVES
+
+    print(f"{MOVES} slider moves over {len(set(positions))} positions")
+    print(f"{'rendering every move':<26}{uncached * 1e3:>10.1f} ms per move")
+    print(f"{'figure cache':<26}{cached * 1e3:>10.1f} ms per move "
+          f"({cache.hits} hits, {cache.misses} misses, {cache.bytes / 2 ** 20:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Convergence and timing of the automatic fits.
+
+Synthetic drawdown with the time span and number of points of the Varnum R12
+and Pirna data sets is generated from known T and S plus Gaussian noise, then
+fitted with engine.fit_theis from several start values, including the slider
+defaults and start values far from the optimum. The multi-start Hantush-Jacob
+and Neuman fits are timed serially (the default of the pages) and in the
+process pool (the first call includes the start of the worker processes).
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Pumping_Test_Analysis/benchmarks/bench_fitting.py
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import engine  # noqa: E402
+
+datasets = {
+    'Varnum (SWE) 2016 - R12': (np.arange(1, 326) * 60., 38.9, 0.01317),
+    'Pirna (DE) 2024': (np.linspace(1, 2931, 2832) * 60., 91., 1.18/60),
+}
+T_true, S_true = 2.7E-2, 2.0E-4
+NOISE = 0.005
+starts = [(-3., -4.), (-6., -1.), (-1., -6.), (-0.5, -0.5)]
+r_div_B, Ss, Sy, beta, b = 0.3, 1.0E-5, 0.15, 0.05, 12.
+
+
+def main():
+    rng = np.random.default_rng(1)
+    print(f"{'data set':<26}{'start':>14}{'log10 T':>10}{'log10 S':>10}{'RMSE':>9}{'iter':>6}{'time':>10}")
+    for name, (t, r, Qs) in datasets.items():
+        s = engine.compute_s_Theis(T_true, S_true, t, Qs, r) + rng.normal(0., NOISE, len(t))
+        engine.fit_theis(t, s, Qs, r, starts[0])
+        for x0 in starts:
+            x, cov, rmse, n_iter, elapsed = engine.fit_theis(t, s, Qs, r, x0)
+            print(f"{name:<26}{str(x0):>14}{x[0]:>10.4f}{x[1]:>10.4f}{rmse:>9.4f}{n_iter:>6}{elapsed * 1e3:>8.2f}ms")
+    print(f"true values: log10 T = {np.log10(T_true):.4f}, log10 S = {np.log10(S_true):.4f}, noise {NOISE} m\n")
+
+    t, r, Qs = datasets['Varnum (SWE) 2016 - R12']
+    cases = {
+        'Hantush-Jacob': (engine.compute_s_HAN(T_true, S_true, t, Qs, r, r_div_B),
+                          lambda s, parallel: engine.fit_hantush(t, s, Qs, r, np.array([-3., -4., -0.4]), parallel=parallel),
+                          np.log10([T_true, S_true, r_div_B])),
+        'Neuman': (engine.compute_s_NEU(T_true, Ss * b, Sy, t, Qs, r, beta),
+                   lambda s, parallel: engine.fit_neuman(t, s, Qs, r, b, np.array([-3., -5., 0.25, -3.]), parallel=parallel),
+                   np.array([np.log10(T_true), np.log10(Ss), Sy, np.log10(beta)])),
+    }
+    print(f"{'solution':<15}{'mode':<10}{'RMSE':>9}{'total':>10}{'per start (ms)':>40}")
+    for name, (s, fit, x_true) in cases.items():
+        s = s + rng.normal(0., NOISE / 2, len(t))
+        for mode, parallel in [('serial', False), ('pool', True), ('pool', True)]:
+            x, cov, rmse, report, elapsed = fit(s, parallel)
+            per_start = ' '.join(f"{seconds * 1e3:.0f}" for *_, seconds in report)
+            print(f"{name:<15}{mode:<10}{rmse:>9.4f}{elapsed:>9.2f}s{per_start:>40}")
+        print(f"{'':<15}fitted {np.round(x, 3)}, true {np.round(x_true, 3)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Accuracy and timing of the analytic Hantush-Jacob well function W(u, r/B).
+
+The quadrature of engine/hantush.py is compared with scipy.integrate.quad at
+random (u, r/B) points, the cached grid with the quadrature, and both with the
+published 22 x 10 table that the pages used before. Timings are given for the
+grid build and for one drawdown curve as plotted on the pages.
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Pumping_Test_Analysis/benchmarks/bench_hantush.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import scipy.integrate
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import engine  # noqa: E402
+from engine import hantush  # noqa: E402
+
+N_REFERENCE = 200
+
+
+def best_of(func, repeat=20):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def reference(u, r_div_B):
+    f = lambda y: np.exp(-y - r_div_B ** 2 / 4. / y) / y
+    return scipy.integrate.quad(f, u, np.inf, epsabs=0, epsrel=1e-12, limit=500)[0]
+
+
+def main():
+    rng = np.random.default_rng(1)
+    u = 10 ** rng.uniform(*hantush.LOG_U_RANGE, N_REFERENCE)
+    r_div_B = 10 ** rng.uniform(*hantush.LOG_R_DIV_B_RANGE, N_REFERENCE)
+    w_ref = np.array([reference(ui, ri) for ui, ri in zip(u, r_div_B)])
+
+    start = time.perf_counter()
+    hantush.hantush_grid()
+    print(f"Grid build (first use per process): {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    w_quad = engine.hantush_well_function_quad(u, r_div_B)
+    w_grid = engine.hantush_well_function(u, r_div_B)
+    print(f"Max. relative error quadrature vs. quad: {np.max(np.abs(w_quad / w_ref - 1)):.1e}")
+    print(f"Max. relative error grid vs. quad:       {np.max(np.abs(w_grid / w_ref - 1)):.1e}\n")
+
+    print(f"{'r/B':>5}{'max. abs. deviation from table':>33}")
+    for column, value in enumerate(engine.r_div_B_list):
+        w_table = engine.w_u_HAN[:, column]
+        w = engine.hantush_well_function(engine.u_HAN, float(value))
+        print(f"{value:>5}{np.max(np.abs(w - w_table)):>33.3f}")
+
+    print(f"\n{'points':>7}{'grid':>12}{'quadrature':>13}")
+    for n in [50, 325, 2832]:
+        u = np.logspace(-5, 4, n) * 1e-4
+        grid = best_of(lambda: engine.hantush_well_function(u, 0.37))
+        quad = best_of(lambda: engine.hantush_well_function_quad(u, 0.37), 3)
+        print(f"{n:>7}{grid * 1e3:>10.3f}ms{quad * 1e3:>11.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""Import time of the pages of both apps and the cost of the warm-up.
+
+The module-level imports of every page (and of the landing pages) are run in
+a fresh interpreter with python -X importtime, as the first run of the page
+after a server restart does. The report gives per page the total import time,
+the part beyond streamlit itself and the modules with the largest cumulative
+time, so a library that a page imports but rarely needs stands out (bokeh,
+pandas, scipy.stats are imported on first use by the engine). The minimum of
+--repeat runs is reported, which leaves out the compilation of the bytecode
+and the disk cache. Finally engine.warm_up is run in a fresh interpreter and
+the seconds of its steps are listed: this work is done in the background
+after a restart instead of on the first page.
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Pumping_Test_Analysis/benchmarks/bench_imports.py [--output bench_imports.json]
+        [--repeat 3] [--top 8] [--pages 03 06 ...]
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+APPS = {
+    'Pumping Test Analysis': (os.path.join('WELL_HYDRAULICS', 'GWP_Pumping_Test_Analysis'), 'PumpingTestAnalysis.py'),
+    'Well capture': (os.path.join('WELL_HYDRAULICS', 'GWP_Well_capture'), 'WellCapture.py'),
+}
+OUTPUT = 'bench_imports.json'
+REPEAT = 3
+TOP = 8
+
+
+def page_files(pages=None):
+    # (app, file) of the landing pages and the pages, optionally only the files whose name starts with one of pages
+    files = []
+    for app, (directory, landing) in APPS.items():
+        paths = [os.path.join(ROOT, directory, landing)] + sorted(glob.glob(os.path.join(ROOT, directory, 'pages', '*.py')))
+        for path in paths:
+            if not pages or any(os.path.basename(path).startswith(page) for page in pages):
+                files.append((app, path))
+    return files
+
+
+def page_imports(path):
+    # Source of the module-level import statements of a page
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    tree = ast.parse(source)
+    return '\n'.join(ast.get_source_segment(source, node) for node in tree.body
+                     if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def import_times(code, cwd):
+    # Cumulative microseconds of the top-level imports and of all modules of a -X importtime run of code
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=cwd, capture_output=True,
+                               text=True, env=dict(os.environ, PYTHONPATH=cwd))
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    top_level, modules = {}, {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative)
+        if not name[1:].startswith(' '):
+            top_level[name.strip()] = int(cumulative)
+    return top_level, modules
+
+
+def measure_page(app, path, repeat, top):
+    # Total and beyond-streamlit import time in seconds and the slowest modules of the best of repeat runs
+    code = page_imports(path)
+    best = None
+    for _ in range(repeat):
+        top_level, modules = import_times(code, os.path.join(ROOT, APPS[app][0]))
+        total = sum(top_level.values())
+        if best is None or total < best[0]:
+            best = (total, top_level, modules)
+    total, top_level, modules = best
+    streamlit = top_level.get('streamlit', 0)
+    slowest = sorted((item for item in modules.items() if item[0] != 'streamlit'), key=lambda item: -item[1])[:top]
+    return {'app': app, 'page': os.path.basename(path), 'imports': code.splitlines(),
+            'total s': total * 1e-6, 'beyond streamlit s': (total - streamlit) * 1e-6,
+            'slowest': [{'module': name, 'cumulative s': us * 1e-6} for name, us in slowest]}
+
+
+def measure_warm_up():
+    # Seconds of the steps of engine.warm_up in a fresh interpreter
+    cwd = os.path.join(ROOT, APPS['Pumping Test Analysis'][0])
+    code = 'import json, engine; print(json.dumps(engine.warm_up()))'
+    completed = subprocess.run([sys.executable, '-c', code], cwd=cwd, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', default=OUTPUT, help='JSON file of the results')
+    parser.add_argument('--repeat', type=int, default=REPEAT, help='runs per page, the fastest is reported')
+    parser.add_argument('--top', type=int, default=TOP, help='slowest modules listed per page')
+    parser.add_argument('--pages', nargs='*', help='only the pages whose file name starts with these prefixes (e.g. 03 06)')
+    args = parser.parse_args()
+
+    results = {'python': '.'.join(map(str, sys.version_info[:3])), 'repeat': args.repeat, 'pages': []}
+    print(f"{'page':<44}{'imports':>10}{'beyond streamlit':>18}  slowest modules")
+    for app, path in page_files(args.pages):
+        page = measure_page(app, path, args.repeat, args.top)
+        results['pages'].append(page)
+        slowest = ', '.join(f"{entry['module']} {entry['cumulative s']:.2f}s" for entry in page['slowest'][:3])
+        print(f"{app[:5] + ' ' + page['page']:<44}{page['total s']:>9.2f}s{page['beyond streamlit s']:>17.2f}s  {slowest}",
+              flush=True)
+
+    results['warm-up'] = measure_warm_up()
+    print(f"\nwarm-up of a server process (background thread): {sum(results['warm-up'].values()):.2f}s")
+    for step, seconds in results['warm-up'].items():
+        print(f"  {step:<44}{seconds:>8.3f}s")
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=1, ensure_ascii=False)
+    print(f"results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Throughput and peak memory of reading a drawdown logger CSV file.
+
+A synthetic logger file (1 reading per second, a third column with the
+temperature) is written to a temporary directory. The former upload path
+(pd.read_csv, lists and a list comprehension for the time in seconds) is
+compared with the chunked reader of the engine, with pandas and pyarrow.
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Pumping_Test_Analysis/benchmarks/bench_ingest.py
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import engine  # noqa: E402
+
+T, S, Q, r = 2.7E-2, 2.0E-4, 0.01317, 38.9
+DAYS = [1, 7]
+
+
+def write_logger_file(path, days):
+    # Time (min), drawdown (m) and temperature of a logger at 1 Hz
+    t = np.arange(1, days * 86400 + 1) / 60.
+    s = engine.compute_s_Theis(T, S, t * 60, Q, r) + np.random.default_rng(0).normal(0., 0.002, len(t))
+    with open(path, 'w') as f:
+        f.write('time_min,drawdown_m,temperature_C\n')
+        np.savetxt(f, np.column_stack((t, s, np.full(len(t), 9.5))), delimiter=',', fmt='%.6f')
+
+
+def list_reader(path):
+    # The upload path as it was in page 06
+    df = pd.read_csv(path)
+    m_time = list(df.iloc[:,0].values)
+    m_ddown = list(df.iloc[:,1].values)
+    m_time_s = [i*60 for i in m_time]
+    return m_time_s, m_ddown
+
+
+def traced(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    readers = {'lists (before)': list_reader,
+               'chunked pandas': lambda path: engine.read_drawdown_csv(path, engine='pandas')}
+    if engine.ingest.PYARROW_AVAILABLE:
+        readers['chunked pyarrow'] = lambda path: engine.read_drawdown_csv(path, engine='pyarrow')
+    print(f"{'file':<20}{'reader':<18}{'time':>10}{'MB/s':>10}{'peak memory':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for days in DAYS:
+            path = os.path.join(directory, f'logger_{days}d.csv')
+            write_logger_file(path, days)
+            size = os.path.getsize(path) / 2 ** 20
+            for name, reader in readers.items():
+                seconds, peak = traced(lambda: reader(path))
+                print(f"{f'{days} d, {size:.0f} MB':<20}{name:<18}{seconds:>9.2f}s{size / seconds:>10.1f}{peak / 2 ** 20:>12.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Timing of the type-curve interpolation for the Varnum R12 and Pirna data sets.
+
+Three variants of the scatter-plot computation are compared for one slider move:
+
+- per point: one compute_s call and one new interp1d per time value
+  (the list comprehensions formerly used in the pages),
+- per call: one new interp1d for the whole time array,
+- cached: one interpolator per table column, built once.
+
+The pages no longer read the tables (Hantush-Jacob is evaluated analytically,
+Neuman in the Laplace domain), so the engine does not build the
+interpolators; build_interpolators below builds them as the engine did.
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Pumping_Test_Analysis/benchmarks/bench_interpolators.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import scipy.interpolate as interp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import engine  # noqa: E402
+
+# Time vectors with the same number of points and time span as the page data
+datasets = {
+    'Varnum (SWE) 2016 - R12': (np.arange(1, 326) * 60., 38.9, 0.01317),
+    'Pirna (DE) 2024': (np.linspace(1, 2931, 2832) * 60., 91., 1.18/60),
+}
+T, S, Sy = 1.0E-3, 1.0E-4, 0.25
+r_div_B, beta = 4, 4
+
+
+def best_of(func, repeat=5):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def build_interpolators():
+    # One interpolator per table and column (r/B index or beta index)
+    interpolators = {}
+    for table, (x, w) in engine.type_curve_tables.items():
+        for column in range(w.shape[1]):
+            method = 'nearest' if table == 'HAN' and column in [0, 1] else 'linear'
+            interpolators[(table, column)] = interp.interp1d(x, w[:, column], kind=method, fill_value="extrapolate")
+    return interpolators
+
+
+def uncached(table, column, x):
+    x_table, w_u = engine.type_curve_tables[table]
+    method = 'nearest' if table == 'HAN' and column in [0, 1] else 'linear'
+    return interp.interp1d(x_table, w_u[:, column], kind=method, fill_value="extrapolate")(x)
+
+
+def main():
+    start = time.perf_counter()
+    interpolators = build_interpolators()
+    print(f"Building all {len(interpolators)} interpolators: {(time.perf_counter() - start) * 1e3:.2f} ms\n")
+
+    print(f"{'data set':<26}{'solution':<15}{'points':>7}{'per point':>12}{'per call':>11}{'cached':>11}")
+    for name, (t, r, Qs) in datasets.items():
+        s_term = Qs / 4. / np.pi / T
+        cases = {
+            'Hantush-Jacob': ('HAN', r_div_B, engine.theis_u(T, S, r, t),
+                              lambda: s_term * interpolators[('HAN', r_div_B)](engine.theis_u(T, S, r, t))),
+            'Neuman (late)': ('b', beta, engine.theis_u_inv(T, Sy, r, t),
+                              lambda: s_term * interpolators[('b', beta)](engine.theis_u_inv(T, Sy, r, t))),
+        }
+        for solution, (table, column, x, cached) in cases.items():
+            per_point = best_of(lambda: [s_term * uncached(table, column, xi) for xi in x], 3)
+            per_call = best_of(lambda: s_term * uncached(table, column, x))
+            print(f"{name:<26}{solution:<15}{len(t):>7}{per_point * 1e3:>10.2f}ms{per_call * 1e3:>9.3f}ms"
+                  f"{best_of(cached) * 1e3:>9.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Cross-check of the Laplace-domain reference kernels and timing of the inversion.
+
+Every kernel of engine/kernels.py is inverted with engine/laplace.py and
+compared with the direct evaluation used by the pages: Theis with
+scipy.special.exp1, Hantush-Jacob with the quadrature of engine/hantush.py
+and with the 22 x 10 table, and Neuman with the early (a) and late (b)
+tables. The timing is for a batch of five distances times the 325 times of
+the Varnum data sets in one call.
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Pumping_Test_Analysis/benchmarks/bench_laplace.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import engine  # noqa: E402
+
+# Ratio S/Sy for the comparison with the Neuman tables, which are given for S/Sy -> 0
+SIGMA_TABLE = 1e-9
+# Table values below this are given with one or two digits only
+MIN_TABLE_VALUE = 0.05
+
+T, S, Sy, Q = 1.0E-3, 1.0E-4, 0.25, 0.01317
+r = np.array([5., 10., 20., 38.9, 80.])[:, np.newaxis]
+t = np.arange(1, 326) * 60.
+
+
+def best_of(func, repeat=5):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def table_deviation(w, w_table):
+    valid = w_table >= MIN_TABLE_VALUE
+    return np.max(np.abs(w[valid] / w_table[valid] - 1), initial=0.)
+
+
+def main():
+    print(f"Stehfest weights (N = {engine.laplace.STEHFEST_N}): {engine.stehfest_weights()}\n")
+
+    # Theis against exp1
+    t_s = np.logspace(-1, 5, 61)
+    w = engine.laplace_well_function(engine.theis_laplace, t_s)
+    print(f"{'Theis':<15}max. abs. error vs. exp1:            "
+          f"{np.max(np.abs(w - engine.well_function(1 / (4 * t_s)))):.1e}")
+
+    # Hantush-Jacob against the quadrature (all table columns at once) and the table
+    r_div_B = np.array(engine.r_div_B_list, dtype=float)
+    w = engine.laplace_well_function(engine.hantush_laplace, t_s[:, np.newaxis], r_div_B=r_div_B)
+    w_quad = engine.hantush_well_function_quad(1 / (4 * t_s[:, np.newaxis]), r_div_B)
+    w_table = engine.laplace_well_function(engine.hantush_laplace, 1 / (4 * engine.u_HAN[:, np.newaxis]), r_div_B=r_div_B)
+    print(f"{'Hantush-Jacob':<15}max. abs. error vs. quadrature:      {np.max(np.abs(w - w_quad)):.1e}")
+    print(f"{'':<15}max. rel. deviation from table:      {table_deviation(w_table, engine.w_u_HAN):.4f}")
+
+    # Neuman against both tables (all beta columns at once)
+    beta = np.array(engine.beta_list, dtype=float)
+    w_a = engine.laplace_well_function(engine.neuman_laplace, engine.u_inv_a[:, np.newaxis] / 4.,
+                                       sigma=SIGMA_TABLE, beta=beta)
+    w_b = engine.laplace_well_function(engine.neuman_laplace, engine.u_inv_b[:, np.newaxis] / 4. / SIGMA_TABLE,
+                                       sigma=SIGMA_TABLE, beta=beta)
+    print(f"{'Neuman':<15}max. rel. deviation from table (a): {table_deviation(w_a, engine.w_u_a):.4f}")
+    print(f"{'':<15}max. rel. deviation from table (b): {table_deviation(w_b, engine.w_u_b):.4f}\n")
+
+    # Batch of distances x times; r/B and beta grow with the distance
+    cases = {
+        'Theis': {},
+        'Hantush-Jacob': {'r_div_B': r / 100.},
+        'Neuman': {'sigma': S / Sy, 'beta': 0.1 * (r / 38.9) ** 2},
+    }
+    print(f"{'kernel':<15}{'batch':>10}{'time':>12}")
+    for name, params in cases.items():
+        kernel = engine.laplace_kernels[name][0]
+        elapsed = best_of(lambda: engine.laplace_drawdown(kernel, T, S, t, Q, r, **params))
+        print(f"{name:<15}{f'{len(r)} x {len(t)}':>10}{elapsed * 1e3:>10.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Timing and peak memory of the Theis misfit map for different memory budgets.
+
+The peak is traced here with tracemalloc, next to the array sizes that
+theis_misfit_surface reports itself.
+
+The 400 x 400 grid of the pages is evaluated for the 325 times of the Varnum
+data sets, once with the common grid step (W per diagonal) and once with a
+slightly stretched S axis, which needs W for every parameter pair.
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Pumping_Test_Analysis/benchmarks/bench_misfit.py
+"""
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import engine  # noqa: E402
+
+T, S, Q, r = 2.7E-2, 2.0E-4, 0.01317, 38.9
+t = np.arange(1, 326) * 60.
+BUDGETS = [4 * 2 ** 20, engine.MEMORY_BUDGET, 256 * 2 ** 20]
+
+
+def main():
+    s = engine.compute_s_Theis(T, S, t, Q, r) + np.random.default_rng(0).normal(0., 0.005, len(t))
+    log_T = np.linspace(-7., 0., engine.GRID_POINTS)
+    grids = {
+        'common step': np.linspace(-7., 0., engine.GRID_POINTS),
+        'other step': np.linspace(-7., 0.5, engine.GRID_POINTS),
+    }
+    print(f"{'grid':<14}{'budget':>10}{'time':>10}{'peak memory':>14}{'arrays':>10}{'lowest RMSE at':>24}")
+    for name, log_S in grids.items():
+        for budget in BUDGETS:
+            tracemalloc.start()
+            me, mae, rmse, elapsed, memory = engine.theis_misfit_surface(t, s, Q, r, log_T, log_S, budget)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            i, j = np.unravel_index(np.argmin(rmse), rmse.shape)
+            print(f"{name:<14}{budget / 2 ** 20:>8.0f}MB{elapsed:>9.2f}s{peak / 2 ** 20:>12.1f}MB{memory / 2 ** 20:>8.1f}MB"
+                  f"{f'({log_T[i]:.2f}, {log_S[j]:.2f})':>24}")
+    print(f"true values: ({np.log10(T):.2f}, {np.log10(S):.2f})")
+
+
+if __name__ == '__main__':
+    main()
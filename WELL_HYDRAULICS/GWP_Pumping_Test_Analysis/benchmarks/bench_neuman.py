@@ -0,0 +1,65 @@
+"""Accuracy and timing of the Laplace-domain Neuman solution.
+
+The Stehfest inversion is checked with the Theis solution, whose transform
+2 K0(sqrt(p)) / p is known, and the Neuman solution is compared with the
+published early (a) and late (b) type curves for the nine tabulated values of
+beta (sigma -> 0). Timings are for one complete curve at the data sizes of the
+pages.
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Pumping_Test_Analysis/benchmarks/bench_neuman.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import scipy.special
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import engine  # noqa: E402
+
+# Ratio S/Sy for the comparison with the tables, which are given for S/Sy -> 0
+SIGMA_TABLE = 1e-9
+# Table values below this are given with one or two digits only
+MIN_TABLE_VALUE = 0.05
+
+T, S, Sy, Q, r = 1.0E-3, 6.0E-4, 0.25, 1.18/60, 91.
+
+
+def best_of(func, repeat=10):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    t_s = np.logspace(-1, 4, 26)
+    w = engine.stehfest_invert(lambda p: 2. / p * scipy.special.k0(np.sqrt(p)), t_s)
+    print(f"Stehfest inversion of Theis, max. abs. error for t_s >= 0.1: "
+          f"{np.max(np.abs(w - engine.well_function(1 / (4 * t_s)))):.1e}\n")
+
+    print(f"{'beta':>6}{'early (a)':>12}{'late (b)':>11}   max. relative deviation from table")
+    for column, value in enumerate(engine.beta_list):
+        beta = float(value)
+        deviation = []
+        for x, w_table, t_s in [(engine.u_inv_a, engine.w_u_a, engine.u_inv_a / 4.),
+                                (engine.u_inv_b, engine.w_u_b, engine.u_inv_b / 4. / SIGMA_TABLE)]:
+            w = engine.neuman_well_function(t_s, SIGMA_TABLE, beta)
+            valid = w_table[:, column] >= MIN_TABLE_VALUE
+            deviation.append(np.max(np.abs(w[valid] / w_table[valid, column] - 1), initial=0.))
+        print(f"{value:>6}{deviation[0]:>12.4f}{deviation[1]:>11.4f}")
+
+    print(f"\n{'points':>7}" + ''.join(f"{'beta = ' + str(b):>14}" for b in [0.001, 0.1, 6]))
+    for n in [50, 325, 2832]:
+        t = np.linspace(1, 2931, n) * 60.
+        times = [best_of(lambda: engine.compute_s_NEU(T, S, Sy, t, Q, r, b)) for b in [0.001, 0.1, 6]]
+        print(f"{n:>7}" + ''.join(f"{dt * 1e3:>12.2f}ms" for dt in times))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Points and visual accuracy of the adaptively sampled type curves.
+
+The pages drew the type curves at the 181 values of 1/u of the precomputed
+families (20 per decade); the pages before them evaluated the well function
+at 50 values of u from 1e-5 to 1e4. type_curve_points places the points by
+the curvature of the curve on the log-log axes (engine.sampling). The three
+are compared by the largest distance, in decades, of the well function from
+the drawn polyline at REFERENCE_POINTS values of 1/u (CURVE_TOLERANCE =
+2e-3 decades is about a third of a pixel of the page figures), where W is at
+least REFERENCE_W: the sampled curves are cut off at MIN_PLOTTED_W, far
+below the plots, and bend there. Theis and Hantush-Jacob are measured
+against the well functions, so the error of the adaptive points adds the
+error of the interpolated family they follow; Neuman, whose well function is
+too slow for the reference, is measured against its interpolated family.
+The last column is the number of points uniformly in log10(1/u) that
+reaches CURVE_TOLERANCE.
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Pumping_Test_Analysis/benchmarks/bench_sampling.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import engine  # noqa: E402
+from engine.type_curves import CURVE_TOLERANCE, LOG_U_INV_RANGE, MIN_PLOTTED_W, MIN_W, _type_curve_points  # noqa: E402
+
+CURVES = (('Theis', None), ('Hantush-Jacob', 0.01), ('Hantush-Jacob', 0.1), ('Hantush-Jacob', 1.),
+          ('Neuman A', 0.01), ('Neuman B', 0.01))
+REFERENCE_POINTS = 20001
+NEIGHBOURS = 2
+REFERENCE_W = 100 * MIN_PLOTTED_W
+
+
+def best_of(func, repeat=20):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def well_function(name, parameter, u_inv):
+    # W at 1/u: the well function for Theis and Hantush-Jacob, the interpolated family for Neuman
+    if name == 'Theis':
+        return engine.well_function(1. / u_inv)
+    if name == 'Hantush-Jacob':
+        return engine.hantush_well_function(1. / u_inv, parameter)
+    family_u_inv, family_w = engine.type_curve(name, parameter)
+    return 10 ** np.interp(np.log10(u_inv), np.log10(family_u_inv), np.log10(family_w))
+
+
+def visual_error(u_inv, w, u_inv_ref, w_ref):
+    # Largest distance in decades of the reference points from the polyline u_inv, w on log-log axes, every
+    # reference point measured to the segment that brackets its 1/u and to the NEIGHBOURS segments on either side
+    px, py = np.log10(u_inv), np.log10(np.maximum(w, MIN_W))
+    mx, my = np.log10(u_inv_ref)[:, np.newaxis], np.log10(w_ref)[:, np.newaxis]
+    k = np.clip(np.searchsorted(px, mx[:, 0])[:, np.newaxis] + np.arange(-NEIGHBOURS - 1, NEIGHBOURS + 1),
+                0, len(px) - 2)
+    ax, ay, dx, dy = px[k], py[k], px[k + 1] - px[k], py[k + 1] - py[k]
+    s = np.clip(((mx - ax) * dx + (my - ay) * dy) / (dx ** 2 + dy ** 2), 0., 1.)
+    return np.hypot(mx - ax - s * dx, my - ay - s * dy).min(axis=1).max()
+
+
+def uniform_points_needed(name, parameter, u_inv_ref, w_ref):
+    # Smallest number of points uniformly in log10(1/u) over the range of the families that reaches the
+    # tolerance, by bisection
+    def error(n):
+        u_inv = np.logspace(*LOG_U_INV_RANGE, n)
+        return visual_error(u_inv, well_function(name, parameter, u_inv), u_inv_ref, w_ref)
+    low, high = 2, 64
+    while error(high) > CURVE_TOLERANCE:
+        low, high = high, 2 * high
+    while high - low > 1:
+        middle = (low + high) // 2
+        low, high = (middle, high) if error(middle) > CURVE_TOLERANCE else (low, middle)
+    return high
+
+
+def main():
+    # 1/u of the 50 values of u from 1e-5 to 1e4
+    u_inv_old = np.logspace(-4, 5)
+    print(f"tolerance {CURVE_TOLERANCE:g} decades\n")
+    print(f"{'curve':<22}{'50 values of u':>16}{'family':>18}{'adaptive':>26}{'uniform for':>13}")
+    print(f"{'':<22}{'error':>16}{'points':>9}{'error':>9}{'points':>8}{'error':>9}{'time':>9}{'tolerance':>13}")
+    for name, parameter in CURVES:
+        u_inv_ref = np.logspace(*LOG_U_INV_RANGE, REFERENCE_POINTS)
+        w_ref = well_function(name, parameter, u_inv_ref)
+        plotted = w_ref >= REFERENCE_W
+        u_inv_ref, w_ref = u_inv_ref[plotted], w_ref[plotted]
+        old = visual_error(u_inv_old, well_function(name, parameter, u_inv_old), u_inv_ref, w_ref)
+        family = engine.type_curve(name, parameter)
+        points = engine.type_curve_points(name, parameter)
+        # Without the cache of type_curve_points
+        adaptive = best_of(lambda: _type_curve_points.__wrapped__(name, parameter, CURVE_TOLERANCE))
+        label = name if parameter is None else f"{name} {parameter:g}"
+        print(f"{label:<22}{old:>16.1e}{len(family[0]):>9}{visual_error(*family, u_inv_ref, w_ref):>9.1e}"
+              f"{len(points[0]):>8}{visual_error(*points, u_inv_ref, w_ref):>9.1e}{adaptive * 1e3:>7.2f}ms"
+              f"{uniform_points_needed(name, parameter, u_inv_ref, w_ref):>13}")
+
+
+if __name__ == '__main__':
+    main()
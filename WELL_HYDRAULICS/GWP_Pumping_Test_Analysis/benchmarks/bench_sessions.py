@@ -0,0 +1,135 @@
+"""Latency and memory of the page figure for many simultaneous sessions.
+
+Streamlit runs every session in its own thread. SESSIONS threads each draw
+the figure of page 06 (Theis curve, data and scatter plot) RERUNS times,
+once through the global pyplot state as the pages did before (plt.figure,
+plt.xlabel, ..., never closed) and once with new_figure and figure_png.
+Each session writes its number into the title; a figure that ends up with
+the title of another session was mixed up through the shared "current"
+figure of pyplot. Memory is the growth of the resident set size (psutil)
+of a fresh process per mode.
+
+Run from the repository root (optionally with the number of sessions and reruns):
+
+    python WELL_HYDRAULICS/GWP_Pumping_Test_Analysis/benchmarks/bench_sessions.py [50 [1]]
+"""
+import concurrent.futures
+import io
+import multiprocessing
+import os
+import sys
+import time
+import warnings
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import psutil  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import engine  # noqa: E402
+
+SESSIONS = 50
+RERUNS = 1
+T, S, Q, r = 2.7E-2, 2.0E-4, 0.01317, 38.9
+
+
+def page_data():
+    m_time_s, m_ddown, _ = engine.load_dataset('varnum_2016_r12')
+    u_inv, w_u = engine.type_curve('Theis')
+    t_term = r ** 2 * S / 4 / T
+    s_term = Q / (4 * np.pi * T)
+    return m_time_s, m_ddown, u_inv * t_term, w_u * s_term, engine.compute_s_Theis(T, S, m_time_s, Q, r)
+
+
+def pyplot_session(session, data):
+    # The figure as the pages built it before: global pyplot state, figure never closed
+    m_time_s, m_ddown, t, s, m_ddown_theis = data
+    titles = []
+    for _ in range(RERUNS):
+        fig = plt.figure(figsize=(10,14))
+        ax = fig.add_subplot(2, 1, 1)
+        ax.plot(t, s, label=r'Computed drawdown - Theis')
+        ax.plot(m_time_s, m_ddown,'go', label=r'measured drawdown')
+        plt.yscale("log")
+        plt.xscale("log")
+        plt.axis([1E1,1E5,1E-3,1E+1])
+        plt.xlabel(r'time t in (s)', fontsize=14)
+        plt.ylabel(r'drawdown s in (m)', fontsize=14)
+        plt.title(f'session {session}', fontsize=16)
+        plt.legend(fontsize=14)
+        ax = fig.add_subplot(2, 1, 2)
+        plt.plot([0, 1], [0, 1], '--')
+        plt.plot(m_ddown, m_ddown_theis, 'go')
+        plt.xlim(0, 0.4)
+        plt.ylim(0, 0.4)
+        titles.append(fig.axes[0].get_title())
+        fig.savefig(io.BytesIO(), format='png', dpi=engine.FIGURE_DPI, bbox_inches='tight')
+    return titles
+
+
+def figure_session(session, data):
+    # The figure as the pages build it now: own Figure and Agg canvas, cleared after rendering
+    m_time_s, m_ddown, t, s, m_ddown_theis = data
+    titles = []
+    for _ in range(RERUNS):
+        fig = engine.new_figure(figsize=(10,14))
+        ax = fig.add_subplot(2, 1, 1)
+        ax.plot(t, s, label=r'Computed drawdown - Theis')
+        ax.plot(m_time_s, m_ddown,'go', label=r'measured drawdown')
+        ax.set_yscale("log")
+        ax.set_xscale("log")
+        ax.axis([1E1,1E5,1E-3,1E+1])
+        ax.set_xlabel(r'time t in (s)', fontsize=14)
+        ax.set_ylabel(r'drawdown s in (m)', fontsize=14)
+        ax.set_title(f'session {session}', fontsize=16)
+        ax.legend(fontsize=14)
+        ax = fig.add_subplot(2, 1, 2)
+        ax.plot([0, 1], [0, 1], '--')
+        ax.plot(m_ddown, m_ddown_theis, 'go')
+        ax.set_xlim(0, 0.4)
+        ax.set_ylim(0, 0.4)
+        titles.append(fig.axes[0].get_title())
+        engine.figure_png(fig)
+    return titles
+
+
+def load_test(session_func, sessions, reruns):
+    # Latency per session, RSS growth, figures with the title of another session and figures left open
+    global SESSIONS, RERUNS
+    SESSIONS, RERUNS = sessions, reruns
+    # The mixed-up pyplot figures warn about log axes with limits of 0 and legends without labels
+    warnings.filterwarnings('ignore', category=UserWarning)
+    warnings.filterwarnings('ignore', message='More than 20 figures')
+    data = page_data()
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+
+    def timed(session):
+        start = time.perf_counter()
+        titles = session_func(session, data)
+        return time.perf_counter() - start, sum(title != f'session {session}' for title in titles)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=SESSIONS) as pool:
+        results = list(pool.map(timed, range(SESSIONS)))
+    latency = np.array([seconds for seconds, _ in results]) / RERUNS
+    mixed = sum(wrong for _, wrong in results)
+    return latency, process.memory_info().rss - rss_before, mixed, len(plt.get_fignums())
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else SESSIONS
+    reruns = int(sys.argv[2]) if len(sys.argv) > 2 else RERUNS
+    print(f"{sessions} sessions x {reruns} reruns")
+    print(f"{'rendering':<22}{'p50':>10}{'p95':>10}{'RSS growth':>14}{'mixed up':>10}{'open figures':>14}")
+    context = multiprocessing.get_context('spawn')
+    for name, session_func in (('pyplot (before)', pyplot_session), ('Figure + Agg (after)', figure_session)):
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            latency, rss, mixed, open_figures = pool.submit(load_test, session_func, sessions, reruns).result()
+        print(f"{name:<22}{np.percentile(latency, 50):>9.2f}s{np.percentile(latency, 95):>9.2f}s"
+              f"{rss / 2 ** 20:>12.0f}MB{mixed:>10}{open_figures:>14}")
+
+
+if __name__ == '__main__':
+    main()
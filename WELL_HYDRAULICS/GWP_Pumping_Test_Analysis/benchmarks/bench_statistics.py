@@ -0,0 +1,65 @@
+"""Timing of the fit statistics for one and for many computed curves.
+
+The loop is the compute_statistics function formerly copied into the pages
+(one Python iteration per time value); the engine scores a 2-D array of
+candidate curves (candidates x 325 times of the Varnum data sets) in one call.
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Pumping_Test_Analysis/benchmarks/bench_statistics.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import engine  # noqa: E402
+
+N_TIMES = 325
+CANDIDATES = [1, 1000, 100000]
+
+
+def loop_statistics(measured, computed):
+    # compute_statistics as it was defined in the pages
+    n = len(measured)
+    total_me = 0
+    total_mae = 0
+    total_rmse = 0
+    for i in range(n):
+        total_me   += (computed[i] - measured[i])
+        total_mae  += (abs(computed[i] - measured[i]))
+        total_rmse += (computed[i] - measured[i])**2
+    return total_me / n, total_mae / n, (total_rmse / n) ** (1/2)
+
+
+def best_of(func, repeat=5):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = np.random.default_rng(0)
+    t = np.arange(1, N_TIMES + 1) * 60.
+    measured = engine.compute_s_Theis(2.7E-2, 2.0E-4, t, 0.01317, 38.9)
+    weights = rng.uniform(0.5, 2., N_TIMES)
+    print(f"{'candidates':>10}{'loop':>12}{'ME/MAE/RMSE':>14}{'all':>12}{'all weighted':>14}")
+    for n in CANDIDATES:
+        computed = measured + rng.normal(0., 0.005, (n, N_TIMES))
+        m_list, c_list = list(measured), [list(c) for c in computed[:1000]]
+        loop = best_of(lambda: [loop_statistics(m_list, c) for c in c_list], 1) * n / len(c_list)
+        basic = best_of(lambda: engine.compute_statistics(measured, computed))
+        full = best_of(lambda: engine.fit_statistics(measured, computed))
+        weighted = best_of(lambda: engine.fit_statistics(measured, computed, weights))
+        mark = '*' if n > len(c_list) else ' '
+        print(f"{n:>10}{loop * 1e3:>10.2f}{mark}ms{basic * 1e3:>12.3f}ms{full * 1e3:>10.3f}ms{weighted * 1e3:>12.3f}ms")
+    print("* extrapolated from 1000 candidates")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Cost of one slider move with and without the precomputed type curves.
+
+A move of T, S or the shape parameter redraws the curve of the page (50
+values of 1/u) and the drawdown at the 325 times of the Varnum data sets.
+Without the type curves the well function is evaluated for every move; with
+them the stored curve is only shifted (and interpolated in the shape
+parameter). The first call builds the family once per process.
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Pumping_Test_Analysis/benchmarks/bench_type_curves.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import engine  # noqa: E402
+
+T, S, SY, Q, r = 2.7E-2, 2.0E-4, 0.2, 0.01317, 38.9
+r_div_B, beta = 0.1, 0.01
+t = np.arange(1, 326) * 60.
+MOVES = 20
+
+
+def per_move(func):
+    start = time.perf_counter()
+    for _ in range(MOVES):
+        func()
+    return (time.perf_counter() - start) / MOVES
+
+
+def main():
+    u = np.logspace(-5, 4)
+    t_term = r ** 2 * S / 4 / T
+    t_b_term = r ** 2 * SY / 4 / T
+    s_term = Q / (4 * np.pi * T)
+    t_NEU = np.geomspace(t_term / 1e4, t_b_term * 1e5, 200)
+    cases = {
+        'Theis': (
+            lambda: (engine.well_function(u), engine.compute_s_Theis(T, S, t, Q, r)),
+            lambda: (engine.type_curve('Theis'), engine.type_curve_drawdown('Theis', None, t, t_term, s_term)),
+            'Theis'),
+        'Hantush-Jacob': (
+            lambda: (engine.hantush_well_function(u, r_div_B), engine.compute_s_HAN(T, S, t, Q, r, r_div_B)),
+            lambda: (engine.type_curve('Hantush-Jacob', r_div_B),
+                     engine.type_curve_drawdown('Hantush-Jacob', r_div_B, t, t_term, s_term)),
+            'Hantush-Jacob'),
+        'Neuman': (
+            lambda: (engine.compute_s_NEU(T, S, SY, t_NEU, Q, r, beta), engine.compute_s_NEU(T, S, SY, t, Q, r, beta)),
+            lambda: (engine.neuman_type_curve_drawdown(beta, t_NEU, t_term, t_b_term, s_term),
+                     engine.neuman_type_curve_drawdown(beta, t, t_term, t_b_term, s_term)),
+            'Neuman A'),
+    }
+    print(f"{'solution':<16}{'well function':>16}{'type curve':>14}{'build family':>16}")
+    for name, (direct, shifted, family) in cases.items():
+        start = time.perf_counter()
+        engine.type_curve_family(family)
+        if family == 'Neuman A':
+            engine.type_curve_family('Neuman B')
+        build = time.perf_counter() - start
+        print(f"{name:<16}{per_move(direct) * 1e3:>14.2f}ms{per_move(shifted) * 1e3:>12.3f}ms{build:>15.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Micro-benchmark of the shared well-function engine against the per-page code.
+
+The "page" variants reproduce the code that was copied into every page before
+the engine existed: one call of compute_s per time value through a list
+comprehension, and for Hantush-Jacob and Neuman one new interp1d per call.
+The engine evaluates Hantush-Jacob analytically (engine/hantush.py) and Neuman
+from its Laplace-domain solution (engine/neuman.py), so the table lookups of
+the page code are timed against the continuous solutions.
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Pumping_Test_Analysis/benchmarks/bench_well_functions.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import scipy.interpolate as interp
+import scipy.special
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import engine  # noqa: E402
+
+# Largest number of points evaluated one by one, larger sizes are extrapolated
+MAX_LOOP_POINTS = 10000
+SIZES = [1, 1000, 1000000]
+
+T, S, Sy, Q, r = 1.0E-3, 1.0E-4, 0.25, 0.01317, 38.9
+r_div_B_index, r_div_B, beta_index, beta = 4, 0.4, 4, 0.6
+
+
+# Per-page versions of the functions (as they were defined in every page)
+def page_theis(T, S, t, Q, r):
+    u = r ** 2 * S / 4. / T / t
+    return Q / 4. / np.pi / T * scipy.special.exp1(u)
+
+def page_hantush(T, S, t, Q, r, u_HAN, w_u_HAN, r_div_B):
+    u = r ** 2 * S / 4. / T / t
+    method = 'nearest' if r_div_B in [0, 1] else 'linear'
+    w_u_HAN_interpolated = interp.interp1d(u_HAN, w_u_HAN[:, r_div_B], kind=method, fill_value="extrapolate")
+    return Q / 4. / np.pi / T * w_u_HAN_interpolated(u)
+
+def page_neuman(T, S, t, Q, r, u_inv_NEU, w_u, beta):
+    u_inv = 1/(r ** 2 * S / 4. / T / t)
+    w_u_interpolated = interp.interp1d(u_inv_NEU, w_u[:, beta], kind='linear', fill_value="extrapolate")
+    return Q / 4. / np.pi / T * w_u_interpolated(u_inv)
+
+
+def best_of(func, repeat):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def time_page(func, t):
+    # Per-point loop as in the pages; very large sizes are timed on a subset
+    n = min(len(t), MAX_LOOP_POINTS)
+    sub = list(t[:n])
+    elapsed = best_of(lambda: [func(ti) for ti in sub], 3 if n < MAX_LOOP_POINTS else 1)
+    return elapsed * len(t) / n, n < len(t)
+
+def time_engine(func, t):
+    return best_of(lambda: func(t), 5 if len(t) < 100000 else 2)
+
+
+def main():
+    cases = {
+        'Theis': (lambda ti: page_theis(T, S, ti, Q, r),
+                  lambda t: engine.compute_s_Theis(T, S, t, Q, r)),
+        'Hantush-Jacob': (lambda ti: page_hantush(T, S, ti, Q, r, engine.u_HAN, engine.w_u_HAN, r_div_B_index),
+                          lambda t: engine.compute_s_HAN(T, S, t, Q, r, r_div_B)),
+        'Neuman': (lambda ti: page_neuman(T, Sy, ti, Q, r, engine.u_inv_b, engine.w_u_b, beta_index),
+                   lambda t: engine.compute_s_NEU(T, S, Sy, t, Q, r, beta)),
+    }
+    print(f"{'solution':<15}{'points':>9}{'page code':>14}{'engine':>12}{'speed-up':>10}")
+    for name, (page_func, engine_func) in cases.items():
+        for n in SIZES:
+            t = np.logspace(1, 6, n)
+            page_time, extrapolated = time_page(page_func, t)
+            engine_time = time_engine(engine_func, t)
+            mark = '*' if extrapolated else ' '
+            print(f"{name:<15}{n:>9}{page_time * 1e3:>12.3f}{mark}ms{engine_time * 1e3:>10.3f}ms"
+                  f"{page_time / engine_time:>9.0f}x")
+    print(f"* extrapolated from {MAX_LOOP_POINTS} per-point calls")
+
+
+if __name__ == '__main__':
+    main()
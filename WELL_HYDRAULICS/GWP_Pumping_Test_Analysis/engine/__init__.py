@@ -0,0 +1,137 @@
+# Shared computational engine of the Pumping Test Analysis app.
+# The pages import from here so that functions and tables are built once per
+# server process instead of on every rerun.
+from .hantush import (
+    hantush_grid,
+    hantush_well_function,
+    hantush_well_function_quad,
+)
+from .cache import (
+    SESSION_CACHE_BYTES,
+    ResultCache,
+    content_hash,
+    result_bytes,
+)
+from .datasets import (
+    DATASET_FIELDS,
+    add_dataset,
+    dataset_catalog,
+    dataset_key,
+    load_dataset,
+)
+from .decimation import (
+    AGGREGATES,
+    FIT_TOLERANCE,
+    POINTS_PER_DECADE,
+    WEIGHTINGS,
+    decimation_check,
+    decimation_weights,
+    log_decimate,
+)
+from .fitting import (
+    PARALLEL_ENV,
+    covariance,
+    difference_residuals,
+    fit_hantush,
+    fit_neuman,
+    fit_theis,
+    hantush_drawdown,
+    levenberg_marquardt,
+    multi_start_fit,
+    neuman_drawdown,
+    parallel_fits,
+    process_pool,
+    theis_residuals,
+)
+from .misfit import (
+    GRID_POINTS,
+    MEMORY_BUDGET,
+    theis_misfit_surface,
+)
+from .ingest import (
+    CHUNK_ROWS,
+    PYARROW_AVAILABLE,
+    read_drawdown_csv,
+)
+from .interactive import (
+    BOKEH_AVAILABLE,
+    INTERACTIVE_SOLUTIONS,
+    bokeh_html,
+    cached_bokeh_html,
+    type_curve_plot,
+    type_curve_plot_height,
+)
+from .kernels import (
+    hantush_laplace,
+    laplace_kernels,
+    theis_laplace,
+)
+from .laplace import (
+    laplace_drawdown,
+    laplace_well_function,
+    stehfest_invert,
+    stehfest_weights,
+)
+from .neuman import (
+    compute_s_NEU,
+    neuman_laplace,
+    neuman_roots,
+    neuman_well_function,
+)
+from .profiling import (
+    PROFILE_ENV,
+    TRACE_FILE,
+    RerunProfile,
+    profiling_enabled,
+)
+from .rendering import (
+    FIGURE_CACHE,
+    FIGURE_CACHE_BYTES,
+    FIGURE_DPI,
+    RENDER_LOCK,
+    RENDER_SLOTS,
+    cached_figure_png,
+    figure_key,
+    figure_png,
+    new_figure,
+)
+from .sampling import (
+    adaptive_curve,
+)
+from .statistics import (
+    compute_statistics,
+    fit_statistics,
+)
+from .type_curves import (
+    neuman_type_curve_drawdown,
+    type_curve,
+    type_curve_drawdown,
+    type_curve_family,
+    type_curve_names,
+    type_curve_points,
+)
+from .warmup import (
+    WARM_UP_MODULES,
+    WARM_UP_REPORT,
+    start_warm_up,
+    warm_up,
+)
+from .well_functions import (
+    TABLE_GAP,
+    beta_list,
+    compute_s_HAN,
+    compute_s_Theis,
+    Hantush_s,
+    r_div_B_list,
+    theis_s,
+    theis_u,
+    theis_u_inv,
+    type_curve_tables,
+    u_HAN,
+    u_inv_a,
+    u_inv_b,
+    w_u_a,
+    w_u_b,
+    w_u_HAN,
+    well_function,
+)
@@ -0,0 +1,74 @@
+"""Least-recently-used cache of computed results within a memory cap.
+
+Streamlit reruns a page on every widget change. Results that only depend on
+the data (the parsed upload, its decimation) are kept in a ResultCache per
+session (in st.session_state) under a key that starts with the hash of the
+file contents, so a slider move does not parse the file again. When the
+arrays of the cache exceed max_bytes the least recently used results are
+dropped. A ResultCache may be shared by the threads of all sessions (e.g.
+the cache of rendered figures in engine.rendering): the entries are guarded
+by a lock, results are computed outside of it.
+"""
+import collections
+import hashlib
+import threading
+
+import numpy as np
+
+# Memory cap of the cache of one session
+SESSION_CACHE_BYTES = 128 * 2 ** 20
+
+
+def content_hash(data):
+    # Hex digest of bytes (e.g. the contents of an uploaded file)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def result_bytes(value):
+    # Bytes of the arrays, byte strings and text (e.g. PNG images, HTML pages) in a result (also in tuples, lists
+    # and dictionaries; text counts one byte per character)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(result_bytes(item) for item in value)
+    if isinstance(value, dict):
+        return sum(result_bytes(item) for item in value.values())
+    return 0
+
+
+class ResultCache:
+    # Results by key, the least recently used ones are dropped above max_bytes
+
+    def __init__(self, max_bytes=SESSION_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = collections.OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, compute):
+        # Cached result of key, else compute() which is stored if it fits into the cap
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+        value = compute()
+        size = result_bytes(value)
+        with self.lock:
+            if size <= self.max_bytes and key not in self.entries:
+                self.entries[key] = (value, size)
+                self.bytes += size
+                while self.bytes > self.max_bytes:
+                    _, (_, dropped) = self.entries.popitem(last=False)
+                    self.bytes -= dropped
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
@@ -0,0 +1,107 @@
+"""Catalog of the measured drawdown data sets of the pages.
+
+The series are stored column-wise in data/datasets.npz (one time and one
+drawdown array per data set) and described in data/catalog.json; both are
+read lazily and cached per server process. A page only materialises the
+data set that is selected, so the pages do not parse every series on each
+rerun and a new site does not slow them down.
+
+Each catalog entry has the fields of DATASET_FIELDS:
+
+    label          name of the data set in the selection boxes
+    site, year     field site (or 'Synthetic') and year of the test
+    well           observation well
+    r              distance between the pumping and the observation well (m)
+    b              aquifer thickness (m)
+    Q              pumping rate (m^3/s)
+    time_unit      unit of the stored times (a key of TIME_UNITS)
+    drawdown_unit  unit of the stored drawdown (a key of DRAWDOWN_UNITS)
+
+load_dataset returns the series in seconds and meters.
+
+A new data set is added with add_dataset (or by editing both files).
+"""
+import functools
+import json
+import os
+
+import numpy as np
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+CATALOG_FILE = os.path.join(DATA_DIR, 'catalog.json')
+SERIES_FILE = os.path.join(DATA_DIR, 'datasets.npz')
+
+DATASET_FIELDS = ('label', 'site', 'year', 'well', 'r', 'b', 'Q', 'time_unit', 'drawdown_unit')
+# Factors from the stored units to seconds and meters
+TIME_UNITS = {'s': 1., 'min': 60., 'h': 3600., 'd': 86400.}
+DRAWDOWN_UNITS = {'m': 1., 'cm': 0.01, 'mm': 0.001}
+
+
+@functools.lru_cache(maxsize=None)
+def dataset_catalog():
+    # Metadata of all data sets by key, in the order of the catalog file
+    with open(CATALOG_FILE, encoding='utf-8') as f:
+        catalog = json.load(f)
+    for key, entry in catalog.items():
+        missing = [field for field in DATASET_FIELDS if field not in entry]
+        if missing:
+            raise ValueError(f"Data set {key!r} in {CATALOG_FILE} lacks the fields {missing}")
+        if entry['time_unit'] not in TIME_UNITS or entry['drawdown_unit'] not in DRAWDOWN_UNITS:
+            raise ValueError(f"Data set {key!r} has unknown units {entry['time_unit']!r}, {entry['drawdown_unit']!r}")
+    return catalog
+
+
+def dataset_key(name):
+    # Catalog key of a data set given by its key or its label
+    catalog = dataset_catalog()
+    if name in catalog:
+        return name
+    for key, entry in catalog.items():
+        if entry['label'] == name:
+            return key
+    raise KeyError(f"Unknown data set {name!r}")
+
+
+@functools.lru_cache(maxsize=None)
+def _series(key):
+    # Time (s) and drawdown (m) of one data set as read-only arrays (only these two columns are read from the file)
+    entry = dataset_catalog()[key]
+    with np.load(SERIES_FILE) as columns:
+        time = columns[f'{key}/time'] * TIME_UNITS[entry['time_unit']]
+        drawdown = columns[f'{key}/drawdown'] * DRAWDOWN_UNITS[entry['drawdown_unit']]
+    time.setflags(write=False)
+    drawdown.setflags(write=False)
+    return time, drawdown
+
+
+def load_dataset(name):
+    # Time in seconds, drawdown in meters and metadata of a data set given by its key or its label
+    key = dataset_key(name)
+    time, drawdown = _series(key)
+    return time, drawdown, dict(dataset_catalog()[key], key=key)
+
+
+def add_dataset(key, time, drawdown, **metadata):
+    # Store a new (or replace an existing) data set in the catalog files
+    missing = [field for field in DATASET_FIELDS if field not in metadata]
+    if missing:
+        raise ValueError(f"Data set {key!r} lacks the fields {missing}")
+    time = np.asarray(time, dtype=float)
+    drawdown = np.asarray(drawdown, dtype=float)
+    if time.ndim != 1 or time.shape != drawdown.shape:
+        raise ValueError("time and drawdown must be vectors of the same length")
+    catalog = dict(dataset_catalog()) if os.path.exists(CATALOG_FILE) else {}
+    columns = {}
+    if os.path.exists(SERIES_FILE):
+        with np.load(SERIES_FILE) as stored:
+            columns = {name: stored[name] for name in stored.files}
+    catalog[key] = {field: metadata[field] for field in DATASET_FIELDS}
+    columns[f'{key}/time'] = time
+    columns[f'{key}/drawdown'] = drawdown
+    os.makedirs(DATA_DIR, exist_ok=True)
+    np.savez_compressed(SERIES_FILE, **columns)
+    with open(CATALOG_FILE, 'w', encoding='utf-8') as f:
+        json.dump(catalog, f, indent=4)
+        f.write('\n')
+    dataset_catalog.cache_clear()
+    _series.cache_clear()
@@ -0,0 +1,95 @@
+"""Decimation of dense drawdown records in logarithmic time.
+
+Type curves are matched on log-time axes, so data that are dense in linear
+time (1-minute or 1-second logger readings) carry most of their points in
+the last decade. The readings are grouped into bins of equal width in
+log10(t), points_per_decade bins per decade, and each bin is replaced by the
+median (or mean) time and drawdown of its readings, with the number of
+readings and the variance of the drawdown in the bin. Weighted by the number
+of readings, a least-squares fit of the decimated data approximates the fit
+of all readings at a fraction of the cost; decimation_check reports how
+close. Weighting by readings / variance in addition gives noisy bins less
+weight, but the variance of a bin also holds the trend of the drawdown
+within the bin, so that fit differs from the fit of all readings.
+"""
+import numpy as np
+
+from .fitting import fit_theis
+
+POINTS_PER_DECADE = 20
+AGGREGATES = ('median', 'mean')
+WEIGHTINGS = ('readings', 'readings / variance', 'equal')
+# Largest change of the fitted log10(T) and log10(S) by the decimation that counts as equivalent
+FIT_TOLERANCE = 0.01
+
+
+def log_decimate(t, s, points_per_decade=POINTS_PER_DECADE, aggregate='median'):
+    # Time, drawdown, drawdown variance and number of readings per bin of width 1 / points_per_decade in log10(t)
+    # Readings at t <= 0 are dropped; the variance of bins with one reading is NaN
+    if aggregate not in AGGREGATES:
+        raise ValueError(f"Unknown aggregate {aggregate!r}, expected one of {AGGREGATES}")
+    t = np.asarray(t, dtype=float)
+    s = np.asarray(s, dtype=float)
+    positive = t > 0
+    t, s = t[positive], s[positive]
+    if np.any(np.diff(t) < 0):
+        order = np.argsort(t, kind='stable')
+        t, s = t[order], s[order]
+    log_t = np.log10(t)
+    # The small offset keeps readings on a bin edge (e.g. t = 10 min) in the upper bin despite rounding
+    bins = np.floor((log_t - log_t[0]) * points_per_decade + 1e-9).astype(int)
+    first = np.concatenate(([0], np.flatnonzero(np.diff(bins)) + 1))
+    count = np.diff(np.append(first, len(t)))
+
+    mean = np.add.reduceat(s, first) / count
+    deviation = s - np.repeat(mean, count)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = np.add.reduceat(deviation ** 2, first) / (count - 1)
+    if aggregate == 'mean':
+        t_bin = 10 ** (np.add.reduceat(log_t, first) / count)
+        s_bin = mean
+    else:
+        # One median per bin; there are only points_per_decade bins per decade
+        t_bin = np.array([np.median(t[i:i + n]) for i, n in zip(first, count)])
+        s_bin = np.array([np.median(s[i:i + n]) for i, n in zip(first, count)])
+    return t_bin, s_bin, variance, count
+
+
+def decimation_weights(variance, count, weighting='readings'):
+    # Weights per bin (one of WEIGHTINGS), scaled to a mean of 1
+    # For readings / variance, bins with one reading or without scatter get the median variance of the other bins
+    if weighting not in WEIGHTINGS:
+        raise ValueError(f"Unknown weighting {weighting!r}, expected one of {WEIGHTINGS}")
+    count = np.asarray(count, dtype=float)
+    variance = np.asarray(variance, dtype=float)
+    known = np.isfinite(variance) & (variance > 0)
+    if weighting == 'equal':
+        weights = np.ones(count.shape)
+    elif weighting == 'readings' or not known.any():
+        weights = count
+    else:
+        weights = count / np.where(known, variance, np.median(variance[known]))
+    return weights / weights.mean()
+
+
+def decimation_check(t, s, Q, r, x0, points_per_decade=POINTS_PER_DECADE, aggregate='median', weighting='readings'):
+    # Theis fit of all readings and of the decimated, weighted readings
+    # Returns a dictionary with both optima, the largest difference in log10(T), log10(S), the times and the points
+    t = np.asarray(t, dtype=float)
+    s = np.asarray(s, dtype=float)
+    positive = t > 0
+    x_full, cov, rmse, n_iter, seconds_full = fit_theis(t[positive], s[positive], Q, r, x0)
+    t_bin, s_bin, variance, count = log_decimate(t, s, points_per_decade, aggregate)
+    x_bin, cov, rmse, n_iter, seconds_bin = fit_theis(t_bin, s_bin, Q, r, x0,
+                                                      weights=decimation_weights(variance, count, weighting))
+    difference = np.max(np.abs(x_bin - x_full))
+    return {
+        'full': x_full,
+        'decimated': x_bin,
+        'difference': difference,
+        'equivalent': difference <= FIT_TOLERANCE,
+        'seconds full': seconds_full,
+        'seconds decimated': seconds_bin,
+        'points full': int(positive.sum()),
+        'points decimated': len(t_bin),
+    }
@@ -0,0 +1,259 @@
+"""Least-squares estimation of aquifer parameters from drawdown data.
+
+The parameters are fitted in log10 space, the same scale as the sliders of
+the pages, with a Levenberg-Marquardt solver that keeps them inside the slider
+range. For the Theis solution the Jacobian is analytic: with
+s = Q / (4 pi T) W(u), u = r^2 S / (4 T t) and dW/du = -exp(-u) / u,
+
+    ds/dlog10(T) = ln(10) * (Q / (4 pi T) exp(-u) - s)
+    ds/dlog10(S) = -ln(10) * Q / (4 pi T) exp(-u)
+
+Hantush-Jacob (T, S, r/B) and Neuman (T, Ss, Sy, beta) are fitted with a
+forward-difference Jacobian; the base point and all perturbed points are
+evaluated as one batch of curves. Their cost surfaces have several basins
+(e.g. T against r/B, or the elastic against the specific-yield branch), so
+they are fitted from several start values and the best local optimum is
+returned. The start values are fitted one after the other by default: a
+process pool saves little (Neuman on the Varnum data: 5.4 s serially, 4.5 s
+in the pool, benchmarks/bench_fitting.py) and costs a worker per core in a
+server that already runs one thread per session. The server switches the
+pool on for all sessions with the environment variable GWP_PARALLEL_FITS=1
+(parallel_fits(), read by page 06), e.g. on a machine with cores to spare
+for few users. With parallel=True the pool is started by a fork server (or spawned), never forked from the server,
+whose threads may hold locks such as engine.hantush._GRID_LOCK that a forked
+worker would wait for forever.
+"""
+import concurrent.futures
+import functools
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from .neuman import compute_s_NEU
+from .well_functions import compute_s_HAN, theis_u, well_function
+
+LN10 = np.log(10.)
+
+# Slider range of log10(T) and log10(S) on the pages
+THEIS_BOUNDS = (np.array([-7., -7.]), np.array([0., 0.]))
+# Points per parameter of the coarse grid that guards against start values without drawdown
+START_GRID_POINTS = 15
+# Largest number of data points used to rank the grid points
+START_MAX_DATA = 200
+
+# Slider range of log10(T), log10(S) and log10(r/B)
+HANTUSH_BOUNDS = (np.array([-7., -7., -3.]), np.array([0., 0., 0.5]))
+# Slider range of log10(T), log10(Ss), Sy and log10(beta)
+NEUMAN_BOUNDS = (np.array([-7., -7., 0.01, -4.]), np.array([0., 0., 0.5, 1.]))
+# Step of the forward-difference Jacobian in the (log10) parameters
+DIFF_STEP = 1e-6
+# Start values of the multi-start fits (the slider values, the Theis fit and a Latin hypercube)
+N_STARTS = 8
+# Half width in decades of the start box of T and S around the Theis fit
+START_SPREAD = 1.
+# Environment variable that lets the pages fit the start values in the process pool
+PARALLEL_ENV = 'GWP_PARALLEL_FITS'
+
+
+def levenberg_marquardt(fun, x0, lower, upper, max_iter=100, tol=1e-10):
+    # Minimize |r(x)|^2 for fun(x) -> (r, J); steps are projected onto lower <= x <= upper.
+    # J may be a function without arguments, it is then only evaluated for accepted steps
+    x = np.clip(np.asarray(x0, dtype=float), lower, upper)
+    r, J = fun(x)
+    J = J() if callable(J) else J
+    cost = r @ r
+    damping = 1e-3
+    for n_iter in range(1, max_iter + 1):
+        A = J.T @ J
+        g = J.T @ r
+        # Parameters held at a bound by the gradient are kept fixed for this iteration
+        free = ~(((x <= lower) & (g > 0)) | ((x >= upper) & (g < 0)))
+        if not free.any():
+            break
+        A_free = A[np.ix_(free, free)]
+        improved = False
+        while damping < 1e10:
+            # Marquardt scaling of the damping by the diagonal of J^T J
+            step = np.zeros_like(x)
+            step[free] = np.linalg.solve(A_free + damping * np.diag(np.diag(A_free) + 1e-12), -g[free])
+            x_new = np.clip(x + step, lower, upper)
+            r_new, J_new = fun(x_new)
+            cost_new = r_new @ r_new
+            if cost_new < cost:
+                improved = True
+                break
+            damping *= 4.
+        if not improved:
+            break
+        converged = cost - cost_new <= tol * cost or np.max(np.abs(x_new - x)) < 1e-9
+        x, r, cost = x_new, r_new, cost_new
+        J = J_new() if callable(J_new) else J_new
+        damping = max(damping / 3., 1e-12)
+        if converged:
+            break
+    return x, r, J, n_iter
+
+
+def covariance(r, J):
+    # Covariance of the parameters from the residual variance and J^T J
+    dof = max(len(r) - J.shape[1], 1)
+    return (r @ r) / dof * np.linalg.pinv(J.T @ J)
+
+
+def theis_residuals(x, t, s, Q, r):
+    # Residuals (computed - measured) and analytic Jacobian in log10(T), log10(S)
+    T, S = 10. ** x
+    with np.errstate(divide='ignore'):
+        u = theis_u(T, S, r, t)
+    s_term = Q / 4. / np.pi / T
+    s_computed = s_term * well_function(u)
+    exp_u = np.exp(-u)
+    J = np.column_stack((LN10 * (s_term * exp_u - s_computed), -LN10 * s_term * exp_u))
+    return s_computed - s, J
+
+
+def theis_start(t, s, Q, r, x0, bounds):
+    # Better of x0 and the best point of a coarse log grid, evaluated in one broadcast
+    # on at most START_MAX_DATA evenly spaced data points
+    lower, upper = bounds
+    step = -(-len(t) // START_MAX_DATA)
+    t, s = t[::step], s[::step]
+    log_T, log_S = np.meshgrid(np.linspace(lower[0], upper[0], START_GRID_POINTS),
+                               np.linspace(lower[1], upper[1], START_GRID_POINTS))
+    candidates = np.vstack((np.clip(x0, lower, upper), np.column_stack((log_T.ravel(), log_S.ravel()))))
+    T, S = 10. ** candidates[:, :1], 10. ** candidates[:, 1:]
+    with np.errstate(divide='ignore'):
+        s_computed = Q / 4. / np.pi / T * well_function(theis_u(T, S, r, t))
+    cost = np.sum((s_computed - s) ** 2, axis=1)
+    return candidates[np.argmin(cost)]
+
+
+def residual_scale(weights, n):
+    # Square root of the weights per time, scaled to a mean weight of 1 (1 without weights)
+    if weights is None:
+        return np.ones(n)
+    weights = np.asarray(weights, dtype=float)
+    return np.sqrt(weights / weights.mean())
+
+
+def weighted_residuals(x, fun, sqrt_w):
+    # Residuals and Jacobian of fun scaled by the square root of the weights
+    res, J = fun(x)
+    return sqrt_w * res, (lambda: sqrt_w[:, np.newaxis] * J()) if callable(J) else sqrt_w[:, np.newaxis] * J
+
+
+def fit_theis(t, s, Q, r, x0, bounds=THEIS_BOUNDS, weights=None):
+    # Fit log10(T), log10(S) to measured drawdown s at times t, starting from x0 (e.g. the sliders)
+    # Optional weights per time (e.g. readings / variance of decimated data); the RMSE is then weighted
+    # Returns the optimum, its covariance, the RMSE, the iterations and the time in seconds
+    start = time.perf_counter()
+    t = np.asarray(t, dtype=float)
+    s = np.asarray(s, dtype=float)
+    sqrt_w = residual_scale(weights, len(t))
+    x0 = theis_start(t, s, Q, r, x0, bounds)
+    x, res, J, n_iter = levenberg_marquardt(
+        lambda x: weighted_residuals(x, lambda x: theis_residuals(x, t, s, Q, r), sqrt_w), x0, *bounds)
+    rmse = np.sqrt(np.mean(res ** 2))
+    return x, covariance(res, J), rmse, n_iter, time.perf_counter() - start
+
+
+def hantush_drawdown(x, t, Q, r):
+    # Drawdown for rows of parameters x = (log10 T, log10 S, log10 r/B), one curve per row
+    x = np.atleast_2d(x)
+    T, S, r_div_B = 10. ** x[:, :1], 10. ** x[:, 1:2], 10. ** x[:, 2:]
+    with np.errstate(divide='ignore'):
+        return compute_s_HAN(T, S, t, Q, r, r_div_B)
+
+
+def neuman_drawdown(x, t, Q, r, b):
+    # Drawdown for rows of parameters x = (log10 T, log10 Ss, Sy, log10 beta), one curve per row
+    x = np.atleast_2d(x)
+    T, Ss, Sy, beta = 10. ** x[:, :1], 10. ** x[:, 1:2], x[:, 2:3], 10. ** x[:, 3:]
+    return compute_s_NEU(T, Ss * b, Sy, t, Q, r, beta)
+
+
+def difference_residuals(model, x, s, step=DIFF_STEP):
+    # Residuals and a function for the forward-difference Jacobian (the perturbed points are one batch)
+    s_computed = model(x)[0]
+    return s_computed - s, lambda: ((model(x + step * np.eye(len(x))) - s_computed) / step).T
+
+
+def fit_start(model, s, x0, bounds, sqrt_w=None):
+    # One local fit from x0; module level so that it can be sent to a worker process
+    start = time.perf_counter()
+    sqrt_w = np.ones(len(s)) if sqrt_w is None else sqrt_w
+    x, res, J, n_iter = levenberg_marquardt(
+        lambda x: weighted_residuals(x, lambda x: difference_residuals(model, x, s), sqrt_w), x0, *bounds)
+    return x, res, J, n_iter, time.perf_counter() - start
+
+
+def parallel_fits():
+    # True if GWP_PARALLEL_FITS is set (not 0): the pages then pass parallel=True to the multi-start fits
+    return os.environ.get(PARALLEL_ENV, '0').lower() not in ('', '0', 'false', 'no')
+
+
+@functools.lru_cache(maxsize=1)
+def process_pool():
+    # Worker processes shared by all sessions, started by a fork server where possible. The workers
+    # import fit_start and the drawdown models from engine.fitting (the server forks from a process
+    # without threads, a spawned worker starts anew), so no lock of another thread is inherited
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    context = multiprocessing.get_context(method)
+    if method == 'forkserver':
+        context.set_forkserver_preload(['engine.fitting'])
+    return concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=context)
+
+
+def start_values(x0, center, bounds, n_starts, seed=0):
+    # x0, the center and n_starts - 2 Latin hypercube points; T and S within START_SPREAD decades of the center
+    # (scipy.stats is imported here, it is only needed by the multi-start fits)
+    import scipy.stats
+    lower, upper = bounds
+    box_lower, box_upper = lower.copy(), upper.copy()
+    box_lower[:2] = np.maximum(center[:2] - START_SPREAD, lower[:2])
+    box_upper[:2] = np.minimum(center[:2] + START_SPREAD, upper[:2])
+    sample = scipy.stats.qmc.LatinHypercube(d=len(lower), seed=seed).random(max(n_starts - 2, 0))
+    return np.vstack((np.clip(x0, lower, upper), np.clip(center, lower, upper),
+                      scipy.stats.qmc.scale(sample, box_lower, box_upper)))
+
+
+def multi_start_fit(model, s, starts, bounds, parallel=False, weights=None):
+    # Local fits from all start values, in the process pool if parallel
+    # Returns the best optimum, its covariance, the (weighted) RMSE, a list of
+    # (start, optimum, RMSE, iterations, seconds) per start and the total time in seconds
+    start = time.perf_counter()
+    sqrt_w = residual_scale(weights, len(s))
+    if parallel:
+        futures = [process_pool().submit(fit_start, model, s, x0, bounds, sqrt_w) for x0 in starts]
+        results = [future.result() for future in futures]
+    else:
+        results = [fit_start(model, s, x0, bounds, sqrt_w) for x0 in starts]
+    report = [(x0, x, np.sqrt(np.mean(res ** 2)), n_iter, seconds)
+              for x0, (x, res, J, n_iter, seconds) in zip(starts, results)]
+    best = min(range(len(results)), key=lambda i: report[i][2])
+    x, res, J = results[best][:3]
+    return x, covariance(res, J), report[best][2], report, time.perf_counter() - start
+
+
+def fit_hantush(t, s, Q, r, x0, bounds=HANTUSH_BOUNDS, n_starts=N_STARTS, parallel=False, weights=None):
+    # Fit log10(T), log10(S), log10(r/B) from the start value x0 (e.g. the sliders) and n_starts - 1 others
+    t = np.asarray(t, dtype=float)
+    s = np.asarray(s, dtype=float)
+    center = np.append(theis_start(t, s, Q, r, x0[:2], THEIS_BOUNDS), x0[2])
+    starts = start_values(x0, center, bounds, n_starts)
+    model = functools.partial(hantush_drawdown, t=t, Q=Q, r=r)
+    return multi_start_fit(model, s, starts, bounds, parallel, weights)
+
+
+def fit_neuman(t, s, Q, r, b, x0, bounds=NEUMAN_BOUNDS, n_starts=N_STARTS, parallel=False, weights=None):
+    # Fit log10(T), log10(Ss), Sy, log10(beta) from the start value x0 (e.g. the sliders) and n_starts - 1 others
+    t = np.asarray(t, dtype=float)
+    s = np.asarray(s, dtype=float)
+    # The Theis fit of all data gives T and a storativity between the elastic and the specific-yield branch
+    log_T, log_S = theis_start(t, s, Q, r, x0[:2] + np.array([0., np.log10(b)]), THEIS_BOUNDS)
+    center = np.array([log_T, log_S - np.log10(b), x0[2], x0[3]])
+    starts = start_values(x0, center, bounds, n_starts)
+    model = functools.partial(neuman_drawdown, t=t, Q=Q, r=r, b=b)
+    return multi_start_fit(model, s, starts, bounds, parallel, weights)
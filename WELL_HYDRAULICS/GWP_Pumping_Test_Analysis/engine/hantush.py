@@ -0,0 +1,98 @@
+"""Hantush-Jacob leaky well function W(u, r/B) for continuous u and r/B.
+
+The function is the integral
+
+    W(u, r/B) = integral from u to infinity of exp(-y - (r/B)^2 / (4 y)) / y dy
+
+which becomes a smooth, rapidly decaying integrand after the substitution
+y = exp(x). It is evaluated with composite Gauss-Legendre quadrature that is
+vectorized over all (u, r/B) pairs. For the interactive pages a bicubic spline
+of log W on a precomputed (log u, log r/B) grid is used; it is built on first
+use (under a lock, so concurrent sessions build it once) and reused by all
+sessions of the server process.
+"""
+import functools
+import threading
+
+import numpy as np
+import scipy.special
+
+# Composite Gauss-Legendre rule: number of panels and nodes per panel
+N_PANELS = 48
+N_NODES = 8
+# The integrand is cut where it dropped by exp(-CUTOFF) below its maximum
+CUTOFF = 40.
+
+# Range of the precomputed grid; values outside are integrated directly
+LOG_U_RANGE = (-9., 2.)
+LOG_R_DIV_B_RANGE = (-4., 1.)
+GRID_STEP = 0.05
+
+_GRID_LOCK = threading.Lock()
+_gl_nodes, _gl_weights = np.polynomial.legendre.leggauss(N_NODES)
+
+
+def hantush_well_function_quad(u, r_div_B):
+    # Direct evaluation by quadrature, vectorized over u and r/B
+    u, r_div_B = np.broadcast_arrays(np.asarray(u, dtype=float), np.asarray(r_div_B, dtype=float))
+    shape = u.shape
+    # u is infinite at t = 0; the largest finite u gives an empty range and W = 0
+    u = np.minimum(u, np.finfo(float).max).reshape(-1, 1)
+    c = r_div_B.reshape(-1, 1) ** 2 / 4.
+    beta = r_div_B.reshape(-1, 1)
+
+    # Integration bounds in x = ln(y), restricted to the part that contributes
+    with np.errstate(divide='ignore'):
+        x_lo = np.maximum(np.log(u), np.log(c / (beta + CUTOFF)))
+    x_hi = np.log(np.maximum(u, beta / 2.) + beta + CUTOFF)
+    x_lo = np.minimum(x_lo, x_hi)
+
+    # Nodes and weights of all panels for all points, shape (n, N_PANELS * N_NODES)
+    width = (x_hi - x_lo) / N_PANELS
+    panel = np.arange(N_PANELS)
+    x = x_lo[..., np.newaxis] + width[..., np.newaxis] * (panel[:, np.newaxis] + (_gl_nodes + 1.) / 2.)
+    x = x.reshape(len(u), -1)
+    weights = np.tile(_gl_weights, N_PANELS) * width / 2.
+
+    f = np.exp(-np.exp(x) - c * np.exp(-x))
+    w = np.sum(f * weights, axis=1)
+    return w.reshape(shape)
+
+
+def hantush_grid():
+    # Bicubic spline of log W over log10(u) and log10(r/B), built once per process
+    with _GRID_LOCK:
+        return _hantush_grid()
+
+
+@functools.lru_cache(maxsize=1)
+def _hantush_grid():
+    # (scipy.interpolate is imported here, it is only needed to build the grid)
+    import scipy.interpolate as interp
+    log_u = np.arange(LOG_U_RANGE[0], LOG_U_RANGE[1] + GRID_STEP / 2, GRID_STEP)
+    log_r_div_B = np.arange(LOG_R_DIV_B_RANGE[0], LOG_R_DIV_B_RANGE[1] + GRID_STEP / 2, GRID_STEP)
+    U, R = np.meshgrid(10 ** log_u, 10 ** log_r_div_B, indexing='ij')
+    log_w = np.log(hantush_well_function_quad(U, R))
+    return interp.RectBivariateSpline(log_u, log_r_div_B, log_w, kx=3, ky=3)
+
+
+def hantush_well_function(u, r_div_B):
+    # W(u, r/B) from the cached grid, with direct quadrature outside of the grid
+    u, r_div_B = np.broadcast_arrays(np.asarray(u, dtype=float), np.asarray(r_div_B, dtype=float))
+    w = np.empty(u.shape)
+    with np.errstate(divide='ignore'):
+        log_u = np.log10(u)
+        log_r_div_B = np.log10(r_div_B)
+    inside = ((log_u >= LOG_U_RANGE[0]) & (log_u <= LOG_U_RANGE[1]) &
+              (log_r_div_B >= LOG_R_DIV_B_RANGE[0]) & (log_r_div_B <= LOG_R_DIV_B_RANGE[1]))
+    if inside.any():
+        w[inside] = np.exp(hantush_grid().ev(log_u[inside], log_r_div_B[inside]))
+    outside = ~inside
+    if outside.any():
+        # No leakage reduces to the Theis well function
+        theis = outside & (r_div_B == 0)
+        w[theis] = scipy.special.exp1(u[theis])
+        quad = outside & ~theis
+        if quad.any():
+            w[quad] = hantush_well_function_quad(u[quad], r_div_B[quad])
+    return w
@@ -0,0 +1,94 @@
+"""Chunked reading of large drawdown CSV files (e.g. pressure loggers at 1 Hz).
+
+The first column of the file holds the time in minutes and the second the
+drawdown in meters (one header line, further columns are ignored). The file
+is parsed in blocks, with the multi-threaded pyarrow reader if it is
+installed and with the pandas C reader otherwise. Each block is copied into
+preallocated NumPy arrays that grow by doubling, so besides the result only
+one block is held in memory. Rows with a missing or non-numeric value are
+dropped. pandas and pyarrow are imported on the first file that is read, not
+with the engine, as most sessions never upload a file.
+"""
+import importlib.util
+import os
+import time
+
+import numpy as np
+
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+# Rows per block of the pandas reader and bytes per block of the pyarrow reader
+CHUNK_ROWS = 2 ** 18
+BLOCK_BYTES = 8 * 2 ** 20
+# Rows that are allocated for the first block
+INITIAL_ROWS = 2 ** 16
+
+
+def _blocks_pyarrow(file, block_bytes):
+    # Time and drawdown columns of the blocks of the pyarrow streaming reader
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    reader = pa_csv.open_csv(file, read_options=pa_csv.ReadOptions(block_size=block_bytes))
+    for batch in reader:
+        columns = []
+        for i in (0, 1):
+            column = batch.column(i)
+            if pa.types.is_integer(column.type) or pa.types.is_floating(column.type) or pa.types.is_null(column.type):
+                columns.append(pc.cast(column, pa.float64()).to_numpy(zero_copy_only=False))
+            else:
+                # Text in a column (e.g. a logger message), non-numeric values become NaN
+                columns.append(pd.to_numeric(column.to_pandas(), errors='coerce').to_numpy(dtype=float))
+        yield tuple(columns)
+
+
+def _blocks_pandas(file, chunk_rows):
+    # Time and drawdown columns of the blocks of the pandas C reader
+    import pandas as pd
+    for chunk in pd.read_csv(file, usecols=[0, 1], chunksize=chunk_rows, engine='c'):
+        yield tuple(pd.to_numeric(chunk.iloc[:, i], errors='coerce').to_numpy(dtype=float) for i in (0, 1))
+
+
+def read_drawdown_csv(file, engine=None, chunk_rows=CHUNK_ROWS, block_bytes=BLOCK_BYTES):
+    # Time (min) and drawdown (m) of a CSV file (path or file object) as arrays
+    # Returns the two arrays and a report with rows, bytes, seconds, rows/s, MB/s, the largest bytes of the two
+    # arrays (without the blocks of the reader, see benchmarks/bench_ingest.py for the traced peak) and the reader
+    if engine is None:
+        engine = 'pyarrow' if PYARROW_AVAILABLE else 'pandas'
+    if engine == 'pyarrow' and not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is not installed, use engine='pandas'")
+    start = time.perf_counter()
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    blocks = _blocks_pyarrow(file, block_bytes) if engine == 'pyarrow' else _blocks_pandas(file, chunk_rows)
+    m_time = np.empty(INITIAL_ROWS)
+    m_ddown = np.empty(INITIAL_ROWS)
+    n = 0
+    for block_time, block_ddown in blocks:
+        keep = np.isfinite(block_time) & np.isfinite(block_ddown)
+        k = int(keep.sum())
+        if n + k > len(m_time):
+            size = max(2 * len(m_time), n + k)
+            m_time = np.resize(m_time, size)
+            m_ddown = np.resize(m_ddown, size)
+        m_time[n:n + k] = block_time[keep]
+        m_ddown[n:n + k] = block_ddown[keep]
+        n += k
+        del block_time, block_ddown, keep
+    memory = m_time.nbytes + m_ddown.nbytes
+    # Release the unused part of the arrays
+    m_time = m_time[:n].copy()
+    m_ddown = m_ddown[:n].copy()
+    seconds = time.perf_counter() - start
+    size = file.tell() if hasattr(file, 'tell') else os.path.getsize(file)
+    report = {
+        'rows': n,
+        'bytes': size,
+        'seconds': seconds,
+        'rows per second': n / seconds,
+        'MB per second': size / 2 ** 20 / seconds,
+        'array memory': memory,
+        'engine': engine,
+    }
+    return m_time, m_ddown, report
@@ -0,0 +1,221 @@
+"""Curve matching in the browser with Bokeh.
+
+With matplotlib every slider move reruns the page on the server and sends a
+new PNG. type_curve_plot instead ships the precomputed dimensionless type
+curves (type_curve_family) and the measured drawdown to the browser once,
+together with Bokeh sliders for the parameters. A JavaScript callback shifts
+the curves as in engine.type_curves (t = 1/u r^2 S / (4 T), s = W Q / (4 pi T),
+log W interpolated between the curves of the neighbouring shape parameters)
+and updates the scatter plot and ME, MAE and RMSE, so moving a slider costs
+no Python rerun. bokeh_html returns a standalone HTML page of the plot (for
+st.iframe); the Bokeh JavaScript is loaded from the CDN. cached_bokeh_html
+keeps the page in FIGURE_CACHE under a figure_key of everything the plot
+depends on, so a rerun with the same data, start values and toggles neither
+builds the layout nor serialises it, and the frame in the browser is not
+reloaded. The pages pass the axis limits of their matplotlib figure as
+x_range and y_range.
+
+Bokeh is optional: BOKEH_AVAILABLE is False if it is not installed. It is
+imported on the first plot only, so a page that never switches to the
+interactive plot does not pay for the import.
+"""
+import importlib.util
+
+import numpy as np
+
+from .rendering import FIGURE_CACHE
+from .type_curves import MIN_W, PARAMETER_STEP, type_curve_family
+
+BOKEH_AVAILABLE = importlib.util.find_spec('bokeh') is not None
+
+# Solutions of the interactive plot and the type curve families they use
+INTERACTIVE_SOLUTIONS = {
+    'Theis': ('Theis',),
+    'Hantush-Jacob': ('Theis', 'Hantush-Jacob'),
+    'Neuman': ('Theis', 'Neuman A', 'Neuman B'),
+}
+# Size of the plots in pixels
+PLOT_WIDTH = 800
+PLOT_HEIGHT = 560
+SCATTER_HEIGHT = 400
+# Decimals of log10 W that are sent to the browser (relative error of W below 0.01 %)
+LOG_W_DECIMALS = 4
+
+_CALLBACK = """
+const T = 10 ** log_T.value;
+const s_term = Q / (4 * Math.PI * T);
+const n = log_u_inv.length;
+const du = log_u_inv[1] - log_u_inv[0];
+
+function type_row(name, log_p) {
+    // log10 W of a family for log10 of the shape parameter, interpolated between the neighbouring curves
+    const family = families[name];
+    const m = family.log_p.length;
+    if (m == 1) return family.log_w[0];
+    const x = Math.min(Math.max((log_p - family.log_p[0]) / step, 0), m - 1);
+    const i = Math.min(Math.floor(x), m - 2);
+    const a = family.log_w[i], c = family.log_w[i + 1];
+    return a.map((w, k) => (i + 1 - x) * w + (x - i) * c[k]);
+}
+function curve(log_w, t_term) {
+    // Type curve shifted by t_term and s_term
+    return {t: log_u_inv.map((x) => 10 ** x * t_term), s: log_w.map((w) => 10 ** w * s_term)};
+}
+function drawdown(log_w, t_term, t) {
+    // Drawdown at the times t read from the shifted type curve (as type_curve_drawdown)
+    return t.map((ti) => {
+        if (!(ti > 0)) return 0;
+        const x = Math.log10(ti / t_term);
+        if (x < log_u_inv[0]) return 10 ** min_log_w * s_term;
+        if (x >= log_u_inv[n - 1]) return 10 ** log_w[n - 1] * s_term;
+        const k = Math.min(Math.floor((x - log_u_inv[0]) / du), n - 2);
+        const f = (x - log_u_inv[k]) / (log_u_inv[k + 1] - log_u_inv[k]);
+        return 10 ** ((1 - f) * log_w[k] + f * log_w[k + 1]) * s_term;
+    });
+}
+
+const theis = type_row('Theis', 0);
+let computed;
+let info;
+if (solution == 'Neuman') {
+    const Sa = 10 ** log_Ss.value * b;
+    const t_a_term = r * r * Sa / 4 / T;
+    const t_b_term = r * r * Sy.value / 4 / T;
+    const w_a = type_row('Neuman A', log_beta.value);
+    const w_b = type_row('Neuman B', log_beta.value);
+    const plateau = 10 ** w_b[0] * s_term;
+    const neuman = (t) => {
+        const s_a = drawdown(w_a, t_a_term, t), s_b = drawdown(w_b, t_b_term, t);
+        return s_a.map((s, k) => Math.max(s + s_b[k] - plateau, 0));
+    };
+    sources[0].data = curve(theis, t_a_term);
+    sources[1].data = curve(theis, t_b_term);
+    const t_0 = 10 ** log_u_inv[0] * t_a_term, t_1 = 10 ** log_u_inv[n - 1] * t_b_term;
+    const t = Array.from({length: 200}, (_, k) => t_0 * (t_1 / t_0) ** (k / 199));
+    sources[2].data = {t: t, s: neuman(t)};
+    computed = neuman(t_data);
+    plot.title.text = `Neuman drawdown with beta = ${(10 ** log_beta.value).toPrecision(3)}`;
+    info = `T = ${T.toExponential(2)} m²/s, Ss = ${(10 ** log_Ss.value).toExponential(2)} 1/m, Sy = ${Sy.value.toFixed(2)}`;
+} else {
+    const S = 10 ** log_S.value;
+    const t_term = r * r * S / 4 / T;
+    sources[0].data = curve(theis, t_term);
+    if (solution == 'Hantush-Jacob') {
+        const w_han = type_row('Hantush-Jacob', log_r_div_B.value);
+        sources[1].data = curve(w_han, t_term);
+        computed = drawdown(w_han, t_term, t_data);
+        plot.title.text = `Hantush-Jacob drawdown with r/B = ${(10 ** log_r_div_B.value).toPrecision(3)}`;
+    } else {
+        computed = drawdown(theis, t_term, t_data);
+    }
+    info = `T = ${T.toExponential(2)} m²/s, S = ${S.toExponential(2)}`;
+}
+scatter.data = {measured: s_data, computed: computed};
+let me = 0, mae = 0, sse = 0;
+for (let k = 0; k < s_data.length; k++) {
+    const e = computed[k] - s_data[k];
+    me += e;
+    mae += Math.abs(e);
+    sse += e * e;
+}
+const m = s_data.length;
+stats.text = `<b>${info}</b><br>ME = ${(me / m).toFixed(3)} m, MAE = ${(mae / m).toFixed(3)} m, RMSE = ${Math.sqrt(sse / m).toFixed(3)} m`;
+"""
+
+
+def _slider(title, start, end, value):
+    from bokeh.models import Slider
+    return Slider(title=title, start=start, end=end, value=float(np.clip(value, start, end)), step=0.01, format='0.00')
+
+
+def type_curve_plot(solution, t, s, Q, r, b=None, parameters=None, x_range=(1E-1, 1E8), y_range=(1E-4, 1E+1),
+                    semilog=False, scatter=True, data_label='measured drawdown', data_color='green'):
+    # Bokeh layout with sliders that shift the type curves of solution (a key of INTERACTIVE_SOLUTIONS) in the browser
+    # parameters holds the start values and slider ranges by slider name:
+    # log_T, log_S (Theis, Hantush-Jacob), log_r_div_B (Hantush-Jacob), log_Ss, Sy, log_beta (Neuman; b is needed)
+    # as (value, start, end)
+    if not BOKEH_AVAILABLE:
+        raise ImportError("bokeh is not installed")
+    from bokeh.layouts import column, row
+    from bokeh.models import ColumnDataSource, CustomJS, Div
+    from bokeh.plotting import figure
+
+    if solution not in INTERACTIVE_SOLUTIONS:
+        raise ValueError(f"Unknown solution {solution!r}, expected one of {tuple(INTERACTIVE_SOLUTIONS)}")
+    t = np.asarray(t, dtype=float)
+    s = np.asarray(s, dtype=float)
+    families = {}
+    for name in INTERACTIVE_SOLUTIONS[solution]:
+        log_u_inv, log_p, log_w = type_curve_family(name)
+        families[name] = {'log_p': log_p.tolist(), 'log_w': np.round(log_w, LOG_W_DECIMALS).tolist()}
+
+    titles = {
+        'log_T': '(log of) Transmissivity in m²/s',
+        'log_S': '(log of) Storativity',
+        'log_r_div_B': '(log of) Leakage factor r/B',
+        'log_Ss': '(log of) Specific storage in 1/m',
+        'Sy': 'Specific Yield',
+        'log_beta': '(log of) beta',
+    }
+    sliders = {name: _slider(titles[name], start, end, value) for name, (value, start, end) in parameters.items()}
+
+    plot = figure(width=PLOT_WIDTH, height=PLOT_HEIGHT, x_axis_type='log', y_axis_type='linear' if semilog else 'log',
+                  x_range=x_range, y_range=y_range, title=f'{solution} drawdown',
+                  x_axis_label='time t in (s)', y_axis_label='drawdown s in (m)')
+    if solution == 'Neuman':
+        curves = (('Computed drawdown early - Theis', 'deepskyblue', 'solid'),
+                  ('Computed drawdown late - Theis', 'blue', 'solid'),
+                  ('Computed drawdown - Neuman', 'darkblue', 'dashed'))
+    elif solution == 'Hantush-Jacob':
+        curves = (('Computed drawdown - Theis', '#1f77b4', 'solid'),
+                  ('Computed drawdown - Hantush-Jacob', 'blue', 'dashed'))
+    else:
+        curves = (('Computed drawdown - Theis', '#1f77b4', 'solid'),)
+    sources = []
+    for label, color, dash in curves:
+        source = ColumnDataSource({'t': [], 's': []})
+        plot.line('t', 's', source=source, legend_label=label, color=color, line_dash=dash, line_width=2)
+        sources.append(source)
+    positive = t > 0
+    plot.scatter(t[positive], s[positive], color=data_color, size=7, legend_label=data_label)
+    plot.legend.location = 'top_left'
+
+    scatter_source = ColumnDataSource({'measured': [], 'computed': []})
+    max_s = float(np.ceil(np.max(s) * 10) / 10)
+    scatter_plot = figure(width=PLOT_WIDTH, height=SCATTER_HEIGHT, x_range=(0, max_s), y_range=(0, max_s),
+                          title='Scatter plot', x_axis_label='Measured s in m', y_axis_label='Computed s in m')
+    scatter_plot.line([0, 200], [0, 200], line_dash='dashed')
+    scatter_plot.scatter('measured', 'computed', source=scatter_source, color=data_color, size=7)
+    stats = Div(width=PLOT_WIDTH)
+
+    callback = CustomJS(args=dict(
+        solution=solution, families=families, log_u_inv=log_u_inv.tolist(), step=PARAMETER_STEP,
+        min_log_w=float(np.log10(MIN_W)), Q=float(Q), r=float(r), b=float(b) if b is not None else 0.,
+        t_data=t.tolist(), s_data=s.tolist(), sources=sources, scatter=scatter_source, plot=plot, stats=stats,
+        **sliders), code=_CALLBACK)
+    for slider in sliders.values():
+        slider.js_on_change('value', callback)
+    # The curves are drawn by the callback when the page is loaded as well
+    plot.js_on_event('document_ready', callback)
+
+    names = list(sliders)
+    half = (len(names) + 1) // 2
+    controls = row(column(*[sliders[name] for name in names[:half]]), column(*[sliders[name] for name in names[half:]]))
+    return column(controls, plot, scatter_plot, stats) if scatter else column(controls, plot, stats)
+
+
+def type_curve_plot_height(scatter=True):
+    # Height in pixels of the layout of type_curve_plot (for the frame in the page)
+    return PLOT_HEIGHT + (SCATTER_HEIGHT if scatter else 0) + 260
+
+
+def bokeh_html(layout, title='Type curve matching'):
+    # Standalone HTML page of a Bokeh layout (Bokeh JavaScript from the CDN)
+    from bokeh.embed import file_html
+    from bokeh.resources import CDN
+    return file_html(layout, CDN, title)
+
+
+def cached_bokeh_html(key, build, cache=FIGURE_CACHE):
+    # HTML page of the layout built by build(), taken from the cache if the plot of key was built before
+    return cache.get(key, lambda: bokeh_html(build()))
@@ -0,0 +1,31 @@
+"""Laplace-domain kernels of the drawdown solutions used in the app.
+
+Each kernel returns the transform of s_D = 4 pi T s / Q with respect to
+t_s = T t / (S r^2) (see laplace.py). Theis and Hantush-Jacob have closed-form
+transforms and serve as reference kernels for the inversion: they are checked
+against scipy.special.exp1 and the quadrature of hantush.py in
+benchmarks/bench_laplace.py. New solutions are added here and registered in
+laplace_kernels with the names of their parameters.
+"""
+import numpy as np
+import scipy.special
+
+from .neuman import neuman_laplace
+
+
+def theis_laplace(p):
+    # Theis (1935): W(u) with u = 1 / (4 t_s)
+    return 2. / p * scipy.special.k0(np.sqrt(p))
+
+
+def hantush_laplace(p, r_div_B):
+    # Hantush and Jacob (1955): W(u, r/B)
+    return 2. / p * scipy.special.k0(np.sqrt(p + r_div_B ** 2))
+
+
+# Kernels and the names of their parameters
+laplace_kernels = {
+    'Theis': (theis_laplace, ()),
+    'Hantush-Jacob': (hantush_laplace, ('r_div_B',)),
+    'Neuman': (neuman_laplace, ('sigma', 'beta')),
+}
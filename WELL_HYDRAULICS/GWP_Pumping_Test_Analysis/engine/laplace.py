@@ -0,0 +1,107 @@
+"""Numerical inversion of Laplace-domain drawdown solutions.
+
+The Gaver-Stehfest algorithm approximates f(t) from its transform F(p) as
+
+    f(t) = ln(2) / t * sum_k V_k * F(k * ln(2) / t),   k = 1 ... N
+
+The weights V_k depend only on N and are computed once per process. All
+abscissae of all times are passed to F in a single array, so a transform that
+is written with NumPy broadcasting is inverted for a whole time vector in one
+call.
+
+A solution is added as a kernel: a function kernel(p, **params) that returns
+the transform of the dimensionless drawdown s_D = 4 pi T s / Q with respect to
+the dimensionless time t_s = T t / (S r^2). p has one more (trailing) axis
+than the times, and every parameter array gets the same trailing axis, so the
+kernel only has to be written with NumPy broadcasting. laplace_drawdown then
+evaluates it for arrays of times and distances, e.g. for wellbore storage,
+skin or aquitard storage without another loop in the pages. The reference
+kernels are collected in kernels.py.
+"""
+import functools
+import math
+
+import numpy as np
+
+# Number of Stehfest terms (even); 12 is a good compromise in double precision
+STEHFEST_N = 12
+# Time vectors longer than MAX_DIRECT_POINTS with parameters that are constant along the
+# time axis are evaluated on a log grid and interpolated
+POINTS_PER_DECADE = 10
+MAX_DIRECT_POINTS = 60
+
+
+@functools.lru_cache(maxsize=None)
+def stehfest_weights(N=STEHFEST_N):
+    # Stehfest weights V_k, k = 1 ... N
+    if N % 2:
+        raise ValueError("The number of Stehfest terms must be even")
+    half = N // 2
+    V = np.zeros(N)
+    for k in range(1, N + 1):
+        total = 0.
+        for j in range((k + 1) // 2, min(k, half) + 1):
+            total += (j ** half * math.factorial(2 * j) /
+                      (math.factorial(half - j) * math.factorial(j) * math.factorial(j - 1) *
+                       math.factorial(k - j) * math.factorial(2 * j - k)))
+        V[k - 1] = (-1) ** (k + half) * total
+    return V
+
+
+def stehfest_invert(F, t, N=STEHFEST_N):
+    # Invert F(p) at all times t; F receives p with an extra trailing axis of length N
+    t = np.asarray(t, dtype=float)
+    V = stehfest_weights(N)
+    ln2_t = np.log(2.) / t[..., np.newaxis]
+    p = ln2_t * np.arange(1, N + 1)
+    return np.sum(V * F(p), axis=-1) * ln2_t[..., 0]
+
+
+def grid_well_function(kernel, t_s, params):
+    # Curves along the last axis of t_s, the parameters are constant along that axis:
+    # invert on one log grid for all curves, then a cubic spline per curve
+    # (scipy.interpolate is imported here, it is only needed for long time vectors)
+    import scipy.interpolate as interp
+    lead = np.broadcast_shapes(t_s.shape[:-1], *[value.shape[:-1] for value in params.values()])
+    t_rows = np.broadcast_to(t_s, lead + t_s.shape[-1:]).reshape(-1, t_s.shape[-1])
+    rows = {key: np.broadcast_to(value, lead + (1,)).reshape(-1, 1, 1) for key, value in params.items()}
+    w = np.zeros(t_rows.shape)
+    positive = t_rows > 0
+    if not positive.any():
+        return w.reshape(lead + t_s.shape[-1:])
+
+    log_min, log_max = np.log10(t_rows[positive].min()), np.log10(t_rows[positive].max())
+    n = max(int(np.ceil((log_max - log_min) * POINTS_PER_DECADE)) + 1, 4)
+    log_grid = np.linspace(log_min, log_max, n)
+    t_grid = np.broadcast_to(10 ** log_grid, (len(t_rows), n))
+    w_grid = stehfest_invert(lambda p: kernel(p, **rows), t_grid)
+    for i, row in enumerate(positive):
+        if row.any():
+            w[i, row] = interp.CubicSpline(log_grid, w_grid[i])(np.log10(t_rows[i, row]))
+    # Stehfest gives small negative values where the drawdown vanishes
+    return np.maximum(w, 0.).reshape(lead + t_s.shape[-1:])
+
+
+def laplace_well_function(kernel, t_s, **params):
+    # Dimensionless drawdown of a kernel at dimensionless times t_s (zero for t_s <= 0)
+    t_s = np.asarray(t_s, dtype=float)
+    params = {key: np.asarray(value, dtype=float) for key, value in params.items()}
+    if (t_s.ndim and t_s.shape[-1] > MAX_DIRECT_POINTS and
+            all(value.shape[-1:] in [(), (1,)] for value in params.values())):
+        return grid_well_function(kernel, t_s, params)
+
+    # Direct inversion at every point
+    t_s, *values = np.broadcast_arrays(t_s, *params.values())
+    w = np.zeros(t_s.shape)
+    positive = t_s > 0
+    if positive.any():
+        params = {key: value[positive][:, np.newaxis] for key, value in zip(params, values)}
+        w[positive] = np.maximum(stehfest_invert(lambda p: kernel(p, **params), t_s[positive]), 0.)
+    return w
+
+
+def laplace_drawdown(kernel, T, S, t, Q, r, **params):
+    # Drawdown for arrays of times and distances (NumPy broadcasting of t, r and the parameters)
+    t_s = T * np.asarray(t, dtype=float) / (S * np.asarray(r, dtype=float) ** 2)
+    s = Q / 4. / np.pi / T * laplace_well_function(kernel, t_s, **params)
+    return s
@@ -0,0 +1,77 @@
+"""Misfit of the Theis solution over a grid of log10(T) and log10(S).
+
+For every pair (T_i, S_j) of the grid the drawdown at all measured times is
+compared with the data. With s = Q / (4 pi T) W(u) and u = r^2 S / (4 T t),
+u only depends on S / T. On grids of log10(T) and log10(S) with the same step
+S_j / T_i is constant along the diagonals j - i, so W is evaluated once per
+diagonal (n_T + n_S - 1 curves instead of n_T * n_S) and gathered for blocks
+of T rows. The blocks are sized so that their temporary arrays stay within a
+memory budget; other grids evaluate W for every pair, block by block. The
+memory that is reported is the size of these arrays, not a trace of the
+allocations (benchmarks/bench_misfit.py traces them).
+"""
+import time
+
+import numpy as np
+
+from .statistics import compute_statistics
+from .well_functions import theis_u, well_function
+
+# Points per axis of the misfit map on the pages
+GRID_POINTS = 400
+# Bytes for the temporary arrays of one block of T rows
+MEMORY_BUDGET = 16 * 2 ** 20
+# Temporary float arrays of the size of one block (the gathered W, turned into drawdown and residuals in place)
+BLOCK_ARRAYS = 1
+
+
+def common_step(log_T, log_S):
+    # Step of the two grids if both are uniform with the same step, else None
+    steps = np.concatenate((np.diff(log_T), np.diff(log_S)))
+    if len(steps) == 0 or np.ptp(steps) > 1e-9 * np.abs(steps).max():
+        return None
+    return steps[0]
+
+
+def theis_misfit_surface(t, s, Q, r, log_T, log_S, memory_budget=MEMORY_BUDGET):
+    # ME, MAE and RMSE of the Theis drawdown for all pairs of log_T (rows) and log_S (columns)
+    # Returns the three arrays, the time in seconds and the bytes of the arrays of the computation (the three
+    # maps, W on the diagonals and the largest block)
+    start = time.perf_counter()
+    t = np.asarray(t, dtype=float)
+    s = np.asarray(s, dtype=float)
+    log_T = np.asarray(log_T, dtype=float)
+    log_S = np.asarray(log_S, dtype=float)
+    n_T, n_S, n_t = len(log_T), len(log_S), len(t)
+
+    step = common_step(log_T, log_S)
+    if step is not None:
+        # W on the diagonals k = j - i + n_T - 1
+        log_S_div_T = log_S[0] - log_T[0] + (np.arange(n_T + n_S - 1) - (n_T - 1)) * step
+        with np.errstate(divide='ignore'):
+            W_diagonal = well_function(r ** 2 / 4. * 10 ** log_S_div_T[:, np.newaxis] / t)
+        diagonal = np.arange(n_S) + n_T - 1
+
+    me = np.empty((n_T, n_S))
+    mae = np.empty((n_T, n_S))
+    rmse = np.empty((n_T, n_S))
+    # Without the diagonals u is one more temporary array
+    arrays = BLOCK_ARRAYS if step is not None else BLOCK_ARRAYS + 1
+    rows = max(int(memory_budget // (arrays * n_S * n_t * 8)), 1)
+    memory = (3 * n_T * n_S + arrays * min(rows, n_T) * n_S * n_t) * 8
+    if step is not None:
+        memory += W_diagonal.nbytes
+    for first in range(0, n_T, rows):
+        block = slice(first, min(first + rows, n_T))
+        i = np.arange(n_T)[block]
+        if step is not None:
+            W = W_diagonal[diagonal - i[:, np.newaxis]]
+        else:
+            with np.errstate(divide='ignore'):
+                W = well_function(theis_u(10 ** log_T[i, np.newaxis, np.newaxis],
+                                          10 ** log_S[:, np.newaxis], r, t))
+        # Drawdown in place in the block of W
+        computed = np.multiply(W, Q / 4. / np.pi / 10 ** log_T[i, np.newaxis, np.newaxis], out=W)
+        me[block], mae[block], rmse[block] = compute_statistics(s, computed, overwrite=True)
+        del W, computed
+    return me, mae, rmse, time.perf_counter() - start, memory
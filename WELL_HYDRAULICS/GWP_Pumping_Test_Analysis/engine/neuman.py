@@ -0,0 +1,85 @@
+"""Neuman (1974) solution for a fully penetrating well in an unconfined aquifer.
+
+The drawdown is computed from the Laplace-domain solution for the vertically
+averaged drawdown in a fully penetrating observation well,
+
+    s_D(p) = 2 / p * sum_n w(e_n) K0(sqrt(p + beta e_n^2)),
+    w(e) = 2 a^2 / (e^2 (e^2 + a^2 + a)),   a = p / (sigma beta)
+
+with the roots e_n of e tan(e) = a in (n pi, n pi + pi/2). The dimensionless
+time is t_s = T t / (S r^2) = 1 / (4 u_A), sigma = S / Sy, and
+beta = r^2 Kz / (b^2 Kr). For small beta the series converges slowly, so only
+the first N_TERMS terms are summed and the rest is replaced by its
+Euler-Maclaurin integral. The transform is inverted with the Stehfest
+algorithm (laplace.py), which gives the complete curve from the early
+(elastic) to the late (specific yield) Theis curve for any beta without
+stitching the two tables.
+"""
+import numpy as np
+import scipy.special
+
+from .laplace import laplace_drawdown, laplace_well_function
+
+# Explicit series terms; the remainder is integrated with a Gauss-Legendre rule
+N_TERMS = 20
+N_TAIL_NODES = 24
+# Newton steps after the fixed-point start value (converged to 1e-15 over 1e-8 < a < 1e10)
+NEWTON_ITERATIONS = 4
+
+_tail_nodes, _tail_weights = np.polynomial.legendre.leggauss(N_TAIL_NODES)
+_tail_nodes = (_tail_nodes + 1.) / 2.
+_tail_weights = _tail_weights / 2.
+
+
+def neuman_roots(a, n_terms):
+    # Roots e_n of e tan(e) = a, n = 0 ... n_terms - 1, along a new trailing axis
+    a = np.asarray(a, dtype=float)[..., np.newaxis]
+    n_pi = np.arange(n_terms) * np.pi
+    # Write e = n pi + x with x in (0, pi/2) and solve f(x) = (n pi + x) sin(x) - a cos(x) = 0
+    x = np.where(n_pi == 0, np.arctan(np.sqrt(a)), np.arctan(a / np.maximum(n_pi, np.pi)))
+    x = np.where(n_pi == 0, x, np.arctan(a / (n_pi + x)))
+    lo = np.zeros(x.shape)
+    hi = np.full(x.shape, np.pi / 2)
+    for _ in range(NEWTON_ITERATIONS):
+        sin_x, cos_x = np.sin(x), np.cos(x)
+        f = (n_pi + x) * sin_x - a * cos_x
+        # f increases monotonically in x, so the sign of f narrows the bracket
+        lo = np.where(f < 0, x, lo)
+        hi = np.where(f > 0, x, hi)
+        x_new = x - f / ((1. + a) * sin_x + (n_pi + x) * cos_x)
+        # Newton steps that leave the bracket are replaced by bisection
+        x = np.where((x_new < lo) | (x_new > hi), (lo + hi) / 2., x_new)
+    return n_pi + x
+
+
+def neuman_laplace(p, sigma, beta):
+    # Laplace transform of the dimensionless drawdown s_D with respect to t_s
+    p = np.asarray(p, dtype=float)
+    a = (p / (sigma * beta))[..., np.newaxis]
+    # Extra trailing axis of the series terms for p and for parameter arrays
+    p_ = p[..., np.newaxis]
+    beta = np.asarray(beta, dtype=float)[..., np.newaxis]
+
+    def term(e):
+        return 2. * a ** 2 / (e ** 2 * (e ** 2 + a ** 2 + a)) * scipy.special.k0(np.sqrt(p_ + beta * e ** 2))
+
+    # Terms n = 0 ... N_TERMS; the last one is the first term of the remainder
+    e = neuman_roots(a[..., 0], N_TERMS + 1)
+    h = term(e)
+    # Remainder sum_{n >= N} h(n) = integral of h dn + h(N) / 2, with dn/de = (1 + a / (e^2 + a^2)) / pi
+    e_N = e[..., -1:]
+    e_tail = e_N / _tail_nodes
+    dn_de = (1. + a / (e_tail ** 2 + a ** 2)) / np.pi
+    tail = np.sum(term(e_tail) * dn_de * e_N / _tail_nodes ** 2 * _tail_weights, axis=-1)
+    return 2. / p * (np.sum(h[..., :-1], axis=-1) + h[..., -1] / 2. + tail)
+
+
+def neuman_well_function(t_s, sigma, beta):
+    # Dimensionless drawdown W(u_A, u_B, beta) at dimensionless times t_s = 1 / (4 u_A)
+    return laplace_well_function(neuman_laplace, t_s, sigma=sigma, beta=beta)
+
+
+def compute_s_NEU(T, S, Sy, t, Q, r, beta):
+    # Drawdown of the Neuman solution for elastic storativity S, specific yield Sy and beta
+    s = laplace_drawdown(neuman_laplace, T, S, t, Q, r, sigma=S / Sy, beta=beta)
+    return s
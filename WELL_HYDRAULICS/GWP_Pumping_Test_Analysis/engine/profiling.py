@@ -0,0 +1,109 @@
+"""Opt-in timing of the phases of a page rerun.
+
+Profiling is switched on by whoever runs the server, never by a visitor: with
+the environment variable GWP_PROFILE=1 for every rerun, or with GWP_PROFILE=query
+for the browser tabs opened with the query parameter ?profile=1 (e.g. on a
+local or staging server). On a public server without GWP_PROFILE the query
+parameter is ignored, so visitors cannot switch on the timing or write to the
+trace file.
+A page creates a RerunProfile at the top of its script and calls
+profile.lap(phase) at the end of each phase (setup, data selection, well
+function, fit, statistics, figure build, PNG encoding, widgets): the time since
+the previous lap is added to that phase. profile.finish shows the breakdown
+(e.g. in st.sidebar) and appends it as one JSON line to the trace file
+(GWP_TRACE_FILE, rerun_trace.jsonl in the working directory by default).
+
+The pages compute in st.fragment functions, which rerun on their own when a
+widget inside them changes. The first lap after a finished record starts a
+new record for that fragment rerun, which finish_fragment ends; it is not
+shown in the sidebar (fragments cannot write there) but in the fragment.
+Without profiling all methods return at once.
+"""
+import collections
+import datetime
+import json
+import os
+import threading
+import time
+
+from .rendering import FIGURE_CACHE
+
+PROFILE_ENV = 'GWP_PROFILE'
+TRACE_FILE_ENV = 'GWP_TRACE_FILE'
+TRACE_FILE = 'rerun_trace.jsonl'
+PHASES = ('setup', 'widgets', 'data selection', 'fit', 'well function', 'statistics', 'figure build', 'PNG encoding')
+_TRACE_LOCK = threading.Lock()
+
+
+def profiling_enabled(query_params=None):
+    # True if GWP_PROFILE is set (not 0), or if it is 'query' and the query parameters (st.query_params)
+    # hold profile=1
+    setting = os.environ.get(PROFILE_ENV, '0').lower()
+    if setting in ('', '0', 'false', 'no'):
+        return False
+    if setting != 'query':
+        return True
+    value = (query_params or {}).get('profile', '0')
+    return str(value).lower() not in ('', '0', 'false', 'no')
+
+
+class RerunProfile:
+    # Seconds per phase of one page rerun (or fragment rerun)
+
+    def __init__(self, page, enabled=False, trace_file=None):
+        self.page = page
+        self.enabled = enabled
+        self.trace_file = trace_file or os.environ.get(TRACE_FILE_ENV, TRACE_FILE)
+        self._start(fragment=False)
+
+    def _start(self, fragment):
+        self.fragment = fragment
+        self.finished = False
+        self.phases = collections.OrderedDict()
+        self.cache_counts = (FIGURE_CACHE.hits, FIGURE_CACHE.misses)
+        self.started = self.last = time.perf_counter()
+
+    def lap(self, phase):
+        # Add the time since the previous lap to phase
+        if not self.enabled:
+            return
+        if self.finished:
+            self._start(fragment=True)
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.) + now - self.last
+        self.last = now
+
+    def record(self):
+        # Breakdown in milliseconds with the figure cache hits and misses of the rerun
+        return {
+            'time': datetime.datetime.now().isoformat(timespec='milliseconds'),
+            'page': self.page,
+            'rerun': 'fragment' if self.fragment else 'page',
+            'phases ms': {phase: round(seconds * 1e3, 3) for phase, seconds in self.phases.items()},
+            'total ms': round((self.last - self.started) * 1e3, 3),
+            'figure cache hits': FIGURE_CACHE.hits - self.cache_counts[0],
+            'figure cache misses': FIGURE_CACHE.misses - self.cache_counts[1],
+        }
+
+    def finish(self, container=None, phase='widgets'):
+        # End the record (the time since the last lap goes to phase), append it to the trace file
+        # and show it in container (anything with .table and .caption, e.g. st.sidebar)
+        if not self.enabled or self.finished:
+            return None
+        self.lap(phase)
+        record = self.record()
+        self.finished = True
+        with _TRACE_LOCK:
+            with open(self.trace_file, 'a') as trace:
+                trace.write(json.dumps(record) + '\n')
+        if container is not None:
+            container.caption(f"**Rerun profile** of {record['page']} ({record['rerun']}): {record['total ms']:.1f} ms, "
+                              f"figure cache {record['figure cache hits']} hits / {record['figure cache misses']} misses")
+            container.table([{'phase': name, 'ms': ms} for name, ms in record['phases ms'].items()])
+        return record
+
+    def finish_fragment(self, container=None, phase='widgets'):
+        # End the record if it was started by a fragment rerun (a full page run is ended by finish)
+        if self.enabled and self.fragment:
+            return self.finish(container, phase)
+        return None
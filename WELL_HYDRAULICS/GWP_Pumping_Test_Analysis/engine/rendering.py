@@ -0,0 +1,113 @@
+"""Figures without the global state of pyplot.
+
+plt.figure registers every figure in the global figure manager of pyplot,
+which the pages never closed, and plt.xlabel, plt.plot, ... act on the
+"current" axes that all sessions of the server share. The pages therefore
+build their figures with new_figure, a matplotlib Figure with its own Agg
+canvas that is only referenced by the page, and call the methods of its
+axes. figure_png draws the figure into a PNG as st.pyplot does (tight
+bounding box, 200 dpi) and clears it, so the figure is released at once.
+
+Only the text is serialised by RENDER_LOCK: the mathtext parser (a shared
+pyparsing grammar with a global packrat cache) and the text layout caches of
+matplotlib are shared by all threads and are not thread-safe, while the
+FreeType fonts are kept per thread and the Agg buffer belongs to the figure.
+The canvas of new_figure therefore draws with a renderer that holds the lock
+in its text methods only. At most RENDER_SLOTS figures (one per CPU) are
+drawn at a time: every drawing holds an Agg buffer of about 20 MB at the size
+of the page figures, and with more figures than CPUs drawing at once all
+of them finish late (50 sessions on one CPU, benchmarks/bench_sessions.py:
+p50 41 s and 1.4 GB with only the text locked, against 26 s and 0.4 GB one
+at a time). Building the figures and computing the curves run concurrently.
+
+Students move the sliders in steps of 0.01 and return to the same positions,
+so the PNGs are kept in FIGURE_CACHE, one least-recently-used cache for all
+sessions of the server process within FIGURE_CACHE_BYTES. A page builds its
+figure in a function and passes it to cached_figure_png with a figure_key of
+everything the figure depends on (page, data, solution, parameters, toggles);
+on a hit neither the curves are computed nor the figure is drawn.
+FIGURE_CACHE.hits and FIGURE_CACHE.misses count the reruns of both kinds.
+"""
+import io
+import os
+import threading
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg, RendererAgg
+from matplotlib.figure import Figure
+
+from .cache import ResultCache
+
+FIGURE_DPI = 200
+# Re-entrant: draw_text calls draw_mathtext
+RENDER_LOCK = threading.RLock()
+# Figures that are drawn at the same time
+RENDER_SLOTS = threading.BoundedSemaphore(os.cpu_count() or 1)
+# Memory cap of the cache of rendered figures of the server process
+FIGURE_CACHE_BYTES = 64 * 2 ** 20
+# Decimals of the parameters in the keys of the figure cache (the sliders move in steps of 0.01)
+KEY_DECIMALS = 6
+FIGURE_CACHE = ResultCache(FIGURE_CACHE_BYTES)
+
+
+class _TextLockedRenderer(RendererAgg):
+    # Agg renderer whose text methods (layout, measuring, mathtext) hold RENDER_LOCK
+
+    def draw_text(self, *args, **kwargs):
+        with RENDER_LOCK:
+            return super().draw_text(*args, **kwargs)
+
+    def draw_mathtext(self, *args, **kwargs):
+        with RENDER_LOCK:
+            return super().draw_mathtext(*args, **kwargs)
+
+    def get_text_width_height_descent(self, *args, **kwargs):
+        with RENDER_LOCK:
+            return super().get_text_width_height_descent(*args, **kwargs)
+
+
+class _Canvas(FigureCanvasAgg):
+    # Agg canvas that draws with _TextLockedRenderer. FigureCanvasAgg.get_renderer keeps one RendererAgg per
+    # size and dpi; the renderer it returns is given the class with the locked text methods, which adds no state
+
+    def get_renderer(self, *args, **kwargs):
+        renderer = super().get_renderer(*args, **kwargs)
+        if type(renderer) is not _TextLockedRenderer:
+            renderer.__class__ = _TextLockedRenderer
+        return renderer
+
+
+def new_figure(**kwargs):
+    # Figure with its own Agg canvas, not registered with pyplot
+    fig = Figure(**kwargs)
+    _Canvas(fig)
+    return fig
+
+
+def figure_png(fig, dpi=FIGURE_DPI, clear=True):
+    # PNG of the figure (e.g. for st.image); the figure is cleared afterwards unless clear is False
+    buffer = io.BytesIO()
+    with RENDER_SLOTS:
+        fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    if clear:
+        fig.clear()
+    return buffer.getvalue()
+
+
+def figure_key(*state):
+    # Key of the figure cache: floats (also in tuples and lists) rounded to KEY_DECIMALS, so that
+    # a slider position reached again gives the same key despite rounding in 10 ** x and np.log10
+    return tuple(_quantize(item) for item in state)
+
+
+def _quantize(item):
+    if isinstance(item, (float, np.floating)):
+        return round(float(item), KEY_DECIMALS)
+    if isinstance(item, (tuple, list, np.ndarray)):
+        return tuple(_quantize(value) for value in item)
+    return item
+
+
+def cached_figure_png(key, draw, cache=FIGURE_CACHE):
+    # PNG of the figure built by draw(), taken from the cache if the figure of key was rendered before
+    return cache.get(key, lambda: figure_png(draw()))
@@ -0,0 +1,53 @@
+"""Goodness-of-fit statistics for one or many computed drawdown curves.
+
+The measured drawdown is a vector of n values and the computed drawdown an
+array whose last axis holds the same n times; all leading axes are candidate
+parameter sets (e.g. the rows of a fit Jacobian or the blocks of a misfit
+map), so thousands of candidates are scored in one call. Optional weights
+per time (e.g. 1 / variance) give the weighted variants of all statistics.
+"""
+import numpy as np
+
+
+def compute_statistics(measured, computed, weights=None, overwrite=False):
+    # Mean error, mean absolute error and root mean squared error of computed (..., n) against measured (n,)
+    # At most one temporary array of the size of computed; none if computed may be overwritten
+    measured = np.asarray(measured, dtype=float)
+    w = np.ones(measured.shape) if weights is None else np.asarray(weights, dtype=float)
+    w_sum = w.sum()
+    error = np.subtract(computed, measured, out=computed if overwrite else None)
+    me = error @ w / w_sum
+    if weights is None:
+        sse = np.einsum('...i,...i->...', error, error)
+    else:
+        sse = np.einsum('...i,...i,i->...', error, error, w)
+    rmse = np.sqrt(sse / w_sum)
+    mae = np.abs(error, out=error) @ w / w_sum
+    return me, mae, rmse
+
+
+def fit_statistics(measured, computed, weights=None):
+    # ME, MAE, RMSE, R², NSE and log RMSE of computed (..., n) against measured (n,)
+    # Returns a dictionary of arrays with the leading shape of computed
+    measured = np.asarray(measured, dtype=float)
+    computed = np.asarray(computed, dtype=float)
+    w = np.ones(measured.shape) if weights is None else np.asarray(weights, dtype=float)
+    w_sum = w.sum()
+    me, mae, rmse = compute_statistics(measured, computed, w)
+
+    # Nash-Sutcliffe efficiency and coefficient of determination (squared weighted correlation)
+    measured_dev = measured - measured @ w / w_sum
+    sst = np.einsum('i,i,i->', measured_dev, measured_dev, w)
+    nse = 1. - rmse ** 2 * w_sum / sst
+    computed_dev = computed - (computed @ w / w_sum)[..., np.newaxis]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r2 = (computed_dev @ (w * measured_dev)) ** 2 / (np.einsum('...i,...i,i->...', computed_dev, computed_dev, w) * sst)
+
+    # RMSE of log10(s) for the times with positive measured and computed drawdown
+    positive = (computed > 0) & (measured > 0)
+    log_error = np.log10(np.where(positive, computed, 1.)) - np.log10(np.where(measured > 0, measured, 1.))
+    log_error[~positive] = 0.
+    with np.errstate(invalid='ignore'):
+        log_rmse = np.sqrt(np.einsum('...i,...i,i->...', log_error, log_error, w) / (positive @ w))
+
+    return {'ME': me, 'MAE': mae, 'RMSE': rmse, 'R2': r2, 'NSE': nse, 'log RMSE': log_rmse}
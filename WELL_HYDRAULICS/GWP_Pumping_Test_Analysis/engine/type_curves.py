@@ -0,0 +1,134 @@
+"""Dimensionless type curves, computed once per server process.
+
+The drawdown of the Theis, Hantush-Jacob and Neuman solutions is
+s = Q / (4 pi T) W(1/u, p) with 1/u = 4 T t / (r^2 S) and a shape parameter p
+(r/B or beta). For a given p the curve W against 1/u has the same shape for
+all T and S; on log-log axes a change of T and S only shifts it:
+
+    t = 1/u * r^2 S / (4 T),   s = W * Q / (4 pi T)
+
+The families are evaluated once on a grid of log10(1/u) and log10(p). A page
+then only scales the axes of the stored curve; for a shape parameter between
+two grid values log W is interpolated linearly between the neighbouring
+curves, so no well function is evaluated when a slider moves. The pages
+draw a curve at the points of type_curve_points, placed by curvature with
+engine.sampling so that the drawn curve is within CURVE_TOLERANCE decades of
+the well function: the points follow the interpolated curve within the
+tolerance less FAMILY_ERROR, the error of the interpolation of the families.
+Since T and S only shift the curve on log-log axes, the points are found
+once per curve. Neuman is
+given by the classic type curves for S/Sy -> 0: the early curve (A) against
+1/u_A = 4 T t / (r^2 S) and the late curve (B) against 1/u_B = 4 T t / (r^2 Sy).
+
+Each family is built under its own lock: a session that asks for a family
+while another session or the warm-up (engine.warmup) builds it waits for that
+build instead of repeating it.
+"""
+import functools
+import threading
+
+import numpy as np
+
+from .hantush import hantush_well_function
+from .neuman import neuman_well_function
+from .sampling import adaptive_curve
+from .well_functions import well_function
+
+# Range and resolution of the curves in log10(1/u) (u from 1e-5 to 1e4 as in the pages)
+LOG_U_INV_RANGE = (-4., 5.)
+POINTS_PER_DECADE = 20
+# Step of the families in log10 of the shape parameter, over the slider ranges
+PARAMETER_STEP = 0.05
+LOG_R_DIV_B_RANGE = (-3., 0.5)
+LOG_BETA_RANGE = (-4., 1.)
+# S/Sy of the Neuman type curves (the limit S/Sy -> 0)
+SIGMA_LIMIT = 1e-9
+# Smallest W that is stored (W underflows for large u)
+MIN_W = 1e-300
+# Largest distance of a plotted type curve from the well function and largest length of its segments, in
+# decades of 1/u and W (about a third of a pixel and 80 pixels on the page figures), and the smallest W that is
+# resolved (the curves leave the plots below it)
+CURVE_TOLERANCE = 2e-3
+# Largest distance in decades of the interpolated families from the well functions (benchmarks/bench_sampling.py)
+FAMILY_ERROR = 7e-4
+CURVE_MAX_SEGMENT = 0.5
+MIN_PLOTTED_W = 1e-8
+
+type_curve_names = ('Theis', 'Hantush-Jacob', 'Neuman A', 'Neuman B')
+_BUILD_LOCKS = {name: threading.Lock() for name in type_curve_names}
+
+
+def type_curve_family(name):
+    # log10(1/u), log10 of the shape parameter and log10 W (one row per parameter) of a family
+    if name not in _BUILD_LOCKS:
+        raise ValueError(f"Unknown type curve family {name!r}, expected one of {type_curve_names}")
+    with _BUILD_LOCKS[name]:
+        return _type_curve_family(name)
+
+
+@functools.lru_cache(maxsize=None)
+def _type_curve_family(name):
+    # The family, built once per process
+    n = int(round((LOG_U_INV_RANGE[1] - LOG_U_INV_RANGE[0]) * POINTS_PER_DECADE)) + 1
+    log_u_inv = np.linspace(LOG_U_INV_RANGE[0], LOG_U_INV_RANGE[1], n)
+    u_inv = 10 ** log_u_inv
+    if name == 'Theis':
+        log_p = np.zeros(1)
+        w = well_function(1. / u_inv)[np.newaxis]
+    elif name == 'Hantush-Jacob':
+        log_p = np.arange(LOG_R_DIV_B_RANGE[0], LOG_R_DIV_B_RANGE[1] + PARAMETER_STEP / 2, PARAMETER_STEP)
+        w = hantush_well_function(1. / u_inv, 10 ** log_p[:, np.newaxis])
+    else:
+        log_p = np.arange(LOG_BETA_RANGE[0], LOG_BETA_RANGE[1] + PARAMETER_STEP / 2, PARAMETER_STEP)
+        # t_s = 1 / (4 u_A), and 1 / (4 u_B) = t_s S / Sy for the late curve
+        t_s = u_inv / 4. if name == 'Neuman A' else u_inv / 4. / SIGMA_LIMIT
+        w = neuman_well_function(t_s, SIGMA_LIMIT, 10 ** log_p[:, np.newaxis])
+    return log_u_inv, log_p, np.log10(np.maximum(w, MIN_W))
+
+
+def type_curve(name, parameter=None):
+    # 1/u and W of a family for the shape parameter (r/B or beta), interpolated between the neighbouring curves
+    log_u_inv, log_p, log_w = type_curve_family(name)
+    if len(log_p) == 1:
+        row = log_w[0]
+    else:
+        x = np.clip((np.log10(parameter) - log_p[0]) / PARAMETER_STEP, 0., len(log_p) - 1.)
+        i = min(int(x), len(log_p) - 2)
+        row = (i + 1 - x) * log_w[i] + (x - i) * log_w[i + 1]
+    return 10 ** log_u_inv, 10 ** row
+
+
+def type_curve_points(name, parameter=None, tolerance=CURVE_TOLERANCE):
+    # 1/u and W of type_curve at the fewest points that draw it on log-log axes within tolerance decades of the
+    # well function (within tolerance - FAMILY_ERROR of the interpolated curve), once per process for a family,
+    # shape parameter and tolerance
+    return _type_curve_points(name, None if parameter is None else float(parameter), tolerance)
+
+
+@functools.lru_cache(maxsize=256)
+def _type_curve_points(name, parameter, tolerance):
+    # The points of type_curve_points
+    u_inv, w = type_curve(name, parameter)
+    log_u_inv, log_w = np.log10(u_inv), np.log10(w)
+    _, log_u_inv_points, _ = adaptive_curve(
+        lambda t: (t, np.maximum(np.interp(t, log_u_inv, log_w), np.log10(MIN_PLOTTED_W))),
+        log_u_inv[0], log_u_inv[-1], tolerance=tolerance - FAMILY_ERROR, max_segment=CURVE_MAX_SEGMENT)
+    return 10 ** log_u_inv_points, 10 ** np.interp(log_u_inv_points, log_u_inv, log_w)
+
+
+def type_curve_drawdown(name, parameter, t, t_term, s_term):
+    # Drawdown at times t read from a type curve shifted by t_term = r^2 S / (4 T) and s_term = Q / (4 pi T)
+    u_inv, w = type_curve(name, parameter)
+    t = np.asarray(t, dtype=float)
+    with np.errstate(divide='ignore'):
+        log_w_t = np.interp(np.log10(t / t_term), np.log10(u_inv), np.log10(w), left=np.log10(MIN_W))
+    return np.where(t > 0, 10 ** log_w_t * s_term, 0.)
+
+
+def neuman_type_curve_drawdown(beta, t, t_a_term, t_b_term, s_term):
+    # Neuman drawdown from the early (A) and late (B) type curve, A + B - plateau for S/Sy -> 0
+    # (the early curve ends and the late curve starts on the plateau W = W(1/u_B -> 0, beta))
+    plateau = type_curve('Neuman B', beta)[1][0] * s_term
+    s = (type_curve_drawdown('Neuman A', beta, t, t_a_term, s_term) +
+         type_curve_drawdown('Neuman B', beta, t, t_b_term, s_term) - plateau)
+    return np.maximum(s, 0.)
@@ -0,0 +1,87 @@
+"""Warm-up of a fresh server process in a background thread.
+
+After a restart the first page that is opened pays for importing the
+libraries of the pages (streamlit_book alone takes more than half a second),
+for building the type-curve families (Hantush-Jacob and Neuman take about
+2.5 s together) and for loading the font cache of matplotlib on the first
+PNG. start_warm_up, called by the landing page and by every page after the
+engine import, does this work once per process in a daemon thread, so it
+overlaps with reading the landing page instead of delaying the first slider
+move. The builds are locked (engine.type_curves, engine.hantush), so a page
+that needs a family while the warm-up builds it waits for that build instead
+of repeating it.
+
+The warm-up thread holds these locks (and those of the families) while it
+builds, at a time when the sessions already run, so the process must not be
+forked after start_warm_up: a child forked while a lock is held inherits it
+locked, and its first family build waits forever. Nothing in the engine
+forks; the optional pool of the multi-start fits (engine.fitting) starts its
+workers by a fork server or spawns them.
+
+Libraries of rarely used paths (bokeh for the interactive plot, pandas and
+pyarrow for an uploaded CSV file, scipy.stats for the multi-start fits) are
+not part of the warm-up; they are imported on first use. WARM_UP_REPORT holds
+the seconds of each step once the warm-up is done.
+"""
+import importlib
+import threading
+import time
+
+from .datasets import dataset_catalog, load_dataset
+from .rendering import figure_png, new_figure
+from .type_curves import type_curve_family, type_curve_names
+
+# Modules that the pages import at the top (besides streamlit, numpy and the engine)
+WARM_UP_MODULES = (
+    'streamlit_book',
+    'streamlit_extras.stateful_button',
+    'streamlit_extras.stodo',
+    'streamlit_extras.stylable_container',
+)
+# Seconds of the steps of the warm-up of this process, filled by warm_up
+WARM_UP_REPORT = {}
+
+_START_LOCK = threading.Lock()
+_thread = None
+
+
+def warm_up(modules=WARM_UP_MODULES):
+    # Imports the modules, builds the type-curve families, loads the data sets and draws a small figure
+    # Returns the seconds of each step; a module that is not installed is skipped
+    report = {}
+    for module in modules:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            continue
+        report[f'import {module}'] = time.perf_counter() - start
+    for name in type_curve_names:
+        start = time.perf_counter()
+        type_curve_family(name)
+        report[f'type curves {name}'] = time.perf_counter() - start
+    start = time.perf_counter()
+    for name in dataset_catalog():
+        load_dataset(name)
+    report['data sets'] = time.perf_counter() - start
+    start = time.perf_counter()
+    # The first PNG loads the font cache and the text layout of matplotlib
+    fig = new_figure(figsize=(1, 1))
+    ax = fig.add_subplot()
+    ax.set_xscale('log')
+    ax.set_title('warm-up')
+    figure_png(fig, dpi=10)
+    report['first figure'] = time.perf_counter() - start
+    WARM_UP_REPORT.update(report)
+    return report
+
+
+def start_warm_up():
+    # Starts warm_up in a daemon thread on the first call of the process; returns the thread
+    # (no fork may follow: the thread holds the build locks, see the module docstring)
+    global _thread
+    with _START_LOCK:
+        if _thread is None:
+            _thread = threading.Thread(target=warm_up, name='engine warm-up', daemon=True)
+            _thread.start()
+    return _thread
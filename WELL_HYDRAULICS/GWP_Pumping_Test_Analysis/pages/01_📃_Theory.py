@@ -2,6 +2,10 @@ import streamlit as st
 import streamlit_book as stb
 from streamlit_extras.stylable_container import stylable_container
 from streamlit_extras.stateful_button import button
+from engine import profiling_enabled, RerunProfile, start_warm_up
+
+# Opt-in timing of the phases of each rerun (GWP_PROFILE=1 on the server, or ?profile=1 if GWP_PROFILE=query), shown in the sidebar and appended to the trace file
+profile = RerunProfile('01_Theory', profiling_enabled(st.query_params))
 
 # Authors, institutions, and year
 year = 2025 
@@ -187,4 +191,11 @@ columns_lic = st.columns((5,1))
 with columns_lic[0]:
     st.markdown(f'Developed by {", ".join(author_list)} ({year}). <br> {institution_text}', unsafe_allow_html=True)
 with columns_lic[1]:
-    st.image('FIGS/CC_BY-SA_icon.png')
\ No newline at end of file
+    st.image('FIGS/CC_BY-SA_icon.png')
+
+# After the first run of a page, the libraries, type curves and data sets of the other pages are prepared
+# once per server process in the background
+start_warm_up()
+
+# Phases of this rerun in the sidebar (only if profiling is switched on)
+profile.finish(st.sidebar)
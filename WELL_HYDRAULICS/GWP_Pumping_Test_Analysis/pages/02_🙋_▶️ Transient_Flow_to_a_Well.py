@@ -1,12 +1,14 @@
 # Loading the required Python libraries
 import numpy as np
-import matplotlib.pyplot as plt
-import scipy.special
 import streamlit as st
 import streamlit_book as stb
 from streamlit_extras.stylable_container import stylable_container
 from streamlit_extras.stateful_button import button
 from streamlit_extras.stodo import to_do
+from engine import compute_s_Theis, figure_png, new_figure, profiling_enabled, RerunProfile, start_warm_up, well_function
+
+# Opt-in timing of the phases of each rerun (GWP_PROFILE=1 on the server, or ?profile=1 if GWP_PROFILE=query), shown in the sidebar and appended to the trace file
+profile = RerunProfile('02_Transient_Flow_to_a_Well', profiling_enabled(st.query_params))
 
 # Authors, institutions, and year
 year = 2025 
@@ -108,27 +110,9 @@ st.markdown('''
             '''
 )
 
-# (Here the necessary functions like the well function $W(u)$ are defined. Later, those functions are used in the computation)
-# Define a function, class, and object for Theis Well analysis
+# (The well function $W(u)$ and the drawdown solutions are imported from the shared engine module. It is loaded once per server process and not re-run with each interaction.)
 # (Here, the method computes the data for the well function. Those data can be used to generate a type curve.)
 
-def well_function(u):
-    return scipy.special.exp1(u)
-
-def theis_u(T,S,r,t):
-    u = r ** 2 * S / 4. / T / t
-    return u
-
-def theis_s(Q, T, u):
-    s = Q / 4. / np.pi / T * well_function(u)
-    return s
-
-def compute_s(T, S, t, Q, r):
-    u = theis_u(T, S, r, t)
-    s = theis_s(Q, T, u)
-    return s 
-    
-    
 # Callback function to update session state
 def update_T():
     st.session_state.T_slider_value = st.session_state.T_input
@@ -158,11 +142,13 @@ w_u  = [well_function(u_max/r_max) for x in range(r_max)]
 
 max_s = 20
 max_r = 1000
+profile.lap('setup')
 
 # Define the part of the code that is re-run with each user interaction
 
 @st.fragment
 def transient_flow_well():
+    profile.lap('widgets')
     # Get input data
     # Define the minimum and maximum for the logarithmic scale 
     log_min1 = -7.0 # T / Corresponds to 10^-7 = 0.0000001
@@ -222,63 +208,68 @@ def transient_flow_well():
             S2 = 10 ** S2_slider_value_new
             container.write("**$S2$ (dimensionless):** %5.2e" %S2)
             
+    profile.lap('widgets')
     # Range of temporal / spatial coordinate
     r = np.linspace(1, max_r, 200)
     r_neg = r * -1.0
     t = np.linspace(1, 604800, 200)
     
     # Compute drawdown for  1 and 2
-    s1 = compute_s(T, S, t_show, Q, r)
-    s2  = compute_s(T, S, t, Q, r_show)
+    s1 = compute_s_Theis(T, S, t_show, Q, r)
+    s2  = compute_s_Theis(T, S, t, Q, r_show)
     if comparison:
         # Compute drawdown for  1_2
-        s1_2 = compute_s(T2, S2, t_show, Q, r)
-        s2_2 = compute_s(T2, S2, t, Q, r_show)
+        s1_2 = compute_s_Theis(T2, S2, t_show, Q, r)
+        s2_2 = compute_s_Theis(T2, S2, t, Q, r_show)
     
     # Compute drawdown for a specific point
     x_point = r_show
-    y_point = compute_s(T, S, t_show, Q, r_show)
+    y_point = compute_s_Theis(T, S, t_show, Q, r_show)
     x2_point = t_show
-    y2_point = compute_s(T, S, t_show, Q, r_show)
+    y2_point = compute_s_Theis(T, S, t_show, Q, r_show)
+    profile.lap('well function')
     
     # Plotting and printing of results
-    fig=plt.figure(figsize=(15, 6))
+    fig=new_figure(figsize=(15, 6))
     
-    plt.subplot(1, 2, 1)    
-    plt.title('Drawdown vs Distance at seconds =  %8i' %x2_point, fontsize=16)
-    plt.plot(r, s1, linewidth=1., color='b', label=r'drawdown')
-    plt.plot(r_neg, s1, linewidth=1, color='b')
+    ax = fig.add_subplot(1, 2, 1)    
+    ax.set_title('Drawdown vs Distance at seconds =  %8i' %x2_point, fontsize=16)
+    ax.plot(r, s1, linewidth=1., color='b', label=r'drawdown')
+    ax.plot(r_neg, s1, linewidth=1, color='b')
     if comparison:
-        plt.plot(r, s1_2, linewidth=1., color='black', label=r'drawdown for T2 & S2', linestyle='dashed')
-        plt.plot(r_neg, s1_2, linewidth=1, color='black', linestyle='dashed')
-    plt.fill_between(r,s1,max_s, facecolor='lightblue')
-    plt.fill_between(r_neg,s1,max_s, facecolor='lightblue')
-    plt.xlim(-max_r, max_r)
-    plt.ylim(max_s,-5)
-    plt.plot(x_point,y_point, marker='o', color='r',linestyle ='None', label='drawdown plotted & printed below graph') 
-    plt.xlabel(r'Distance from well in m', fontsize=14)
-    plt.ylabel(r'Drawdown in m', fontsize=14)
-    plt.legend()
-    plt.grid(True)
+        ax.plot(r, s1_2, linewidth=1., color='black', label=r'drawdown for T2 & S2', linestyle='dashed')
+        ax.plot(r_neg, s1_2, linewidth=1, color='black', linestyle='dashed')
+    ax.fill_between(r,s1,max_s, facecolor='lightblue')
+    ax.fill_between(r_neg,s1,max_s, facecolor='lightblue')
+    ax.set_xlim(-max_r, max_r)
+    ax.set_ylim(max_s,-5)
+    ax.plot(x_point,y_point, marker='o', color='r',linestyle ='None', label='drawdown plotted & printed below graph') 
+    ax.set_xlabel(r'Distance from well in m', fontsize=14)
+    ax.set_ylabel(r'Drawdown in m', fontsize=14)
+    ax.legend()
+    ax.grid(True)
     
-    plt.subplot(1, 2, 2)
-    plt.title('Drawdown vs Time at meters =  %8i' %x_point, fontsize=16)
-    plt.plot(t, s2, linewidth=1., color='r', label=r'drawdown')
+    ax = fig.add_subplot(1, 2, 2)
+    ax.set_title('Drawdown vs Time at meters =  %8i' %x_point, fontsize=16)
+    ax.plot(t, s2, linewidth=1., color='r', label=r'drawdown')
     if comparison:
-        plt.plot(t, s2_2, linewidth=1., color='black', label=r'drawdown for T2 & S2', linestyle='dashed')
-    plt.fill_between(t,s2,max_s, facecolor='mistyrose')
-    plt.plot(x2_point,y2_point, marker='o', color='b',linestyle ='None', label='drawdown plotted & printed below graph') 
-    plt.xlim(0, 86400*7)
-    plt.ylim(max_s,-5)
-    plt.xlabel(r'time in s', fontsize=14)
-    plt.ylabel(r'Drawdown in m', fontsize=14)
-    plt.xticks(np.arange(0, 7*86400, step=86400))  # Set label locations.
-    plt.legend()
-    plt.grid(True)
+        ax.plot(t, s2_2, linewidth=1., color='black', label=r'drawdown for T2 & S2', linestyle='dashed')
+    ax.fill_between(t,s2,max_s, facecolor='mistyrose')
+    ax.plot(x2_point,y2_point, marker='o', color='b',linestyle ='None', label='drawdown plotted & printed below graph') 
+    ax.set_xlim(0, 86400*7)
+    ax.set_ylim(max_s,-5)
+    ax.set_xlabel(r'time in s', fontsize=14)
+    ax.set_ylabel(r'Drawdown in m', fontsize=14)
+    ax.set_xticks(np.arange(0, 7*86400, step=86400))  # Set label locations.
+    ax.legend()
+    ax.grid(True)
     
-    st.pyplot(fig)
+    profile.lap('figure build')
+    st.image(figure_png(fig))
+    profile.lap('PNG encoding')
     
     st.write('**Drawdown  =  %5.2f' %y_point, ' m at distance = %8.2f' %x_point, ' m and time =  %8i' %x2_point, ' sec**')
+    profile.finish_fragment(st)
     
 transient_flow_well()
 
@@ -325,4 +316,11 @@ columns_lic = st.columns((5,1))
 with columns_lic[0]:
     st.markdown(f'Developed by {", ".join(author_list)} ({year}). <br> {institution_text}', unsafe_allow_html=True)
 with columns_lic[1]:
-    st.image('FIGS/CC_BY-SA_icon.png')
\ No newline at end of file
+    st.image('FIGS/CC_BY-SA_icon.png')
+
+# After the first run of a page, the libraries, type curves and data sets of the other pages are prepared
+# once per server process in the background
+start_warm_up()
+
+# Phases of this rerun in the sidebar (only if profiling is switched on)
+profile.finish(st.sidebar)
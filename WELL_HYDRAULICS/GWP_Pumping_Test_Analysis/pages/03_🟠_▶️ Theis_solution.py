@@ -1,12 +1,14 @@
 # Loading the required Python libraries
 import numpy as np
-import matplotlib.pyplot as plt
-import scipy.special
 import math
-import pandas as pd
 import streamlit as st
 import streamlit_book as stb
 from streamlit_extras.stateful_button import button
+from matplotlib.colors import LogNorm, SymLogNorm
+from engine import BOKEH_AVAILABLE, GRID_POINTS, cached_bokeh_html, cached_figure_png, compute_s_Theis, compute_statistics, figure_key, figure_png, fit_theis, load_dataset, new_figure, profiling_enabled, RerunProfile, start_warm_up, theis_misfit_surface, type_curve_plot, type_curve_plot_height, type_curve_points
+
+# Opt-in timing of the phases of each rerun (GWP_PROFILE=1 on the server, or ?profile=1 if GWP_PROFILE=query), shown in the sidebar and appended to the trace file
+profile = RerunProfile('03_Theis_solution', profiling_enabled(st.query_params))
 
 # Authors, institutions, and year
 year = 2025 
@@ -135,48 +137,8 @@ st.markdown("""
 """
 )
 # Computation
-# (Here the necessary functions like the well function $W(u)$ are defined. Later, those functions are used in the computation)
-# Define a function, class, and object for Theis Well analysis
-
-def well_function(u):
-    return scipy.special.exp1(u)
-    
-def theis_u(T,S,r,t):
-    u = r ** 2 * S / 4. / T / t
-    return u
-
-def theis_s(Q, T, u):
-    s = Q / 4. / np.pi / T * well_function(u)
-    return s
-    
-def compute_s(T, S, t, Q, r):
-    u = theis_u(T, S, r, t)
-    s = theis_s(Q, T, u)
-    return s
-    
-def compute_statistics(measured, computed):
-    # Calculate the number of values
-    n = len(measured)
-
-    # Initialize a variable to store the sum of squared differences
-    total_me = 0
-    total_mae = 0
-    total_rmse = 0
-
-    # Loop through each value
-    for i in range(n): # Add the squared difference to the total
-        total_me   += (computed[i] - measured[i])
-        total_mae  += (abs(computed[i] - measured[i]))
-        total_rmse += (computed[i] - measured[i])**2
-
-    # Calculate the me, mae, mean squared error
-    me = total_me / n
-    mae = total_mae / n
-    meanSquaredError = total_rmse / n
+# (The well function $W(u)$, the drawdown solutions and the fit statistics are imported from the shared engine module. It is loaded once per server process and not re-run with each interaction.)
 
-    # Raise the mean squared error to the power of 0.5 
-    rmse = (meanSquaredError) ** (1/2)
-    return me, mae, rmse
 
 # Callback function to update session state
 def update_T(v):
@@ -187,19 +149,22 @@ def update_S(v):
 # Initialize session state for value and toggle state
 st.session_state.number_input = False  # Default to number_input
 
-# (Here, the method computes the data for the well function. Those data can be used to generate a type curve.)
-u_min = -5
-u_max = 4
+# (The Theis type curve W(u) against 1/u is computed once per server process, at the fewest points that draw it within a third of a pixel. T and S only shift it on the log-log axes.)
+u_inv, w_u = type_curve_points('Theis')
+u = 1/u_inv
 
-u = np.logspace(u_min,u_max)
-u_inv = 1/u
-w_u = well_function(u)
+# Misfit map, computed once per data set, rate and distance and then taken from the cache (the grid is fixed)
+@st.cache_data(max_entries=8, show_spinner=False)
+def misfit_surface(m_time_s, m_ddown, Qs, r, log_T_grid, log_S_grid):
+    return theis_misfit_surface(m_time_s, m_ddown, Qs, r, log_T_grid, log_S_grid)
+profile.lap('setup')
 
 
 
 @st.fragment
 def inverse(v):
     # This is the function to plot the graph with the data 
+    profile.lap('widgets')
     
     Viterbo = False
     Varnum = False
@@ -224,6 +189,9 @@ def inverse(v):
         semilog = st.toggle("Toggle for **semi log graph**", key = 15+v)
         refine_plot = st.toggle("**Zoom in** on the **data in the graph**", key = 20+v)
         scatter = st.toggle('Show scatter plot', key = 30+v)
+        auto_fit = st.toggle('**Fit automatically** (the sliders give the start values)', key = 40+v)
+        misfit_map = st.toggle('Show **misfit map** of $T$ and $S$', key = 50+v)
+        interactive = st.toggle('**Interactive plot** (Bokeh, the curves are moved in the browser without a rerun)', key = 35+v, disabled = not BOKEH_AVAILABLE)
         if v==2:
             Viterbo = True
         if v==3:
@@ -246,121 +214,171 @@ def inverse(v):
         S = 10 ** S_slider_value_new
         container.write("**Storativity (dimensionless):** %5.2e" %S)
     
-    # Drawdown data from SYMPLE exercise and parameters 
-    m_time = [1,1.5,2,2.5,3,4,5,6,8,10,12,14,18,24,30,40,50,60,100,120] # time in minutes
-    m_ddown = [0.66,0.87,0.99,1.11,1.21,1.36,1.49,1.59,1.75,1.86,1.97,2.08,2.20,2.36,2.49,2.65,2.78,2.88,3.16,3.28]   # drawdown in meters
-    r = 120       # m
-    b = 8.5       # m
-    Qs = 0.3/60   # m^3/s
-    Qd = Qs*60*60*24 # m^3/d
-
+    profile.lap('widgets')
+    # Drawdown data and parameters from the data set catalog (SYMPLE exercise, Viterbo or Varnum 2016 / R12;
+    # the Viterbo exercise omits the first reading after 5 seconds and has its own distance, thickness and rate)
     if Viterbo:
-        # Drawdown data from Viterbo exercise and parameters 
-        m_time = [ 1, 1.416666667, 2.166666667, 2.5, 2.916666667, 3.566666667, 3.916666667, 4.416666667, 4.833333333, 5.633333333, 6.516666667, 7.5, 8.916666667, 10.13333333, 11.16666667, 12.6, 16.5, 18.53333333, 22.83333333, 27.15, 34.71666667, 39.91666667, 48.21666667, 60.4, 72.66666667, 81.91666667, 94.66666667, 114.7166667, 123.5]
-        m_ddown = [ 0.09, 0.12, 0.185, 0.235, 0.22, 0.26, 0.3, 0.31, 0.285, 0.34, 0.4, 0.34, 0.38, 0.405, 0.38, 0.385, 0.415, 0.425, 0.44, 0.44, 0.46, 0.47, 0.495, 0.54, 0.525, 0.53, 0.56, 0.57, 0.58]
-        r = 21           # m
-        b = 13          # m
-        Qs = 11.16/3600   # m^3/s
-        Qd = Qs*60*60*24 # m^3/d
-
-    if Varnum:
-        #R12\n",
-        m_time =  [1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,180,181,182,183,184,185,186,187,188,189,190,191,192,193,194,195,196,197,198,199,200,201,202,203,204,205,206,207,208,209,210,211,212,213,214,215,216,217,218,219,220,221,222,223,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,244,245,246,247,248,249,250,251,252,253,254,255,256,257,258,259,260,261,262,263,264,265,266,267,268,269,270,271,272,273,274,275,276,277,278,279,280,281,282,283,284,285,286,287,288,289,290,291,292,293,294,295,296,297,298,299,300,301,302,303,304,305,306,307,308,309,310,311,312,313,314,315,316,317,318,319,320,321,322,323,324,325] # time in minutes\n",
-        m_ddown = [2E-05,0.02022,0.04591,0.0716,0.09342,0.11433,0.12882,0.14332,0.15139,0.16313,0.17396,0.18203,0.18827,0.1936,0.19878,0.2012,0.20729,0.21247,0.21489,0.22007,0.22249,0.22583,0.22826,0.23068,0.23358,0.23648,0.23938,0.24228,0.24243,0.24533,0.24915,0.2493,0.2522,0.25235,0.2551,0.2551,0.25785,0.25785,0.2606,0.2606,0.26335,0.26335,0.2661,0.2661,0.26597,0.26585,0.26847,0.2656,0.26822,0.27177,0.26797,0.27152,0.27139,0.27402,0.27397,0.27392,0.27387,0.27382,0.27652,0.27647,0.27642,0.27637,0.27907,0.27627,0.27614,0.27877,0.27589,0.27577,0.27839,0.27735,0.27814,0.2771,0.28064,0.2796,0.27712,0.2774,0.28042,0.27795,0.27822,0.2785,0.28152,0.27905,0.28207,0.28235,0.28307,0.28012,0.28175,0.2843,0.2841,0.28482,0.28462,0.28442,0.28422,0.28402,0.28404,0.28407,0.28684,0.28412,0.28689,0.28692,0.28694,0.28422,0.28699,0.28702,0.28717,0.28732,0.28747,0.28762,0.28777,0.28792,0.28807,0.28822,0.28837,0.28852,0.29144,0.28887,0.29179,0.28922,0.28939,0.28957,0.28974,0.28992,0.29009,0.29027,0.28994,0.29237,0.28929,0.29172,0.29139,0.29107,0.29074,0.29042,0.29009,0.28977,0.28974,0.28972,0.28969,0.29333,0.28964,0.28687,0.28959,0.29323,0.28954,0.28952,0.29336,0.29353,0.29371,0.29022,0.29406,0.29423,0.29441,0.29458,0.29109,0.29493,0.29488,0.29483,0.29478,0.29473,0.29468,0.29463,0.29458,0.29453,0.29723,0.29718,0.29443,0.29443,0.29443,0.29443,0.29443,0.29718,0.29443,0.29443,0.29443,0.29718,0.29701,0.29683,0.29666,0.29648,0.29631,0.29613,0.29596,0.29578,0.29561,0.29543,0.29561,0.29853,0.29596,0.29613,0.29631,0.29648,0.29666,0.29683,0.29701,0.29993,0.29688,0.29658,0.29628,0.29598,0.29568,0.29538,0.29508,0.29478,0.29723,0.29693,0.29418,0.29418,0.29418,0.29418,0.29693,0.29693,0.29418,0.29418,0.29693,0.29418,0.29433,0.29723,0.29738,0.29478,0.29768,0.29783,0.29798,0.29813,0.29828,0.29843,0.29838,0.29833,0.29828,0.29823,0.29818,0.29813,0.29808,0.29803,0.29798,0.29793,0.29796,0.29798,0.29801,0.29803,0.30081,0.30083,0.29811,0.29813,0.29816,0.30093,0.29853,0.29888,0.29923,0.29958,0.29993,0.30303,0.30338,0.30098,0.30133,0.30168,0.30408,0.30098,0.30063,0.30303,0.29993,0.30233,0.29923,0.29888,0.29853,0.29818,0.30113,0.30133,0.29878,0.29898,0.30193,0.30213,0.30233,0.30253,0.30273,0.30018,0.30001,0.30258,0.30241,0.29948,0.29931,0.29913,0.30171,0.29878,0.29861,0.29843,0.30133,0.29873,0.29888,0.29903,0.29918,0.29933,0.29948,0.29963,0.30253,0.29993,0.30011,0.30028,0.30046,0.30063,0.30081,0.30373,0.30391,0.30133,0.30151,0.30443,0.30151,0.30133,0.30116,0.30098,0.30081,0.30338,0.30046,0.30028,0.30286,0.29993,0.30286,0.30303,0.30321,0.30338,0.30356,0.30373,0.30391,0.30408,0.30426,0.30443,0.30408] # drawdown in meters\n",
-        r = 38.9     # m
-        b = 12       # m
-        Qs = 0.01317   # m^3/s
-        Qd = Qs*60*60*24 # m^3/d
+        m_time_s, m_ddown, dataset = load_dataset('viterbo_2023_exercise')
+    elif Varnum:
+        m_time_s, m_ddown, dataset = load_dataset('varnum_2016_r12')
+    else:
+        m_time_s, m_ddown, dataset = load_dataset('synthetic')
+    r = dataset['r']       # m
+    b = dataset['b']       # m
+    Qs = dataset['Q']      # m^3/s
+    Qd = Qs*60*60*24 # m^3/d
 
-    m_time_s = [i*60 for i in m_time] # time in seconds
-    num_times = len(m_time)
+    num_times = len(m_time_s)
+    profile.lap('data selection')
+    
+    # Automatic fit: Levenberg-Marquardt in log10(T) and log10(S), warm start from the slider values
+    if auto_fit:
+        fit_x, fit_cov, fit_rmse, fit_iter, fit_time = fit_theis(m_time_s, m_ddown, Qs, r, (T_slider_value_new, S_slider_value_new))
+        T, S = 10 ** fit_x
+    profile.lap('fit')
     # Compute K and SS to provide parameters for plausibility check
     # (i.e. are the parameter in a reasonable range)
     K = T/b     # m/s
     SS = S/b
     
    
-    # Theis curve
-    t_term = r**2 * S / 4 / T
-    s_term = Qs/(4 * np.pi * T)
-
-    t = u_inv * t_term
-    s = w_u * s_term
-    
-    # Compute point data for scatter plot 
-    m_ddown_theis = [compute_s(T, S, i, Qs, r) for i in m_time_s]
-    
-    # Find the max for the scatter plot
-    max_s = math.ceil(max(m_ddown)*10)/10
-        
-    fig = plt.figure(figsize=(10,14))
-    ax = fig.add_subplot(2, 1, 1)
-    # Info-Box
-    props   = dict(boxstyle='round', facecolor='wheat', alpha=0.5)
-    out_txt = '\n'.join((       
-                         r'$T$ (m²/s) = %10.2E' % (T, ),
-                         r'$S$ (-) = %10.2E' % (S, )))
-    ax.plot(t, s, label=r'calculated Theis drawdown for T and S')
+    # Label and color of the measured drawdown and axis limits of the drawdown plot, also used by the interactive plot
     if Viterbo:
-        ax.plot(m_time_s, m_ddown,'go', label=r'measured drawdown - Viterbo 23')
+        data_label, data_color = 'measured drawdown - Viterbo 23', 'green'
     elif Varnum:
-        ax.plot(m_time_s, m_ddown,'go', label=r'measured drawdown - Varnum16/R12')
+        data_label, data_color = 'measured drawdown - Varnum16/R12', 'green'
     else:
-        ax.plot(m_time_s, m_ddown,'ro', label=r'measured drawdown - ideal data')
-    if semilog:
-        plt.xscale("log")
-    else:    
-        plt.yscale("log")
-        plt.xscale("log")
-    plt.xticks(fontsize=14)
-    plt.yticks(fontsize=14)
+        data_label, data_color = 'measured drawdown - ideal data', 'red'
     if refine_plot:
-        if semilog:
-            plt.axis([1E0,1E4,0,4])
-        else:
-            plt.axis([1E0,1E4,1E-2,1E+1])
+        axis_limits = [1E0,1E4,0,4] if semilog else [1E0,1E4,1E-2,1E+1]
     else:
+        axis_limits = [1E-1,1E5,0,10] if semilog else [1E-1,1E5,1E-4,1E+1]
+    
+    def draw():
+        # Curves and figure, only computed if the figure is not in the figure cache
+        # Theis curve
+        t_term = r**2 * S / 4 / T
+        s_term = Qs/(4 * np.pi * T)
+
+        t = u_inv * t_term
+        s = w_u * s_term
+    
+        # Compute point data for scatter plot 
+        m_ddown_theis = compute_s_Theis(T, S, m_time_s, Qs, r)
+        profile.lap('well function')
+    
+        # Find the max for the scatter plot
+        max_s = math.ceil(max(m_ddown)*10)/10
+        
+        fig = new_figure(figsize=(10,14))
+        ax = fig.add_subplot(2, 1, 1)
+        # Info-Box
+        props   = dict(boxstyle='round', facecolor='wheat', alpha=0.5)
+        out_txt = '\n'.join((       
+                             r'$T$ (m²/s) = %10.2E' % (T, ),
+                             r'$S$ (-) = %10.2E' % (S, )))
+        ax.plot(t, s, label=r'calculated Theis drawdown for T and S')
+        ax.plot(m_time_s, m_ddown, 'o', color=data_color, label=data_label)
         if semilog:
-            plt.axis([1E-1,1E5,0,10])
-            ax.text((0.2),0.8,'Coarse plot - Refine for final fitting')            
+            ax.set_xscale("log")
+        else:    
+            ax.set_yscale("log")
+            ax.set_xscale("log")
+        ax.tick_params(axis='x', labelsize=14)
+        ax.tick_params(axis='y', labelsize=14)
+        ax.axis(axis_limits)
+        if not refine_plot:
+            if semilog:
+                ax.text((0.2),0.8,'Coarse plot - Refine for final fitting')
+            else:
+                ax.text((0.2),1.8E-4,'Coarse plot - Refine for final fitting')
+        ax.grid(which="both")
+        ax.set_xlabel(r'time t in (s)', fontsize=14)
+        ax.set_ylabel(r'drawdown s in (m)', fontsize=14)
+        ax.set_title('Theis drawdown', fontsize=16)
+        ax.legend(fontsize=14)
+        if semilog:
+            ax.text(0.3, 0.95,out_txt, horizontalalignment='right', transform=ax.transAxes, fontsize=14, verticalalignment='top', bbox=props)
         else:
-            plt.axis([1E-1,1E5,1E-4,1E+1])
-            ax.text((0.2),1.8E-4,'Coarse plot - Refine for final fitting')
-    ax.grid(which="both")
-    plt.xlabel(r'time t in (s)', fontsize=14)
-    plt.ylabel(r'drawdown s in (m)', fontsize=14)
-    plt.title('Theis drawdown', fontsize=16)
-    plt.legend(fontsize=14)
-    if semilog:
-        plt.text(0.3, 0.95,out_txt, horizontalalignment='right', transform=ax.transAxes, fontsize=14, verticalalignment='top', bbox=props)
-    else:
-        plt.text(0.97, 0.15,out_txt, horizontalalignment='right', transform=ax.transAxes, fontsize=14, verticalalignment='top', bbox=props)
+            ax.text(0.97, 0.15,out_txt, horizontalalignment='right', transform=ax.transAxes, fontsize=14, verticalalignment='top', bbox=props)
     
-    if scatter:
-        x45 = [0,200]
-        y45 = [0,200]
-        ax = fig.add_subplot(2, 1, 2)
-        ax.plot(x45,y45, '--')
-        if Viterbo:
-            ax.plot(m_ddown, m_ddown_theis,  'go', label=r'measured')
-        elif Varnum:
-            ax.plot(m_ddown, m_ddown_theis,  'go', label=r'measured')
-        else:
-            ax.plot(m_ddown, m_ddown_theis,  'ro', label=r'measured')
-        me, mae, rmse = compute_statistics(m_ddown, m_ddown_theis)
-        plt.title('Scatter plot', fontsize=16)
-        plt.xlabel(r'Measured s in m', fontsize=14)
-        plt.ylabel(r'Computed s in m', fontsize=14)
-        plt.ylim(0, max_s)
-        plt.xlim(0, max_s)
-        out_txt = '\n'.join((
-                             r'$ME = %.3f$ m' % (me, ),
-                             r'$MAE = %.3f$ m' % (mae, ),
-                             r'$RMSE = %.3f$ m' % (rmse, ))) 
-        plt.text(0.97*max_s, 0.05*max_s, out_txt, horizontalalignment='right', bbox=dict(boxstyle="square", facecolor='wheat'), fontsize=14)
+        if scatter:
+            x45 = [0,200]
+            y45 = [0,200]
+            ax = fig.add_subplot(2, 1, 2)
+            ax.plot(x45,y45, '--')
+            if Viterbo:
+                ax.plot(m_ddown, m_ddown_theis,  'go', label=r'measured')
+            elif Varnum:
+                ax.plot(m_ddown, m_ddown_theis,  'go', label=r'measured')
+            else:
+                ax.plot(m_ddown, m_ddown_theis,  'ro', label=r'measured')
+            profile.lap('figure build')
+            me, mae, rmse = compute_statistics(m_ddown, m_ddown_theis)
+            profile.lap('statistics')
+            ax.set_title('Scatter plot', fontsize=16)
+            ax.set_xlabel(r'Measured s in m', fontsize=14)
+            ax.set_ylabel(r'Computed s in m', fontsize=14)
+            ax.set_ylim(0, max_s)
+            ax.set_xlim(0, max_s)
+            out_txt = '\n'.join((
+                                 r'$ME = %.3f$ m' % (me, ),
+                                 r'$MAE = %.3f$ m' % (mae, ),
+                                 r'$RMSE = %.3f$ m' % (rmse, ))) 
+            ax.text(0.97*max_s, 0.05*max_s, out_txt, horizontalalignment='right', bbox=dict(boxstyle="square", facecolor='wheat'), fontsize=14)
+        profile.lap('figure build')
+        return fig
+    
+    if interactive:
+        # Bokeh plot with the same axes: the sliders of the plot shift the curves in the browser, starting from T and S
+        # (the HTML page of the same data, start values and toggles is built once per server process)
+        build = lambda: type_curve_plot('Theis', m_time_s, m_ddown, Qs, r,
+                                        parameters=dict(log_T=(np.log10(T), log_min1, log_max1), log_S=(np.log10(S), log_min2, log_max2)),
+                                        x_range=axis_limits[:2], y_range=axis_limits[2:], semilog=semilog, scatter=scatter,
+                                        data_label=data_label, data_color=data_color)
+        html = cached_bokeh_html(figure_key('03 interactive', v, np.log10(T), np.log10(S), semilog, refine_plot, scatter), build)
+        st.iframe(html, height=type_curve_plot_height(scatter))
+        profile.lap('figure build')
+    else:
+        # The figure of the same data, parameters and toggles is rendered once per server process
+        st.image(cached_figure_png(figure_key('03', v, np.log10(T), np.log10(S), semilog, refine_plot, scatter), draw))
+    profile.lap('PNG encoding')
     
+    if auto_fit:
+        st.write("**Automatic fit** (Levenberg-Marquardt started from the slider values, %i iterations in %.1f ms)" % (fit_iter, fit_time*1000))
+        st.write("- Transmissivity **$T$ = % 10.2E"% T, " m²/s** (standard deviation of log10 $T$: %.3f)" % np.sqrt(fit_cov[0, 0]))
+        st.write("- Storativity    **$S$ = % 10.2E"% S, "[dimensionless]** (standard deviation of log10 $S$: %.3f)" % np.sqrt(fit_cov[1, 1]))
+        st.write("- Correlation of log10 $T$ and log10 $S$: %.2f" % (fit_cov[0, 1] / np.sqrt(fit_cov[0, 0] * fit_cov[1, 1])))
+        st.write("- **RMSE = %.4f m**" % fit_rmse)
     
-    st.pyplot(fig)
+    # Misfit map: ME, MAE and RMSE for a grid of log10(T) and log10(S), the current T and S are marked
+    if misfit_map:
+        misfit_measure = st.selectbox("**Misfit measure** of the map", ("RMSE", "MAE", "ME"), key = 70+v)
+        log_T_grid = np.linspace(log_min1, log_max1, GRID_POINTS)
+        log_S_grid = np.linspace(log_min2, log_max2, GRID_POINTS)
+        me_map, mae_map, rmse_map, map_time, map_memory = misfit_surface(m_time_s, m_ddown, Qs, r, log_T_grid, log_S_grid)
+        profile.lap('statistics')
+        misfit = {"RMSE": rmse_map, "MAE": mae_map, "ME": me_map}[misfit_measure]
+        if misfit_measure == "ME":
+            norm, cmap = SymLogNorm(linthresh=0.01, vmin=-np.abs(misfit).max(), vmax=np.abs(misfit).max()), 'RdBu_r'
+        else:
+            norm, cmap = LogNorm(), 'viridis'
+        i_min, j_min = np.unravel_index(np.argmin(rmse_map), rmse_map.shape)
+        fig_map = new_figure(figsize=(10,8))
+        ax = fig_map.add_subplot(1, 1, 1)
+        im = ax.imshow(misfit.T, origin='lower', extent=[log_min1, log_max1, log_min2, log_max2], aspect='auto', norm=norm, cmap=cmap)
+        fig_map.colorbar(im, label=f"{misfit_measure} in m")
+        ax.plot(np.log10(T), np.log10(S), 'w+', markersize=18, mew=3, label=r'current $T$ and $S$')
+        ax.plot(log_T_grid[i_min], log_S_grid[j_min], 'wo', markersize=8, mfc='none', mew=2, label=r'grid point with the lowest RMSE')
+        ax.set_xlabel(r'log10 of transmissivity $T$ in m²/s', fontsize=14)
+        ax.set_ylabel(r'log10 of storativity $S$', fontsize=14)
+        ax.set_title(f"{misfit_measure} of the Theis solution", fontsize=16)
+        ax.legend(fontsize=12, loc='lower left')
+        profile.lap('figure build')
+        st.image(figure_png(fig_map))
+        profile.lap('PNG encoding')
+        st.write("Misfit map of %i x %i parameter pairs and %i times computed in %.2f s with arrays of %.1f MB (lowest RMSE at log10 $T$ = %.2f, log10 $S$ = %.2f)"
+                 % (len(log_T_grid), len(log_S_grid), num_times, map_time, map_memory / 2**20, log_T_grid[i_min], log_S_grid[j_min]))
     
     columns3 = st.columns((1,10,1), gap = 'medium')
     with columns3[1]:
@@ -370,6 +388,7 @@ def inverse(v):
             st.write("- Pumping rate during test **$Q$ = %5.3f" %Qs," m³/s**")
             st.write("- Transmissivity **$T$ = % 10.2E"% T, " m²/s**")
             st.write("- Storativity    **$S$ = % 10.2E"% S, "[dimensionless]**")
+    profile.finish_fragment(st)
 
 # The first interactive plot 
 inverse(1)
@@ -458,4 +477,11 @@ columns_lic = st.columns((5,1))
 with columns_lic[0]:
     st.markdown(f'Developed by {", ".join(author_list)} ({year}). <br> {institution_text}', unsafe_allow_html=True)
 with columns_lic[1]:
-    st.image('FIGS/CC_BY-SA_icon.png')
\ No newline at end of file
+    st.image('FIGS/CC_BY-SA_icon.png')
+
+# After the first run of a page, the libraries, type curves and data sets of the other pages are prepared
+# once per server process in the background
+start_warm_up()
+
+# Phases of this rerun in the sidebar (only if profiling is switched on)
+profile.finish(st.sidebar)
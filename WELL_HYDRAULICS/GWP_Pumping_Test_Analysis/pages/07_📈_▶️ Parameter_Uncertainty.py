@@ -1,12 +1,14 @@
 # Loading the required Python libraries
 import numpy as np
-import matplotlib.pyplot as plt
-import scipy.special
 import math
 import streamlit as st
 import streamlit_book as stb
 from streamlit_extras.stateful_button import button
 from streamlit_extras.stodo import to_do
+from engine import compute_s_Theis, compute_statistics, figure_png, new_figure, profiling_enabled, RerunProfile, start_warm_up, type_curve_points
+
+# Opt-in timing of the phases of each rerun (GWP_PROFILE=1 on the server, or ?profile=1 if GWP_PROFILE=query), shown in the sidebar and appended to the trace file
+profile = RerunProfile('07_Parameter_Uncertainty', profiling_enabled(st.query_params))
 
 # Authors, institutions, and year
 year = 2025 
@@ -122,48 +124,8 @@ with st.expander(":blue[**Detailed instructions for the exercise are provided by
         ,"\n - **Use different values for the 'measurement noise'** while you repeat the procedure. You can define the measurement noise with the toggle 'Define the noise in the data' on the left control panel above the plot."
         ,"\n - **Use different lengths of measurement data by using the 'Provide data for a longer pumping test.**'")],"td09",)        
 
-# (Here the necessary functions like the well function _W(u)_ are defined. Later, those functions are used in the computation)
-# Define a function, class, and object for Theis Well analysis
-
-def well_function(u):
-    return scipy.special.exp1(u)
-
-def theis_u(T,S,r,t):
-    u = r ** 2 * S / 4. / T / t
-    return u
-
-def theis_s(Q, T, u):
-    s = Q / 4. / np.pi / T * well_function(u)
-    return s
-    
-def compute_s(T, S, t, Q, r):
-    u = theis_u(T, S, r, t)
-    s = theis_s(Q, T, u)
-    return s
-    
-def compute_statistics(measured, computed):
-    # Calculate the number of values
-    n = len(measured)
-
-    # Initialize a variable to store the sum of squared differences
-    total_me = 0
-    total_mae = 0
-    total_rmse = 0
-
-    # Loop through each value
-    for i in range(n): # Add the squared difference to the total
-        total_me   += (computed[i] - measured[i])
-        total_mae  += (abs(computed[i] - measured[i]))
-        total_rmse += (computed[i] - measured[i])**2
-
-    # Calculate the me, mae, mean squared error
-    me = total_me / n
-    mae = total_mae / n
-    meanSquaredError = total_rmse / n
+# (The well function $W(u)$, the drawdown solutions and the fit statistics are imported from the shared engine module. It is loaded once per server process and not re-run with each interaction.)
 
-    # Raise the mean squared error to the power of 0.5 
-    rmse = (meanSquaredError) ** (1/2)
-    return me, mae, rmse
     
 def update_T():
     st.session_state.T_slider_value = st.session_state.T_input
@@ -175,13 +137,10 @@ st.session_state.T_slider_value = -2.0
 st.session_state.S_slider_value = -4.0
 st.session_state.number_input = False  # Default to number_input
 
-# (Here, the method computes the data for the well function. Those data can be used to generate a type curve.)
-u_min = -5
-u_max = 4
-
-u = np.logspace(u_min,u_max)
-u_inv = 1/u
-w_u = well_function(u)
+# (The Theis type curve W(u) against 1/u is computed once per server process, at the fewest points that draw it within a third of a pixel. T and S only shift it on the log-log axes.)
+u_inv, w_u = type_curve_points('Theis')
+u = 1/u_inv
+profile.lap('setup')
 
 # Generate the random data
 r = 120          # m, distance of the observation
@@ -203,17 +162,19 @@ m_time_all_s = [i*60 for i in m_time_all] # time in seconds
 max_noise = 50 # max noise - should not be smaller than 20 - see input slider 
 
 # Compute all random data 
-m_ddown_all = [compute_s(st.session_state.T_random, st.session_state.S_random, i, Qs, r) for i in m_time_all_s]
+m_ddown_all = compute_s_Theis(st.session_state.T_random, st.session_state.S_random, m_time_all_s, Qs, r)
 # Compute the random noise
 m_ddown_noise = [np.random.randint((100-max_noise), (100+max_noise))/100 for i in m_time_all_s]
 
 # Random number of samples
 n_samples_long = np.random.randint (35, 49)
+profile.lap('data selection')
 n_samples_short = np.random.randint (16, 22)
 
 # Everything inside the fragment is re-computed with every input change
 @st.fragment
 def inverse(): 
+    profile.lap('widgets')
         
     # Get user defined input data
     log_min1 = -7.0 # T / Corresponds to 10^-7 = 0.0000001
@@ -282,11 +243,13 @@ def inverse():
     m_time_s = m_time_all_s[:n_samples]
     num_times = len(m_time_s)
     
+    profile.lap('widgets')
     # Multiply each value to add noise and normalize the noise according to the noise strength
     m_ddown_all_noise = [ddown * (1 + noise_strength * (noise - 1 ))  for ddown, noise in zip(m_ddown_all, m_ddown_noise)]
     
     # Use a random number of samples
     m_ddown = m_ddown_all_noise[:n_samples]
+    profile.lap('data selection')
         
     # Compute the Theis curve
     t_term = r**2 * S / 4 / T
@@ -296,7 +259,8 @@ def inverse():
     s1 = w_u * s_term
     
     # Compute point data for scatter plot 
-    m_ddown_theis = [compute_s(T, S, i, Qs, r) for i in m_time_s]
+    m_ddown_theis = compute_s_Theis(T, S, m_time_s, Qs, r)
+    profile.lap('well function')
     
     # Find the max for the scatter plot
     max_s = math.ceil(max(m_ddown)*10)/10
@@ -316,72 +280,73 @@ def inverse():
         t2_mo = t2/2629800
 
         # Compute s for prediction h
-        s  = compute_s(T, S, t2, Q_pred, r_pred)
+        s  = compute_s_Theis(T, S, t2, Q_pred, r_pred)
         # Compute s for a specific point
         x_point = t_search
-        y_point = compute_s(T, S, t_search, Q_pred, r_pred)
+        y_point = compute_s_Theis(T, S, t_search, Q_pred, r_pred)
 
         # Compute true s for prediction
-        true_s  = compute_s(T_random, S_random, t2, Q_pred, r_pred)
-        true_y_point = compute_s(T_random, S_random, t_search, Q_pred, r_pred)
+        true_s  = compute_s_Theis(T_random, S_random, t2, Q_pred, r_pred)
+        true_y_point = compute_s_Theis(T_random, S_random, t_search, Q_pred, r_pred)
+        profile.lap('well function')
             
-        fig = plt.figure(figsize=(12,14))
+        fig = new_figure(figsize=(12,14))
         ax = fig.add_subplot(2, 2, 1)
         ax.plot(t1, s1, label=r'Computed drawdown - Theis')
         ax.plot(m_time_s, m_ddown,'ro', label=r'synthetic drawdown with random noise')
-        plt.yscale("log")
-        plt.xscale("log")
+        ax.set_yscale("log")
+        ax.set_xscale("log")
         if refine_plot:
-            plt.axis([1,1E5,1E-3,10])
+            ax.axis([1,1E5,1E-3,10])
         else:
-            plt.axis([1,1E7,1E-4,1E+4])
+            ax.axis([1,1E7,1E-4,1E+4])
             ax.text((2),1.8E-4,'Coarse plot - Refine for final fitting')
-        plt.xlabel(r'time t in (s)', fontsize=14)
-        plt.ylabel(r'drawdown s in (m)', fontsize=14)
-        plt.title('Theis drawdown', fontsize=16)
+        ax.set_xlabel(r'time t in (s)', fontsize=14)
+        ax.set_ylabel(r'drawdown s in (m)', fontsize=14)
+        ax.set_title('Theis drawdown', fontsize=16)
         ax.grid(which="both")
-        plt.legend(('well function','measured'))
+        ax.legend(('well function','measured'))
 
         ax = fig.add_subplot(2, 2, 2)
         if per_pred <= 3:
-            plt.plot(t2, s, linewidth=3., color='r', label=r'Drawdown prediction')
+            ax.plot(t2, s, linewidth=3., color='r', label=r'Drawdown prediction')
             if show_truth:
-                plt.plot(t2, true_s, linewidth=3., color='g', label=r'Drawdown prediction with "true" parameters')
-                plt.plot(t_search,true_y_point, marker='o', color='g',linestyle ='None', label='"true" drawdown output')            
-            plt.plot(t_search,y_point, marker='o', color='b',linestyle ='None', label='drawdown output')
-            plt.xlabel(r'Time in sec', fontsize=14)
-            plt.xlim(0, max_t)
+                ax.plot(t2, true_s, linewidth=3., color='g', label=r'Drawdown prediction with "true" parameters')
+                ax.plot(t_search,true_y_point, marker='o', color='g',linestyle ='None', label='"true" drawdown output')            
+            ax.plot(t_search,y_point, marker='o', color='b',linestyle ='None', label='drawdown output')
+            ax.set_xlabel(r'Time in sec', fontsize=14)
+            ax.set_xlim(0, max_t)
         elif per_pred <= 7:
-            plt.plot(t2_h, s, linewidth=3., color='r', label=r'Drawdown prediction')
+            ax.plot(t2_h, s, linewidth=3., color='r', label=r'Drawdown prediction')
             if show_truth:
-                plt.plot(t2_h, true_s, linewidth=3., color='g', label=r'Drawdown prediction with "true" parameters')   
-                plt.plot(t_search_h,true_y_point, marker='o', color='g',linestyle ='None', label='"true" drawdown output')
-            plt.plot(t_search_h,y_point, marker='o', color='b',linestyle ='None', label='drawdown output')
-            plt.xlabel(r'Time in hours', fontsize=14)
-            plt.xlim(0, max_t/3600)
+                ax.plot(t2_h, true_s, linewidth=3., color='g', label=r'Drawdown prediction with "true" parameters')   
+                ax.plot(t_search_h,true_y_point, marker='o', color='g',linestyle ='None', label='"true" drawdown output')
+            ax.plot(t_search_h,y_point, marker='o', color='b',linestyle ='None', label='drawdown output')
+            ax.set_xlabel(r'Time in hours', fontsize=14)
+            ax.set_xlim(0, max_t/3600)
         elif per_pred <= 366:
-            plt.plot(t2_d, s, linewidth=3., color='r', label=r'Drawdown prediction')
+            ax.plot(t2_d, s, linewidth=3., color='r', label=r'Drawdown prediction')
             if show_truth:
-                plt.plot(t2_d, true_s, linewidth=3., color='g', label=r'Drawdown prediction with "true" parameters') 
-                plt.plot(t_search_d,true_y_point, marker='o', color='g',linestyle ='None', label='"true" drawdown output')            
-            plt.plot(t_search_d,y_point, marker='o', color='b',linestyle ='None', label='drawdown output')
-            plt.xlabel(r'Time in days', fontsize=14)
-            plt.xlim(0, max_t/86400)
+                ax.plot(t2_d, true_s, linewidth=3., color='g', label=r'Drawdown prediction with "true" parameters') 
+                ax.plot(t_search_d,true_y_point, marker='o', color='g',linestyle ='None', label='"true" drawdown output')            
+            ax.plot(t_search_d,y_point, marker='o', color='b',linestyle ='None', label='drawdown output')
+            ax.set_xlabel(r'Time in days', fontsize=14)
+            ax.set_xlim(0, max_t/86400)
         else:
-            plt.plot(t2_mo, s, linewidth=3., color='r', label=r'Drawdown prediction')
+            ax.plot(t2_mo, s, linewidth=3., color='r', label=r'Drawdown prediction')
             if show_truth:
-                plt.plot(t2_mo, true_s, linewidth=3., color='g', label=r'Drawdown prediction with "true" parameters')
-                plt.plot(t_search_mo,true_y_point, marker='o', color='g',linestyle ='None', label='"true" drawdown output')            
-            plt.plot(t_search_mo,y_point, marker='o', color='b',linestyle ='None', label='drawdown output')
-            plt.xlabel(r'Time in months', fontsize=14)
-            plt.xlim(0, max_t/2629800)
+                ax.plot(t2_mo, true_s, linewidth=3., color='g', label=r'Drawdown prediction with "true" parameters')
+                ax.plot(t_search_mo,true_y_point, marker='o', color='g',linestyle ='None', label='"true" drawdown output')            
+            ax.plot(t_search_mo,y_point, marker='o', color='b',linestyle ='None', label='drawdown output')
+            ax.set_xlabel(r'Time in months', fontsize=14)
+            ax.set_xlim(0, max_t/2629800)
 
-        plt.ylim(bottom=0, top=None)
+        ax.set_ylim(bottom=0, top=None)
         ax.invert_yaxis()
-        plt.ylabel(r'Drawdown in m', fontsize=14)
-        plt.title('Drawdown prediction with Theis', fontsize=16)
-        plt.legend()
-        plt.grid(True)
+        ax.set_ylabel(r'Drawdown in m', fontsize=14)
+        ax.set_title('Drawdown prediction with Theis', fontsize=16)
+        ax.legend()
+        ax.grid(True)
         
         if scatter:
             x45 = [0,200]
@@ -389,40 +354,44 @@ def inverse():
             ax = fig.add_subplot(2, 1, 2)
             ax.plot(x45,y45, '--')
             ax.plot(m_ddown, m_ddown_theis,  'ro', label=r'measured')
+            profile.lap('figure build')
             me, mae, rmse = compute_statistics(m_ddown, m_ddown_theis)
-            plt.title('Scatter plot', fontsize=16)
-            plt.xlabel(r'Measured s in m', fontsize=14)
-            plt.ylabel(r'Computed s in m', fontsize=14)
-            plt.ylim(0, max_s)
-            plt.xlim(0, max_s)
+            profile.lap('statistics')
+            ax.set_title('Scatter plot', fontsize=16)
+            ax.set_xlabel(r'Measured s in m', fontsize=14)
+            ax.set_ylabel(r'Computed s in m', fontsize=14)
+            ax.set_ylim(0, max_s)
+            ax.set_xlim(0, max_s)
             out_txt = '\n'.join((
                                  r'$ME = %.3f$ m' % (me, ),
                                  r'$MAE = %.3f$ m' % (mae, ),
                                  r'$RMSE = %.3f$ m' % (rmse, ))) 
-            plt.text(0.97*max_s, 0.05*max_s, out_txt, horizontalalignment='right', bbox=dict(boxstyle="square", facecolor='wheat'), fontsize=14)
+            ax.text(0.97*max_s, 0.05*max_s, out_txt, horizontalalignment='right', bbox=dict(boxstyle="square", facecolor='wheat'), fontsize=14)
         
         
-        st.pyplot(fig)
+        profile.lap('figure build')
+        st.image(figure_png(fig))
+        profile.lap('PNG encoding')
     else:
-        fig = plt.figure(figsize=(10,14))
+        fig = new_figure(figsize=(10,14))
         ax = fig.add_subplot(2, 1, 1)
         ax.plot(t1, s1, label=r'Computed drawdown - Theis')
         ax.plot(m_time_s, m_ddown,'ro', label=r'synthetic drawdown with random noise')
-        plt.yscale("log")
-        plt.xscale("log")
-        plt.xticks(fontsize=14)
-        plt.yticks(fontsize=14)
+        ax.set_yscale("log")
+        ax.set_xscale("log")
+        ax.tick_params(axis='x', labelsize=14)
+        ax.tick_params(axis='y', labelsize=14)
         if refine_plot:
-            plt.axis([1E1,1E5,1E-3,1E+1])
+            ax.axis([1E1,1E5,1E-3,1E+1])
         else:
-            plt.axis([1,1E7,1E-4,1E+2])
+            ax.axis([1,1E7,1E-4,1E+2])
             ax.text((2),1.8E-4,'Coarse plot - Refine for final fitting')
         ax.grid(which="both")
-        plt.xlabel(r'time t in (s)', fontsize=14)
-        plt.ylabel(r'drawdown s in (m)', fontsize=14)
-        plt.title('Theis drawdown', fontsize=16)
-        plt.text(0.97, 0.15,out_txt, horizontalalignment='right', transform=ax.transAxes, fontsize=14, verticalalignment='top', bbox=props)
-        plt.legend(fontsize=14)
+        ax.set_xlabel(r'time t in (s)', fontsize=14)
+        ax.set_ylabel(r'drawdown s in (m)', fontsize=14)
+        ax.set_title('Theis drawdown', fontsize=16)
+        ax.text(0.97, 0.15,out_txt, horizontalalignment='right', transform=ax.transAxes, fontsize=14, verticalalignment='top', bbox=props)
+        ax.legend(fontsize=14)
         
         if scatter:
             x45 = [0,200]
@@ -430,19 +399,23 @@ def inverse():
             ax = fig.add_subplot(2, 1, 2)
             ax.plot(x45,y45, '--')
             ax.plot(m_ddown, m_ddown_theis,  'ro', label=r'measured')
+            profile.lap('figure build')
             me, mae, rmse = compute_statistics(m_ddown, m_ddown_theis)
-            plt.title('Scatter plot', fontsize=16)
-            plt.xlabel(r'Measured s in m', fontsize=14)
-            plt.ylabel(r'Computed s in m', fontsize=14)
-            plt.ylim(0, max_s)
-            plt.xlim(0, max_s)
+            profile.lap('statistics')
+            ax.set_title('Scatter plot', fontsize=16)
+            ax.set_xlabel(r'Measured s in m', fontsize=14)
+            ax.set_ylabel(r'Computed s in m', fontsize=14)
+            ax.set_ylim(0, max_s)
+            ax.set_xlim(0, max_s)
             out_txt = '\n'.join((
                                  r'$ME = %.3f$ m' % (me, ),
                                  r'$MAE = %.3f$ m' % (mae, ),
                                  r'$RMSE = %.3f$ m' % (rmse, ))) 
-            plt.text(0.97*max_s, 0.05*max_s, out_txt, horizontalalignment='right', bbox=dict(boxstyle="square", facecolor='wheat'), fontsize=14)
+            ax.text(0.97*max_s, 0.05*max_s, out_txt, horizontalalignment='right', bbox=dict(boxstyle="square", facecolor='wheat'), fontsize=14)
         
-        st.pyplot(fig)
+        profile.lap('figure build')
+        st.image(figure_png(fig))
+        profile.lap('PNG encoding')
     
     columns3 = st.columns((1,1), gap = 'medium')
     with columns3[0]:
@@ -477,6 +450,7 @@ def inverse():
             if show_truth:
                 st.write("**Predicted drawdown with 'true' parameters:  %5.2f" %true_y_point," m**")
                 st.write("**Difference:  %5.2f" %(true_y_point-y_point)," m**")
+    profile.finish_fragment(st)
 
 inverse()
 
@@ -521,4 +495,11 @@ columns_lic = st.columns((5,1))
 with columns_lic[0]:
     st.markdown(f'Developed by {", ".join(author_list)} ({year}). <br> {institution_text}', unsafe_allow_html=True)
 with columns_lic[1]:
-    st.image('FIGS/CC_BY-SA_icon.png')
\ No newline at end of file
+    st.image('FIGS/CC_BY-SA_icon.png')
+
+# After the first run of a page, the libraries, type curves and data sets of the other pages are prepared
+# once per server process in the background
+start_warm_up()
+
+# Phases of this rerun in the sidebar (only if profiling is switched on)
+profile.finish(st.sidebar)
@@ -0,0 +1,8 @@
+# The tests import the engine of the app as the pages do (the package engine of the Pumping Test Analysis app,
+# capture_engine of the Well capture app), so the tests of both apps run in one session from the repository:
+#
+#     python -m pytest
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,41 @@
+"""Results are cached by key within a memory cap, uploads by the hash of their contents."""
+import io
+
+import numpy as np
+
+import engine
+
+
+def test_same_contents_are_parsed_once():
+    # Two uploads of the same file (e.g. after a rerun or under another name) share the parsed arrays
+    cache = engine.ResultCache()
+    contents = b'time_min,drawdown_m\n1,0.1\n2,0.2\n'
+    results = []
+    for upload in (io.BytesIO(contents), io.BytesIO(contents)):
+        key = ('csv', engine.content_hash(upload.getvalue()))
+        results.append(cache.get(key, lambda: engine.read_drawdown_csv(upload, 'pandas')))
+    assert results[0] is results[1]
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert engine.content_hash(contents + b'3,0.3\n') != engine.content_hash(contents)
+
+
+def test_least_recently_used_results_are_dropped():
+    cache = engine.ResultCache(max_bytes=3 * 800)
+    for key in 'abc':
+        cache.get(key, lambda: np.zeros(100))
+    cache.get('a', lambda: None)
+    cache.get('d', lambda: np.zeros(100))
+    assert list(cache.entries) == ['c', 'a', 'd']
+    assert cache.bytes == 3 * 800
+
+
+def test_results_above_the_cap_are_not_stored():
+    cache = engine.ResultCache(max_bytes=100)
+    value = cache.get('large', lambda: np.zeros(100))
+    assert value.shape == (100,)
+    assert 'large' not in cache.entries and cache.bytes == 0
+
+
+def test_result_bytes_of_nested_results():
+    result = (np.zeros(10), [np.zeros(5, dtype=np.float32), b'png'], {'report': 'html', 'rows': 3})
+    assert engine.result_bytes(result) == 80 + 20 + 3 + 4
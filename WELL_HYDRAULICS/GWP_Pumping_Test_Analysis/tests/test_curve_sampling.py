@@ -0,0 +1,41 @@
+"""Adaptive sampling draws the type curves within the tolerance of the log-log plot."""
+import numpy as np
+import pytest
+import scipy.special
+
+import engine
+
+
+def theis_curve(t):
+    # W(u) over 1/u = 10^t
+    return 10 ** t, scipy.special.exp1(10. ** -t)
+
+
+def deviation(curve, t, x, y):
+    # Distance in decades of the curve at the middle of every segment from the segment, and the lengths of the
+    # segments in decades
+    x_mid, y_mid = curve(0.5 * (t[1:] + t[:-1]))
+    px, py, mx, my = np.log10(x), np.log10(y), np.log10(x_mid), np.log10(y_mid)
+    dx, dy = np.diff(px), np.diff(py)
+    length = np.hypot(dx, dy)
+    s = np.clip(((mx - px[:-1]) * dx + (my - py[:-1]) * dy) / length ** 2, 0., 1.)
+    return np.hypot(mx - px[:-1] - s * dx, my - py[:-1] - s * dy), length
+
+
+@pytest.mark.parametrize('tolerance', [1e-2, 1e-3, 1e-4])
+def test_theis_curve_is_within_the_tolerance_in_decades(tolerance):
+    t, x, y = engine.adaptive_curve(theis_curve, -1., 4., log=(True, True), tolerance=tolerance)
+    distance, length = deviation(theis_curve, t, x, y)
+    assert distance.max() <= tolerance
+    assert length.max() <= engine.sampling.MAX_SEGMENT
+    np.testing.assert_allclose(y, scipy.special.exp1(1 / x), rtol=1e-12)
+
+
+def test_segments_below_the_plot_are_not_refined():
+    # W(u) below 1e-2 is not drawn
+    view = ((1e-1, 1e4), (1e-2, 1e1))
+    t, x, y = engine.adaptive_curve(theis_curve, -2., 4., log=(True, True), tolerance=1e-4, view=view)
+    distance, _ = deviation(theis_curve, t, x, y)
+    drawn = (y[:-1] > 1e-2) & (y[1:] > 1e-2)
+    assert distance[drawn].max() <= 1e-4
+    assert np.count_nonzero(y < 1e-3) < 5
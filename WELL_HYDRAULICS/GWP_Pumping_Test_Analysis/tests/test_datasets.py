@@ -0,0 +1,64 @@
+"""The catalog loads the data sets by key or label and stores new ones."""
+import numpy as np
+import pytest
+
+import engine
+from engine import datasets
+
+
+@pytest.fixture
+def catalog_files(tmp_path, monkeypatch):
+    # Empty catalog in a temporary directory; the cached catalog and series are dropped before and after
+    monkeypatch.setattr(datasets, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(datasets, 'CATALOG_FILE', str(tmp_path / 'catalog.json'))
+    monkeypatch.setattr(datasets, 'SERIES_FILE', str(tmp_path / 'datasets.npz'))
+    datasets.dataset_catalog.cache_clear()
+    datasets._series.cache_clear()
+    yield tmp_path
+    datasets.dataset_catalog.cache_clear()
+    datasets._series.cache_clear()
+
+
+def test_catalog_entries_have_all_fields():
+    for key, entry in engine.dataset_catalog().items():
+        assert set(engine.DATASET_FIELDS) <= set(entry), key
+
+
+def test_load_by_key_and_label_in_seconds():
+    t, s, dataset = engine.load_dataset('varnum_2016_r12')
+    t_label, s_label, dataset_label = engine.load_dataset(dataset['label'])
+    assert t_label is t and s_label is s and dataset_label == dataset
+    assert dataset['key'] == 'varnum_2016_r12'
+    # The catalog stores minutes
+    assert dataset['time_unit'] == 'min' and t[0] % 60. == 0.
+    assert t.shape == s.shape and np.all(np.diff(t) > 0)
+
+
+def test_series_are_read_only():
+    t, s, dataset = engine.load_dataset('synthetic')
+    with pytest.raises(ValueError):
+        t[0] = 0.
+
+
+def test_unknown_data_set():
+    with pytest.raises(KeyError):
+        engine.load_dataset('no such site')
+
+
+def test_add_dataset_round_trip(catalog_files):
+    metadata = dict(label='Test site', site='Test', year=2026, well='P1', r=10., b=5., Q=0.01,
+                    time_unit='h', drawdown_unit='cm')
+    engine.add_dataset('test', [1., 2., 4.], [10., 20., 30.], **metadata)
+    t, s, dataset = engine.load_dataset('Test site')
+    np.testing.assert_allclose(t, [3600., 7200., 14400.])
+    np.testing.assert_allclose(s, [0.1, 0.2, 0.3])
+    assert list(engine.dataset_catalog()) == ['test']
+
+
+def test_add_dataset_checks_fields_and_shapes(catalog_files):
+    with pytest.raises(ValueError):
+        engine.add_dataset('test', [1.], [1.], label='Test site')
+    metadata = dict(label='Test site', site='Test', year=2026, well='P1', r=10., b=5., Q=0.01,
+                    time_unit='min', drawdown_unit='m')
+    with pytest.raises(ValueError):
+        engine.add_dataset('test', [1., 2.], [1.], **metadata)
@@ -0,0 +1,25 @@
+"""Fits of the log-decimated readings agree with the fits of all readings."""
+import numpy as np
+import pytest
+
+import engine
+
+
+@pytest.mark.parametrize('name', ['pirna_2024', 'varnum_2016_r12', 'viterbo_2023'])
+def test_decimated_fit_within_tolerance(name):
+    # The default weighting (readings per bin) reproduces the fit of all readings of the measured data
+    t, s, dataset = engine.load_dataset(name)
+    check = engine.decimation_check(t, s, dataset['Q'], dataset['r'], (-3., -4.))
+    assert check['points decimated'] <= check['points full']
+    assert check['difference'] <= engine.FIT_TOLERANCE
+    assert check['equivalent']
+
+
+@pytest.mark.parametrize('weighting', engine.WEIGHTINGS)
+def test_decimated_fit_of_synthetic_theis(weighting):
+    # Every weighting recovers T and S of a long, noisy Theis record from a small fraction of the readings
+    t = np.linspace(1, 2931, 2832) * 60.
+    s = engine.compute_s_Theis(2.7E-2, 2.0E-4, t, 1.18 / 60, 91.) + np.random.default_rng(2).normal(0., 0.005, len(t))
+    check = engine.decimation_check(t, s, 1.18 / 60, 91., (-3., -4.), weighting=weighting)
+    assert check['points decimated'] < check['points full'] / 10
+    np.testing.assert_allclose(check['decimated'], np.log10([2.7E-2, 2.0E-4]), atol=0.05)
@@ -0,0 +1,53 @@
+"""The automatic fits recover the parameters of synthetic drawdown."""
+import numpy as np
+import pytest
+
+import engine
+
+# Time span of the Varnum R12 data set, distance and pumping rate
+t = np.arange(1, 326) * 60.
+r, Q = 38.9, 0.01317
+T_true, S_true = 2.7E-2, 2.0E-4
+
+
+@pytest.mark.parametrize('x0', [(-3., -4.), (-6., -1.), (-1., -6.), (-0.5, -0.5)])
+def test_theis_fit_recovers_T_and_S(x0):
+    s = engine.compute_s_Theis(T_true, S_true, t, Q, r)
+    x, cov, rmse, n_iter, seconds = engine.fit_theis(t, s, Q, r, x0)
+    np.testing.assert_allclose(x, np.log10([T_true, S_true]), atol=1e-4)
+    assert rmse < 1e-6
+
+
+def test_theis_fit_with_noise_is_within_its_standard_deviation():
+    s = engine.compute_s_Theis(T_true, S_true, t, Q, r) + np.random.default_rng(1).normal(0., 0.005, len(t))
+    x, cov, rmse, n_iter, seconds = engine.fit_theis(t, s, Q, r, (-3., -4.))
+    assert np.all(np.abs(x - np.log10([T_true, S_true])) < 4 * np.sqrt(np.diag(cov)))
+    assert rmse == pytest.approx(0.005, rel=0.2)
+
+
+def test_hantush_fit_recovers_T_S_and_leakage():
+    r_div_B = 0.3
+    s = engine.compute_s_HAN(T_true, S_true, t, Q, r, r_div_B)
+    x, cov, rmse, report, seconds = engine.fit_hantush(t, s, Q, r, np.array([-3., -4., -0.4]))
+    np.testing.assert_allclose(x, np.log10([T_true, S_true, r_div_B]), atol=0.02)
+    assert rmse < 1e-3
+    assert len(report) == engine.fitting.N_STARTS
+
+
+def test_hantush_fit_in_the_process_pool_matches_the_serial_fit():
+    # The pool of the pages (GWP_PARALLEL_FITS=1) fits the same start values to the same optimum
+    s = engine.compute_s_HAN(T_true, S_true, t, Q, r, 0.3)
+    x0 = np.array([-3., -4., -0.4])
+    serial = engine.fit_hantush(t, s, Q, r, x0, n_starts=3)
+    pooled = engine.fit_hantush(t, s, Q, r, x0, n_starts=3, parallel=True)
+    np.testing.assert_allclose(pooled[0], serial[0])
+    assert [start[2] for start in pooled[3]] == pytest.approx([start[2] for start in serial[3]])
+
+
+@pytest.mark.parametrize('setting, parallel', [(None, False), ('0', False), ('1', True)])
+def test_parallel_fits_is_set_by_the_server(monkeypatch, setting, parallel):
+    if setting is None:
+        monkeypatch.delenv(engine.PARALLEL_ENV, raising=False)
+    else:
+        monkeypatch.setenv(engine.PARALLEL_ENV, setting)
+    assert engine.parallel_fits() is parallel
@@ -0,0 +1,31 @@
+"""The cached Hantush-Jacob grid agrees with the quadrature it is built from."""
+import numpy as np
+
+import engine
+from engine.hantush import LOG_R_DIV_B_RANGE, LOG_U_RANGE
+
+
+def test_grid_matches_quadrature():
+    rng = np.random.default_rng(0)
+    u = 10 ** rng.uniform(*LOG_U_RANGE, 500)
+    r_div_B = 10 ** rng.uniform(*LOG_R_DIV_B_RANGE, 500)
+    np.testing.assert_allclose(engine.hantush_well_function(u, r_div_B),
+                               engine.hantush_well_function_quad(u, r_div_B), rtol=1e-3)
+
+
+def test_outside_of_the_grid_is_the_quadrature():
+    u, r_div_B = np.array([1e-10, 200., 0.1]), np.array([0.1, 0.1, 20.])
+    np.testing.assert_allclose(engine.hantush_well_function(u, r_div_B),
+                               engine.hantush_well_function_quad(u, r_div_B), rtol=1e-12)
+
+
+def test_no_leakage_is_theis():
+    u = np.logspace(-5, 1, 13)
+    np.testing.assert_allclose(engine.hantush_well_function(u, 0.), engine.well_function(u), rtol=1e-12)
+
+
+def test_quadrature_matches_table():
+    # Table columns from r/B = 0.04 on (the first two columns are coarse); gaps are filled with Theis
+    for column, value in enumerate(engine.r_div_B_list[2:], start=2):
+        w = engine.hantush_well_function_quad(engine.u_HAN, float(value))
+        np.testing.assert_allclose(w, engine.w_u_HAN[:, column], atol=0.02, rtol=0.02, err_msg=f"r/B = {value}")
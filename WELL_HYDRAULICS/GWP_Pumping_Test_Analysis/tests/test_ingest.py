@@ -0,0 +1,62 @@
+"""Chunked CSV reading gives the same arrays as reading the file at once."""
+import io
+
+import numpy as np
+import pytest
+
+import engine
+from engine import ingest
+
+# The pyarrow reader is only tested where it is installed
+ENGINES = ['pandas', 'pyarrow'] if engine.PYARROW_AVAILABLE else ['pandas']
+
+
+def logger_csv(n, bad_rows=()):
+    # CSV text of n readings (time in minutes, drawdown in meters, a logger column); bad_rows hold text
+    t = np.arange(1, n + 1) / 60.
+    s = 0.1 * np.log1p(t)
+    lines = ['time_min,drawdown_m,logger']
+    for i in range(n):
+        lines.append('%r,%s,ok' % (float(t[i]), 'n/a' if i in bad_rows else repr(float(s[i]))))
+    return '\n'.join(lines) + '\n', t, s
+
+
+@pytest.mark.parametrize('reader', ENGINES)
+def test_blocks_and_growth_give_all_rows(monkeypatch, reader):
+    # Many small blocks that outgrow the first allocation several times
+    monkeypatch.setattr(ingest, 'INITIAL_ROWS', 16)
+    text, t, s = logger_csv(5000)
+    m_time, m_ddown, report = engine.read_drawdown_csv(io.BytesIO(text.encode()), reader, chunk_rows=300, block_bytes=4096)
+    np.testing.assert_allclose(m_time, t, rtol=1e-12)
+    np.testing.assert_allclose(m_ddown, s, rtol=1e-12)
+    assert report['rows'] == 5000 and report['engine'] == reader
+    assert report['bytes'] == len(text)
+    assert report['array memory'] >= m_time.nbytes + m_ddown.nbytes
+
+
+@pytest.mark.parametrize('reader', ENGINES)
+def test_non_numeric_rows_are_dropped(reader):
+    text, t, s = logger_csv(100, bad_rows=(3, 50))
+    m_time, m_ddown, report = engine.read_drawdown_csv(io.BytesIO(text.encode()), reader)
+    keep = np.ones(100, dtype=bool)
+    keep[[3, 50]] = False
+    np.testing.assert_allclose(m_time, t[keep], rtol=1e-12)
+    np.testing.assert_allclose(m_ddown, s[keep], rtol=1e-12)
+
+
+def test_file_object_is_read_from_the_start():
+    # An upload that was read before (e.g. for its content hash) is rewound
+    text, t, s = logger_csv(10)
+    upload = io.BytesIO(text.encode())
+    upload.read()
+    m_time, m_ddown, report = engine.read_drawdown_csv(upload, 'pandas')
+    assert report['rows'] == 10
+
+
+def test_path_of_a_file(tmp_path):
+    text, t, s = logger_csv(10)
+    path = tmp_path / 'logger.csv'
+    path.write_text(text)
+    m_time, m_ddown, report = engine.read_drawdown_csv(str(path), 'pandas')
+    np.testing.assert_allclose(m_time, t, rtol=1e-12)
+    assert report['bytes'] == len(text)
@@ -0,0 +1,27 @@
+"""The HTML page of the interactive plot is built once per key."""
+import numpy as np
+import pytest
+
+import engine
+
+pytestmark = pytest.mark.skipif(not engine.BOKEH_AVAILABLE, reason='bokeh is not installed')
+
+
+def test_cached_bokeh_html_builds_each_plot_once():
+    cache = engine.ResultCache()
+    t = np.arange(1, 61) * 60.
+    s = engine.compute_s_Theis(2.7E-2, 2.0E-4, t, 0.01317, 38.9)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return engine.type_curve_plot('Theis', t, s, 0.01317, 38.9, parameters=dict(log_T=(-1.6, -7., 0.), log_S=(-3.7, -7., 0.)),
+                                      x_range=(1E-1, 1E5), y_range=(1E-4, 1E+1))
+
+    key = engine.figure_key('test', -1.6, -3.7)
+    html = engine.cached_bokeh_html(key, build, cache)
+    assert engine.cached_bokeh_html(key, build, cache) is html
+    assert len(builds) == 1
+    assert '<html' in html.lower()
+    # The page counts towards the memory cap of the cache
+    assert cache.bytes == len(html)
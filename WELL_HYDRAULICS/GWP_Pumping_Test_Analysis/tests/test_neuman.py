@@ -0,0 +1,25 @@
+"""The Stehfest inversion of the Neuman solution reproduces the published type curves."""
+import numpy as np
+import pytest
+import scipy.special
+
+import engine
+
+# Ratio S/Sy of the tables (S/Sy -> 0) and the smallest table value given with three digits
+SIGMA_TABLE = 1e-9
+MIN_TABLE_VALUE = 0.05
+
+
+def test_stehfest_inverts_theis():
+    t_s = np.logspace(-1, 4, 26)
+    w = engine.stehfest_invert(lambda p: 2. / p * scipy.special.k0(np.sqrt(p)), t_s)
+    np.testing.assert_allclose(w, engine.well_function(1 / (4 * t_s)), atol=1e-4)
+
+
+@pytest.mark.parametrize('column, beta', list(enumerate(engine.beta_list)))
+def test_neuman_matches_tables(column, beta):
+    for u_inv, w_table, t_s in [(engine.u_inv_a, engine.w_u_a, engine.u_inv_a / 4.),
+                                (engine.u_inv_b, engine.w_u_b, engine.u_inv_b / 4. / SIGMA_TABLE)]:
+        w = engine.neuman_well_function(t_s, SIGMA_TABLE, float(beta))
+        valid = w_table[:, column] >= MIN_TABLE_VALUE
+        np.testing.assert_allclose(w[valid], w_table[valid, column], rtol=0.03)
@@ -0,0 +1,35 @@
+"""Only the server switches on the rerun profile, a query parameter alone does not."""
+import json
+
+import pytest
+
+import engine
+
+
+@pytest.mark.parametrize('setting, query, enabled', [
+    (None, {}, False),
+    (None, {'profile': '1'}, False),
+    ('0', {'profile': '1'}, False),
+    ('1', {}, True),
+    ('query', {}, False),
+    ('query', {'profile': '1'}, True),
+    ('query', {'profile': '0'}, False),
+])
+def test_profiling_enabled(monkeypatch, setting, query, enabled):
+    if setting is None:
+        monkeypatch.delenv(engine.PROFILE_ENV, raising=False)
+    else:
+        monkeypatch.setenv(engine.PROFILE_ENV, setting)
+    assert engine.profiling_enabled(query) is enabled
+
+
+def test_profile_appends_one_line_per_rerun(tmp_path):
+    # A finished profile writes one JSON record, a disabled one writes nothing
+    trace = tmp_path / 'trace.jsonl'
+    for enabled in (True, False):
+        profile = engine.RerunProfile('test', enabled, str(trace))
+        profile.lap('setup')
+        profile.finish()
+    records = [json.loads(line) for line in trace.read_text().splitlines()]
+    assert len(records) == 1
+    assert records[0]['page'] == 'test' and 'setup' in records[0]['phases ms']
@@ -0,0 +1,57 @@
+"""Figures of new_figure draw with the text-locked renderer, their PNGs are cached by the page state."""
+import numpy as np
+
+import engine
+from engine.rendering import _TextLockedRenderer
+
+
+def test_renderer_is_text_locked_and_reused():
+    fig = engine.new_figure(figsize=(4, 3), dpi=100)
+    renderer = fig.canvas.get_renderer()
+    assert isinstance(renderer, _TextLockedRenderer)
+    assert fig.canvas.get_renderer() is renderer
+
+
+def test_renderer_follows_the_size_of_the_figure():
+    # A new size (or dpi) gives a new renderer of that size, again with the locked text methods
+    fig = engine.new_figure(figsize=(4, 3), dpi=100)
+    first = fig.canvas.get_renderer()
+    fig.set_size_inches(8, 6)
+    second = fig.canvas.get_renderer()
+    assert second is not first
+    assert isinstance(second, _TextLockedRenderer)
+    assert (second.width, second.height) == (800, 600)
+
+
+def test_figure_png_draws_mathtext_and_clears_the_figure():
+    fig = engine.new_figure(figsize=(4, 3))
+    ax = fig.add_subplot(1, 1, 1)
+    ax.plot(np.arange(10.), np.arange(10.) ** 2)
+    ax.set_xlabel(r'$1/u$ in s/m²')
+    png = engine.figure_png(fig, dpi=50)
+    assert png.startswith(b'\x89PNG')
+    assert not fig.axes
+
+
+def test_figure_key_of_a_slider_position_reached_again():
+    # 10 ** x and np.log10 do not return the slider value exactly, the key is the same all the same
+    log_T = -2.57
+    assert engine.figure_key('03', 1, np.log10(10 ** log_T), (True, [0.1 + 0.2])) == engine.figure_key('03', 1, log_T, (True, [0.3]))
+    assert engine.figure_key('03', 1, log_T + 0.01) != engine.figure_key('03', 1, log_T)
+
+
+def test_cached_figure_png_draws_each_state_once():
+    cache = engine.ResultCache()
+    draws = []
+
+    def draw():
+        draws.append(1)
+        fig = engine.new_figure(figsize=(2, 2))
+        fig.add_subplot(1, 1, 1).plot([1, 2], [1, 4])
+        return fig
+
+    png = engine.cached_figure_png(engine.figure_key('test', -2.57), draw, cache)
+    assert engine.cached_figure_png(engine.figure_key('test', np.log10(10 ** -2.57)), draw, cache) is png
+    engine.cached_figure_png(engine.figure_key('test', -2.56), draw, cache)
+    assert len(draws) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
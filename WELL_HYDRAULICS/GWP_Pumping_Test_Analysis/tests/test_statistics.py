@@ -0,0 +1,41 @@
+"""The batched statistics agree with the statistics of each curve on its own."""
+import numpy as np
+import pytest
+
+import engine
+
+rng = np.random.default_rng(3)
+MEASURED = rng.uniform(0.01, 2., 40)
+COMPUTED = MEASURED + rng.normal(0., 0.05, (6, 5, 40))
+
+
+def reference(measured, computed, w):
+    # ME, MAE and RMSE of one curve as the loop of the pages computed them
+    error = computed - measured
+    return np.sum(w * error) / np.sum(w), np.sum(w * np.abs(error)) / np.sum(w), np.sqrt(np.sum(w * error ** 2) / np.sum(w))
+
+
+@pytest.mark.parametrize('weights', [None, rng.uniform(0.5, 2., 40)])
+def test_batch_matches_each_curve(weights):
+    me, mae, rmse = engine.compute_statistics(MEASURED, COMPUTED, weights)
+    assert me.shape == mae.shape == rmse.shape == (6, 5)
+    w = np.ones(40) if weights is None else weights
+    for index in np.ndindex(6, 5):
+        np.testing.assert_allclose((me[index], mae[index], rmse[index]), reference(MEASURED, COMPUTED[index], w))
+
+
+def test_overwrite_reuses_the_computed_array():
+    # Same statistics whether computed is copied or overwritten with the absolute errors
+    computed = COMPUTED.copy()
+    expected = engine.compute_statistics(MEASURED, COMPUTED)
+    np.testing.assert_allclose(engine.compute_statistics(MEASURED, computed, overwrite=True), expected)
+    np.testing.assert_allclose(computed, np.abs(COMPUTED - MEASURED))
+
+
+def test_fit_statistics_of_a_perfect_fit():
+    statistics = engine.fit_statistics(MEASURED, np.stack((MEASURED, COMPUTED[0, 0])))
+    for name in ('ME', 'MAE', 'RMSE', 'log RMSE'):
+        assert statistics[name][0] == pytest.approx(0., abs=1e-12)
+    assert statistics['R2'][0] == pytest.approx(1.)
+    assert statistics['NSE'][0] == pytest.approx(1.)
+    assert statistics['NSE'][1] < 1.
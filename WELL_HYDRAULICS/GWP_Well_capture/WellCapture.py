@@ -1,10 +1,30 @@
+import io
+import threading
+
 import streamlit as st
 
 
+def warm_up():
+    # matplotlib of the computation page: import and the font cache of the first PNG
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(1, 1))
+    fig.add_subplot().set_title('warm-up')
+    fig.savefig(io.BytesIO(), format='png', dpi=10)
+
+
+@st.cache_resource
+def start_warm_up():
+    # Runs warm_up once per server process in a daemon thread, while the landing page is read
+    thread = threading.Thread(target=warm_up, name='warm-up', daemon=True)
+    thread.start()
+    return thread
+
+
 st.set_page_config(
     page_title="Well capture zone",
     page_icon="💦",
 )
+start_warm_up()
 
 st.write("# WellCapture App! 💦")
 
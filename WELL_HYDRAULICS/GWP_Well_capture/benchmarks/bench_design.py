@@ -0,0 +1,92 @@
+"""Accuracy and timing of the capture design.
+
+minimum_pumping_rate takes the smallest Q of a well position in closed form
+(2 K i b times the largest critical ymax of the plume vertices). It is
+compared with a bisection on Q with the point-in-capture test of the
+vertices (in_capture_zone), and the polygon is checked to be inside at that
+Q with points along its edges and not inside at a slightly smaller Q.
+optimal_well is compared with the best well position on a grid of
+GRID_STEP m within the same bounds.
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Well_capture/benchmarks/bench_design.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import capture_engine  # noqa: E402
+
+# Defaults of the page
+K, i, b = 1E-3, 1E-3, 20.
+EDGE_POINTS = 1000
+GRID_STEP = 2.
+BISECTION_TOLERANCE = 1e-9
+
+
+def best_of(func, repeat=5):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bisection(x, y, x_well=0., y_well=0.):
+    # Smallest Q whose capture zone contains all vertices, by bisection on Q; also the number of steps
+    low, high, steps = 0., 1e-3, 0
+    while not capture_engine.in_capture_zone(x, y, high, K, i, b, x_well, y_well).all():
+        low, high = high, 2 * high
+    while high - low > BISECTION_TOLERANCE * high:
+        middle = 0.5 * (low + high)
+        if capture_engine.in_capture_zone(x, y, middle, K, i, b, x_well, y_well).all():
+            high = middle
+        else:
+            low = middle
+        steps += 1
+    return high, steps
+
+
+def edge_points(x, y):
+    # EDGE_POINTS points along every edge of the polygon x, y
+    t = np.linspace(0, 1, EDGE_POINTS)[:, np.newaxis]
+    x1, y1 = np.roll(x, -1), np.roll(y, -1)
+    return (x + t * (x1 - x)).ravel(), (y + t * (y1 - y)).ravel()
+
+
+def main():
+    x, y = np.array(capture_engine.PLUME_X), np.array(capture_engine.PLUME_Y)
+    Q = capture_engine.minimum_pumping_rate(x, y, K, i, b)
+    Q_bisection, steps = bisection(x, y)
+    closed = best_of(lambda: capture_engine.minimum_pumping_rate(x, y, K, i, b))
+    bisected = best_of(lambda: bisection(x, y))
+    print(f"well at the origin: Q {Q:.7f} m3/s in {closed * 1e3:.3f} ms, bisection {Q_bisection:.7f} m3/s "
+          f"in {steps} steps and {bisected * 1e3:.2f} ms")
+    x_edge, y_edge = edge_points(x, y)
+    print(f"plume inside at Q: vertices {capture_engine.in_capture_zone(x, y, Q, K, i, b).all()}, "
+          f"{x_edge.size} edge points {capture_engine.in_capture_zone(x_edge, y_edge, Q, K, i, b).all()}; "
+          f"vertices inside at 0.999 Q: {capture_engine.in_capture_zone(x, y, 0.999 * Q, K, i, b).all()}")
+
+    for max_downstream in (0., capture_engine.MAX_DOWNSTREAM, 500.):
+        Q_best, x_best, y_best, report = capture_engine.optimal_well(x, y, K, i, b, max_downstream)
+        start = time.perf_counter()
+        X, Y = np.meshgrid(np.arange(x.min(), x.max() + max_downstream + GRID_STEP / 2, GRID_STEP),
+                           np.arange(y.min(), y.max() + GRID_STEP / 2, GRID_STEP))
+        Q_grid = np.array([capture_engine.minimum_pumping_rate(x, y, K, i, b, xw, yw)
+                           for xw, yw in zip(X.ravel(), Y.ravel())])
+        grid = time.perf_counter() - start
+        k = np.argmin(Q_grid)
+        print(f"\nlargest distance downstream {max_downstream:.0f} m:\n"
+              f"  Powell {Q_best:.7f} m3/s at ({x_best:.1f}, {y_best:.1f}) m, {report['evaluations']} evaluations "
+              f"in {report['seconds'] * 1e3:.1f} ms\n"
+              f"  grid   {Q_grid[k]:.7f} m3/s at ({X.ravel()[k]:.1f}, {Y.ravel()[k]:.1f}) m, {Q_grid.size} positions "
+              f"in {grid:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
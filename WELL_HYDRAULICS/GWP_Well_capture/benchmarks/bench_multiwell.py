@@ -0,0 +1,108 @@
+"""Timing, memory and accuracy of the capture zones of several wells.
+
+capture_zones is timed for 5 and 50 wells on grids of 400 x 400 and
+1000 x 1000 points, with the stream function evaluated in chunks of
+CHUNK_ELEMENTS grid points x wells and in one piece (peak memory from
+tracemalloc, in a separate call). The labels are checked against forward
+particle tracking: random points are tracked with capture_engine.track_particles
+until they reach a well or leave downstream, and a point that the stream
+function puts into a different zone is reported with its distance from the
+nearest zone boundary, measured far upstream (psi / K i b, in m). Besides
+the random wells, which rarely interact, the check covers pairs of wells
+whose zones meet: two wells in line with the flow (the downstream well
+draws water from both sides of the upstream zone) and two wells side by
+side, close together and far apart (the stagnation point between them).
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Well_capture/benchmarks/bench_multiwell.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import capture_engine  # noqa: E402
+
+K, i, b = 1E-3, 1E-3, 20.
+EXTENT = (-1000., 1000.)
+CHECK_POINTS = 1000
+# A tracked point within this distance (m) of a well has entered it
+ENTERED = 0.3
+# Pairs of interacting wells: name, K, i, b, x, y and Q of the wells
+PAIRS = (('in line', 1E-3, 1E-3, 20., (-300., 0.), (0., 0.), (0.003, 0.003)),
+         ('side by side, 18 m', 1E-3, 1E-3, 20., (0., 0.), (9., -9.), (0.003, 0.003)),
+         ('side by side, 600 m', 1E-4, 0.002, 10., (0., 0.), (300., -300.), (0.01, 0.01)))
+
+
+def random_wells(n_wells, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-800, 800, n_wells), rng.uniform(-800, 800, n_wells), rng.uniform(0.001, 0.003, n_wells)
+
+
+def run(x_w, y_w, Q_w, n_points, chunk_elements):
+    # Best seconds of capture_zones with the given chunk size and the peak MB of one more call
+    seconds = np.inf
+    for _ in range(3):
+        start = time.perf_counter()
+        result = capture_engine.capture_zones(K, i, b, x_w, y_w, Q_w, EXTENT, EXTENT, n_points, chunk_elements)
+        seconds = min(seconds, time.perf_counter() - start)
+    tracemalloc.start()
+    capture_engine.capture_zones(K, i, b, x_w, y_w, Q_w, EXTENT, EXTENT, n_points, chunk_elements)
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return seconds, peak, result
+
+
+def check_labels(x_w, y_w, Q_w, result, seed=1, flow=(K, i, b)):
+    # Points whose zone differs from forward tracking: (point, label, tracked well, distance from a boundary in m)
+    Q0 = np.prod(flow)
+    _, _, _, _, intervals, _, cuts, _ = result
+    z_wells = x_w + 1j * y_w
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(*EXTENT, CHECK_POINTS) + 1j * rng.uniform(*EXTENT, CHECK_POINTS)
+
+    def velocity(z):
+        v = capture_engine.multi_well_discharge(z, Q0, x_w, y_w, Q_w)
+        return np.where(np.abs(z[:, np.newaxis] - z_wells).min(axis=1) > ENTERED / 2, v, 0.)
+
+    paths, _ = capture_engine.track_particles(velocity, points, np.linspace(1e3, 3e9, 3000), rtol=1e-8, atol=1e-3,
+                                      max_steps=10 ** 6)
+    distance = np.abs(paths[:, :, np.newaxis] - z_wells).min(axis=0)
+    tracked = np.where(distance.min(axis=1) < ENTERED, distance.argmin(axis=1), -1)
+    psi = capture_engine.stream_function(points.real, points.imag, Q0, x_w, y_w, Q_w, cuts)
+    lower, upper, well = intervals[np.argsort(intervals[:, 0])].T
+    k = np.clip(np.searchsorted(lower, psi, side='right') - 1, 0, len(lower) - 1)
+    labels = np.where((psi >= lower[k]) & (psi <= upper[k]), well[k].astype(int), -1)
+    bounds = np.sort(intervals[:, :2].ravel())
+    return [(points[p], labels[p], tracked[p], np.abs(bounds - psi[p]).min() / Q0)
+            for p in np.flatnonzero(labels != tracked)], np.count_nonzero(tracked >= 0)
+
+
+def main():
+    print(f"{'wells':>6}{'grid':>11}{'chunked':>10}{'peak':>9}{'one piece':>11}{'peak':>9}{'cuts':>8}")
+    for n_wells in (5, 50):
+        x_w, y_w, Q_w = random_wells(n_wells)
+        for n_points in (400, 1000):
+            seconds, peak, result = run(x_w, y_w, Q_w, n_points, capture_engine.CHUNK_ELEMENTS)
+            whole, whole_peak, _ = run(x_w, y_w, Q_w, n_points, n_points ** 2 * n_wells)
+            print(f"{n_wells:>6}{n_points:>6}x{n_points:<4}{seconds:>9.2f}s{peak:>7.0f}MB"
+                  f"{whole:>10.2f}s{whole_peak:>7.0f}MB{result[-1]['cut seconds']:>7.2f}s")
+
+    checks = [(f"{n_wells} random wells", K, i, b, *random_wells(n_wells)) for n_wells in (5, 50)] + list(PAIRS)
+    for name, K_, i_, b_, x_w, y_w, Q_w in checks:
+        x_w, y_w, Q_w = (np.asarray(a, dtype=float) for a in (x_w, y_w, Q_w))
+        result = capture_engine.capture_zones(K_, i_, b_, x_w, y_w, Q_w, EXTENT, EXTENT, 100)
+        wrong, captured = check_labels(x_w, y_w, Q_w, result, flow=(K_, i_, b_))
+        print(f"\n{name}: {len(wrong)} of {CHECK_POINTS} points in a different zone than forward tracking "
+              f"({captured} captured)")
+        for point, label, tracked, boundary in wrong:
+            print(f"  {point.real:8.1f} {point.imag:8.1f}: zone {label:3d}, tracked {tracked:3d}, "
+                  f"{boundary:.3f} m from a zone boundary")
+
+
+if __name__ == '__main__':
+    main()
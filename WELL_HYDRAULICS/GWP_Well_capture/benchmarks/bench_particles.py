@@ -0,0 +1,86 @@
+"""Accuracy and timing of the vectorized particle tracking of the travel-time zones.
+
+The travel time from a point at distance L upstream of the well on the x axis
+is known in closed form, t = b n / (K i b) * (L - x0 ln(1 + L / x0)); it is
+compared with the position of the particle that is tracked along the axis.
+The swarm of travel_time_zones (all particles advanced together, one step
+size per particle) is timed against tracking the particles one by one with
+scipy.integrate.solve_ivp (RK45, same tolerances), extrapolated from
+SERIAL_PARTICLES particles.
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Well_capture/benchmarks/bench_particles.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import scipy.integrate
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import capture_engine  # noqa: E402
+
+# Defaults of the page and a porosity of 0.25
+Q, K, i, b, n = 0.005, 1E-3, 1E-3, 20., 0.25
+SERIAL_PARTICLES = 50
+
+
+def best_of(func, repeat=5):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def serial_zones(n_particles):
+    # Positions after ISOCHRONE_YEARS of n_particles tracked one by one with solve_ivp
+    radius = min(capture_engine.particles.START_RADIUS,
+                 capture_engine.particles.START_FRACTION * capture_engine.x0_conf(Q, K, i, b))
+    t0 = np.pi * radius ** 2 * b * n / Q
+    t_out = np.array(capture_engine.ISOCHRONE_YEARS) * capture_engine.YEAR
+
+    def rhs(t, xy):
+        v = -capture_engine.seepage_velocity(xy[0] + 1j * xy[1], Q, K, i, b, n)
+        return [v.real, v.imag]
+
+    positions = []
+    for z in capture_engine.release_points(n_particles, radius):
+        solution = scipy.integrate.solve_ivp(rhs, (t0, t_out[-1]), [z.real, z.imag], t_eval=t_out,
+                                             rtol=capture_engine.particles.RTOL, atol=capture_engine.particles.ATOL)
+        positions.append(solution.y[0] + 1j * solution.y[1])
+    return np.array(positions).T
+
+
+def main():
+    x0 = capture_engine.x0_conf(Q, K, i, b)
+    zones, report = capture_engine.travel_time_zones(Q, K, i, b, n)
+    print(f"{report['particles']} particles: {report['steps']} steps, {report['rejected']} rejected, "
+          f"{report['evaluations']} velocity evaluations\n")
+    print("Travel time along the upstream x axis (particle released at 180°):")
+    for years, x, y in zones:
+        L = -x[capture_engine.N_PARTICLES // 2]
+        t = b * n / (K * i * b) * (L - x0 * np.log(1 + L / x0))
+        print(f"  {years:4.0f} years: L = {L:8.2f} m, exact travel time {t / capture_engine.YEAR:.6f} years "
+              f"(relative error {abs(t / (years * capture_engine.YEAR) - 1):.1e})")
+
+    print(f"\n{'particles':>10}{'swarm':>12}{'one by one':>14}{'speed-up':>10}")
+    serial = best_of(lambda: serial_zones(SERIAL_PARTICLES), repeat=1) / SERIAL_PARTICLES
+    for n_particles in (500, 2000, 8000):
+        swarm = best_of(lambda: capture_engine.travel_time_zones(Q, K, i, b, n, n_particles=n_particles))
+        print(f"{n_particles:>10}{swarm * 1e3:>10.1f}ms{serial * n_particles:>13.2f}s{serial * n_particles / swarm:>9.0f}x")
+
+    check = serial_zones(SERIAL_PARTICLES)
+    swarm, _ = capture_engine.track_particles(
+        lambda z: -capture_engine.seepage_velocity(z, Q, K, i, b, n),
+        capture_engine.release_points(SERIAL_PARTICLES, capture_engine.particles.START_RADIUS),
+        np.array(capture_engine.ISOCHRONE_YEARS) * capture_engine.YEAR,
+        t0=np.pi * capture_engine.particles.START_RADIUS ** 2 * b * n / Q)
+    print(f"\nlargest distance between swarm and solve_ivp positions: {np.max(np.abs(swarm - check)):.3f} m")
+
+
+if __name__ == '__main__':
+    main()
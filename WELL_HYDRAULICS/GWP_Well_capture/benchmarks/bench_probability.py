@@ -0,0 +1,85 @@
+"""Accuracy and timing of the Monte Carlo probability of capture.
+
+capture_probability counts, for every grid point, the samples whose ymax
+exceeds the critical ymax of the point. It is compared with testing every
+capture envelope directly (|y| < ymax and x left of the separating
+streamline, in batches of BRUTE_CHUNK samples x grid points), timed on a
+400 x 400 grid and extrapolated from BRUTE_SAMPLES samples. The sampling
+and the counting of the chunks are timed for growing sample sizes, and the
+50 % contour is checked against the envelope of the median
+ymax.
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Well_capture/benchmarks/bench_probability.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import capture_engine  # noqa: E402
+
+# Defaults of the page and of the uncertainty sliders
+K, i, b, Q = 1E-3, 1E-3, 20., 0.005
+SIGMA_LOG_K, CV = 0.3, 0.1
+BRUTE_SAMPLES = 500
+BRUTE_CHUNK = 100
+
+
+def best_of(func, repeat=3):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def brute_force(samples, X, Y):
+    # Fraction of the envelopes that contain each point, every envelope tested against every point
+    ymax = capture_engine.ymax_conf(samples[3], samples[0], samples[1], samples[2])
+    inside = np.zeros(X.shape)
+    for k in range(0, len(ymax), BRUTE_CHUNK):
+        m = ymax[k:k + BRUTE_CHUNK, np.newaxis, np.newaxis]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_line = np.where(Y == 0, m / np.pi, Y / np.tan(np.pi * Y / m))
+        inside += ((np.abs(Y) < m) & (X < x_line)).sum(axis=0)
+    return inside / len(ymax)
+
+
+def main():
+    X, Y = np.meshgrid(np.linspace(-2500, 250, 400), np.linspace(-500, 500, 400))
+    samples = capture_engine.sample_parameters(K, i, b, Q, SIGMA_LOG_K, CV, CV, CV, capture_engine.N_SAMPLES)
+    probability, _ = capture_engine.capture_probability(*samples, X, Y)
+    check = brute_force([s[:BRUTE_SAMPLES] for s in samples], X, Y)
+    subset, _ = capture_engine.capture_probability(*[s[:BRUTE_SAMPLES] for s in samples], X, Y)
+    print(f"{BRUTE_SAMPLES} samples: largest difference to the direct test of the envelopes "
+          f"{np.abs(subset - check).max():.1e}")
+
+    brute = best_of(lambda: brute_force([s[:BRUTE_SAMPLES] for s in samples], X, Y), 1) / BRUTE_SAMPLES
+    counted = best_of(lambda: capture_engine.capture_probability(*samples, X, Y))
+    print(f"{capture_engine.N_SAMPLES} samples on {X.size} grid points: counted {counted * 1e3:.1f} ms, "
+          f"direct test of the envelopes {brute * capture_engine.N_SAMPLES:.1f} s")
+
+    print(f"\n{'samples':>10}{'sampling':>11}{'counting':>10}{'chunks':>8}")
+    for n_samples in (10000, 100000, 1000000):
+        sampling = best_of(lambda: capture_engine.sample_parameters(K, i, b, Q, SIGMA_LOG_K, CV, CV, CV, n_samples), 1)
+        samples_n = capture_engine.sample_parameters(K, i, b, Q, SIGMA_LOG_K, CV, CV, CV, n_samples)
+        _, report = capture_engine.capture_probability(*samples_n, X, Y)
+        counting = best_of(lambda: capture_engine.capture_probability(*samples_n, X, Y), 1)
+        print(f"{n_samples:>10}{sampling:>10.2f}s{counting:>9.2f}s{report['chunks']:>8}")
+
+    ymax = np.median(capture_engine.ymax_conf(samples[3], samples[0], samples[1], samples[2]))
+    y = np.linspace(-0.99, 0.99, 199) * ymax
+    x = capture_engine.separating_streamline_x(y, ymax * 2 * K * i * b, K, i, b)
+    inside, _ = capture_engine.capture_probability(*samples, x - 1., y)
+    outside, _ = capture_engine.capture_probability(*samples, x + 1., y)
+    print(f"\nenvelope of the median ymax ({ymax:.1f} m): probability {inside.min():.4f} to {inside.max():.4f} "
+          f"1 m inside, {outside.min():.4f} to {outside.max():.4f} 1 m outside")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Points and visual accuracy of the adaptively sampled separating streamline.
+
+The page drew the envelope at 100 values of y uniformly between -0.999 and
+0.999 ymax; adaptive_separating_streamline places the points by the
+curvature and length of the envelope in the plot, up to its left edge. Both
+are compared on the default plot (x from -2500 to 250 m, y from -500 to
+500 m) and on the plot of the largest x scaling (x from -50000 to 5000 m)
+for several pumping rates by the largest distance of the envelope from the
+drawn polyline, as a fraction of the axis spans (1e-3 is about 0.6 pixel of
+the page figure). The distance is measured at the points of the envelope in
+the plot among REFERENCE_POINTS points uniformly in y. The last column is
+the number of uniform points that the old sampling needs for the same
+accuracy.
+
+Run from the repository root:
+
+    python WELL_HYDRAULICS/GWP_Well_capture/benchmarks/bench_sampling.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import capture_engine  # noqa: E402
+
+# Defaults of the page and the plots of the default and of the largest x scaling
+K, i, b = 1E-3, 1E-3, 20.
+VIEWS = (((-2500., 250.), (-500., 500.)), ((-50000., 5000.), (-500., 500.)))
+RATES = (0.001, 0.005, 0.02, 0.05, 0.2)
+REFERENCE_POINTS = 200001
+NEIGHBOURS = 2
+UNIFORM_LIMIT = 100000
+
+
+def best_of(func, repeat=20):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def reference(Q, view):
+    # Dense points of the envelope inside the plot view
+    ymax = capture_engine.ymax_conf(Q, K, i, b)
+    y = np.linspace(-1, 1, REFERENCE_POINTS)[1:-1] * ymax
+    x = capture_engine.separating_streamline_x(y, Q, K, i, b)
+    (x_min, x_max), (y_min, y_max) = view
+    inside = (x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max)
+    return x[inside], y[inside]
+
+
+def visual_error(x, y, x_ref, y_ref, view):
+    # Largest distance of the reference points from the polyline x, y, in fractions of the spans of the view.
+    # Both run monotonously in y, so every reference point is measured to the segment that brackets its y and
+    # to the NEIGHBOURS segments on either side
+    scale = (view[0][1] - view[0][0], view[1][1] - view[1][0])
+    px, py, mx, my = x / scale[0], y / scale[1], x_ref / scale[0], y_ref / scale[1]
+    k = np.clip(np.searchsorted(py, my)[:, np.newaxis] + np.arange(-NEIGHBOURS - 1, NEIGHBOURS + 1), 0, len(px) - 2)
+    ax, ay, dx, dy = px[k], py[k], px[k + 1] - px[k], py[k + 1] - py[k]
+    mx, my = mx[:, np.newaxis], my[:, np.newaxis]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.nan_to_num(np.clip(((mx - ax) * dx + (my - ay) * dy) / (dx ** 2 + dy ** 2), 0., 1.))
+    distance = np.hypot(mx - ax - s * dx, my - ay - s * dy).min(axis=1)
+    return distance.max() if len(distance) else 0.
+
+
+def uniform_points_needed(Q, x_ref, y_ref, view, tolerance):
+    # Smallest number of uniform points in y (to +-0.999 ymax) that reaches the tolerance, by bisection; None
+    # if no number does (the envelope ends before the left edge)
+    low, high = 2, 100
+    while visual_error(*capture_engine.separating_streamline(Q, K, i, b, high), x_ref, y_ref, view) > tolerance:
+        low, high = high, 2 * high
+        if high > UNIFORM_LIMIT:
+            return None
+    while high - low > 1:
+        middle = (low + high) // 2
+        if visual_error(*capture_engine.separating_streamline(Q, K, i, b, middle), x_ref, y_ref, view) > tolerance:
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+def main():
+    print(f"tolerance {capture_engine.TOLERANCE:g} of the axis spans")
+    for view in VIEWS:
+        print(f"\nx from {view[0][0]:g} to {view[0][1]:g} m, y from {view[1][0]:g} to {view[1][1]:g} m")
+        print(f"{'Q (m3/s)':>9}{'uniform 100':>24}{'adaptive':>26}{'uniform for':>13}")
+        print(f"{'':>9}{'error':>12}{'time':>12}{'points':>8}{'error':>9}{'time':>9}{'tolerance':>13}")
+        for Q in RATES:
+            x_ref, y_ref = reference(Q, view)
+            x_u, y_u = capture_engine.separating_streamline(Q, K, i, b)
+            x_a, y_a = capture_engine.adaptive_separating_streamline(Q, K, i, b, view)
+            uniform = best_of(lambda: capture_engine.separating_streamline(Q, K, i, b))
+            adaptive = best_of(lambda: capture_engine.adaptive_separating_streamline(Q, K, i, b, view))
+            needed = uniform_points_needed(Q, x_ref, y_ref, view, capture_engine.TOLERANCE)
+            print(f"{Q:>9g}{visual_error(x_u, y_u, x_ref, y_ref, view):>12.1e}{uniform * 1e6:>10.0f}us{len(x_a):>8}"
+                  f"{visual_error(x_a, y_a, x_ref, y_ref, view):>9.1e}{adaptive * 1e6:>7.0f}us"
+                  f"{'never' if needed is None else needed:>13}")
+
+
+if __name__ == '__main__':
+    main()
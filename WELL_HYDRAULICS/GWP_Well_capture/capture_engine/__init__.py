@@ -0,0 +1,56 @@
+# Computational engine of the Well capture app.
+# The pages import from here; the functions work on NumPy arrays of positions
+# and parameters, so that the page does not loop over points or particles.
+from .capture import (
+    STREAMLINE_END,
+    STREAMLINE_END_POINTS,
+    adaptive_separating_streamline,
+    discharge,
+    seepage_velocity,
+    separating_streamline,
+    separating_streamline_x,
+    x0_conf,
+    ymax_conf,
+)
+from .design import (
+    MAX_DOWNSTREAM,
+    PLUME_X,
+    PLUME_Y,
+    in_capture_zone,
+    minimum_pumping_rate,
+    optimal_well,
+)
+from .multiwell import (
+    CHUNK_ELEMENTS,
+    GRID_POINTS,
+    branch_cuts,
+    capture_intervals,
+    capture_zones,
+    multi_well_discharge,
+    stagnation_points,
+    stream_function,
+    stream_function_grid,
+)
+from .particles import (
+    ISOCHRONE_YEARS,
+    N_PARTICLES,
+    YEAR,
+    release_points,
+    track_particles,
+    travel_time_zones,
+)
+from .probability import (
+    CHUNK_SAMPLES,
+    N_SAMPLES,
+    PROBABILITY_LEVELS,
+    capture_probability,
+    count_captures,
+    critical_ymax,
+    sample_parameters,
+)
+from .sampling import (
+    MAX_POINTS,
+    MAX_SEGMENT,
+    TOLERANCE,
+    adaptive_curve,
+)
@@ -0,0 +1,82 @@
+"""Capture zone of a well in uniform regional flow (confined aquifer).
+
+The regional flow with the specific discharge K i runs in the +x direction
+and the well with the pumping rate Q sits at the origin. With z = x + i y the
+complex potential (per unit width of the aquifer, thickness b) is
+
+    Omega(z) = -K i b z + Q / (2 pi) ln(z)
+
+and the discharge vector per unit width is Qx + i Qy = conj(-dOmega/dz)
+= K i b - Q / (2 pi conj(z)). It vanishes at the stagnation (culmination)
+point x0 = Q / (2 pi K i b) downstream of the well. The capture zone is
+bounded by the separating streamline x = y / tan(2 pi K i b y / Q), which
+approaches y = +-ymax = +-Q / (2 K i b) far upstream; it bends most at x0
+and runs off to x = -inf at +-ymax, so adaptive_separating_streamline places
+its points by curvature and length in the plot (sampling.py) up to the
+left edge of the plot instead of uniformly in y. The seepage velocity
+of the particles is the discharge divided by b and the porosity n. All
+functions accept NumPy arrays of positions.
+"""
+import numpy as np
+
+from .sampling import TOLERANCE, adaptive_curve
+
+# Grid of 1 - y / ymax on which the end of the adaptively sampled separating streamline is found
+# (10 % steps; the streamline reaches 1e-9 ymax from the asymptote at about -3e8 ymax)
+STREAMLINE_END = 1e-9
+STREAMLINE_END_POINTS = 198
+
+
+def ymax_conf(Q, K, i, b):
+    # Half width of the capture zone far upstream (maximale Breite des Einzugsgebietes)
+    return Q / (2. * K * i * b)
+
+
+def x0_conf(Q, K, i, b):
+    # Distance of the stagnation point downstream of the well (Kulminationspunkt)
+    return Q / (2. * np.pi * K * i * b)
+
+
+def separating_streamline_x(y, Q, K, i, b):
+    # x of the separating streamline at y (-ymax < y < ymax), x0 at y = 0
+    y = np.asarray(y, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x = y / np.tan(2 * np.pi * K * i * b * y / Q)
+    return np.where(y == 0, x0_conf(Q, K, i, b), x)
+
+
+def separating_streamline(Q, K, i, b, n_points=100):
+    # x and y of the envelope of the capture zone, y uniformly from -ymax to ymax (not reaching them)
+    ymax = ymax_conf(Q, K, i, b)
+    y = np.linspace(-ymax * 0.999, ymax * 0.999, n_points)
+    return separating_streamline_x(y, Q, K, i, b), y
+
+
+def adaptive_separating_streamline(Q, K, i, b, view=None, tolerance=TOLERANCE):
+    # x and y of the envelope of the capture zone, sampled by adaptive_curve to within tolerance of the spans
+    # of the plot view ((x_min, x_max), (y_min, y_max)), from its left edge; without a view to +-0.999 ymax
+    # as separating_streamline, to within tolerance of ymax
+    ymax = ymax_conf(Q, K, i, b)
+    scale = (ymax, ymax)
+    t_end = 0.999
+    if view is not None:
+        scale = (view[0][1] - view[0][0], view[1][1] - view[1][0])
+        # First fraction of ymax on a geometric grid towards ymax at which the streamline has passed the left edge
+        # (x falls from x0 at y = 0 to -inf at ymax)
+        t = 1. - np.geomspace(1., STREAMLINE_END, STREAMLINE_END_POINTS)
+        beyond = np.flatnonzero(separating_streamline_x(t * ymax, Q, K, i, b) < view[0][0])
+        t_end = t[beyond[0]] if len(beyond) else t[-1]
+    _, x, y = adaptive_curve(lambda t: (separating_streamline_x(t * ymax, Q, K, i, b), t * ymax),
+                             -t_end, t_end, scale, tolerance=tolerance, view=view)
+    return x, y
+
+
+def discharge(z, Q, K, i, b):
+    # Discharge vector per unit width Qx + i Qy (m²/s) at the complex positions z
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return K * i * b - Q / (2 * np.pi * np.conj(z))
+
+
+def seepage_velocity(z, Q, K, i, b, n):
+    # Seepage velocity vx + i vy (m/s) of the groundwater at the complex positions z
+    return discharge(z, Q, K, i, b) / (b * n)
@@ -0,0 +1,61 @@
+"""Design of a capture well: smallest pumping rate whose capture zone contains a plume.
+
+The capture zone of a well at (xw, yw) is {|y - yw| < ymax, x - xw < x of
+the separating streamline at y - yw}, see capture.py. It is convex (the
+separating streamline x = y cot(pi y / ymax) is a concave function of y), so
+it contains a polygon if and only if it contains all its vertices, and it
+grows with ymax = Q / (2 K i b) (every zone is the zone of ymax = 1 scaled by
+ymax). The smallest Q for a given well position is therefore 2 K i b times
+the largest critical ymax of the vertices (probability.critical_ymax), which
+is the limit of a bisection on Q with the point-in-capture test of all
+vertices (in_capture_zone) without the iterations.
+
+The further downstream the well, the smaller the Q (it tends to K i b times
+the width of the plume), so the well position is searched within a largest
+distance downstream of the plume: a bounded Powell search over (xw, yw)
+between the upstream end of the plume and that distance, across the width
+of the plume.
+"""
+import time
+
+import numpy as np
+
+from .capture import separating_streamline_x, ymax_conf
+from .probability import critical_ymax
+
+# Plume of the page (m): a polygon upstream of the well at the origin
+PLUME_X = (-900., -650., -400., -300., -450., -800.)
+PLUME_Y = (40., 120., 90., 10., -60., -40.)
+# Largest distance (m) of the well downstream of the plume in the search of the well position
+MAX_DOWNSTREAM = 100.
+
+
+def in_capture_zone(x, y, Q, K, i, b, x_well=0., y_well=0.):
+    # True where the points x, y lie in the capture zone of the well (inside or on the separating streamline)
+    dx = np.asarray(x, dtype=float) - x_well
+    dy = np.asarray(y, dtype=float) - y_well
+    inside = np.abs(dy) < ymax_conf(Q, K, i, b)
+    x_line = separating_streamline_x(np.where(inside, dy, 0.), Q, K, i, b)
+    # (with a tolerance of the rounding, so that the vertices that define the minimum pumping rate are inside)
+    return inside & (dx <= x_line + 1e-9 * np.abs(x_line))
+
+
+def minimum_pumping_rate(x, y, K, i, b, x_well=0., y_well=0.):
+    # Smallest Q (m³/s) of a well at x_well, y_well whose capture zone contains the polygon with the vertices x, y
+    return 2. * K * i * b * np.max(critical_ymax(np.asarray(x, dtype=float) - x_well,
+                                                 np.asarray(y, dtype=float) - y_well))
+
+
+def optimal_well(x, y, K, i, b, max_downstream=MAX_DOWNSTREAM):
+    # Well position with the smallest minimum_pumping_rate for the polygon x, y, at most max_downstream (m)
+    # downstream of it: (Q, x_well, y_well, report)
+    # (scipy.optimize is imported here, it is only needed by the position search)
+    import scipy.optimize
+    start = time.perf_counter()
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    bounds = [(x.min(), x.max() + max_downstream), (y.min(), y.max())]
+    result = scipy.optimize.minimize(lambda w: minimum_pumping_rate(x, y, K, i, b, *w),
+                                     [x.max() + 0.5 * max_downstream, y.mean()], method='Powell', bounds=bounds,
+                                     options={'xtol': 1e-3, 'ftol': 1e-9})
+    report = {'evaluations': result.nfev, 'seconds': time.perf_counter() - start}
+    return result.fun, result.x[0], result.x[1], report
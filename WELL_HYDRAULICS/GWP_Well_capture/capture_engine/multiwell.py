@@ -0,0 +1,309 @@
+"""Capture zones of several wells in uniform regional flow.
+
+The complex potential of the regional flow (K i b in the +x direction) and N
+wells at z_j with the pumping rates Q_j > 0 is
+
+    Omega(z) = -K i b z + sum_j Q_j / (2 pi) ln(z - z_j)
+
+Its imaginary part, the stream function psi = -K i b y + sum_j Q_j / (2 pi)
+theta_j, is constant along streamlines. It jumps by Q_j across the branch
+cut of ln(z - z_j), so the cuts are laid along streamlines, where no other
+streamline crosses them. The streamlines that leave the stagnation points
+(traced with particles.track_particles) join the wells, the stagnation
+points and the downstream end into a tree; the cut of a well is its path
+in that tree, through the stagnation points of interacting wells and out
+along a dividing streamline (see branch_cuts). Upstream psi is then continuous
+and decreases monotonically with y, every streamline keeps the psi it has
+far upstream, and the streamlines of a well form an interval of psi of
+width Q_j (split into several intervals where the cuts of other wells pass
+through it: a well downstream can draw water from both sides of another). The
+intervals are read from psi on a tiny circle around each well, just beside
+the angles at which the cuts cross it (capture_intervals); the capture zone of a well is the set of grid points
+whose psi lies in one of its intervals, and the zone boundaries are the
+contours of psi at the interval bounds.
+
+The grid is evaluated as grid points x wells arrays, in chunks of at most
+CHUNK_ELEMENTS elements, so that 50 wells on a 1000 x 1000 grid need about
+150 MB instead of 1.2 GB (benchmarks/bench_multiwell.py). Only psi is
+computed (arctan2 is much cheaper than the complex logarithm): the angles
+are first taken with the cut along +x and then shifted by 2 pi between that
+ray and the traced cut (on a grid, stream_function_grid, the shift is a run
+of rows in every column). The
+stagnation points, where the discharge K i b - sum_j Q_j / (2 pi (z - z_j))
+vanishes, are the eigenvalues of diag(z_j) + Q / (2 pi K i b) 1^T (matrix
+determinant lemma), polished with a few Newton steps.
+"""
+import time
+
+import numpy as np
+
+from .particles import track_particles
+
+# Grid points x wells per chunk of the stream function
+CHUNK_ELEMENTS = 2 ** 22
+GRID_POINTS = 400
+NEWTON_STEPS = 3
+# Tracing of the dividing streamlines: points per streamline, start distance from the stagnation point,
+# distance from a well within which the tracing slows down and at which a streamline has entered it
+# (fractions of the size of the grid). The start and stop distances are at most CUT_NEAR of the distance
+# between a stagnation point and its nearest well, which is small for a well of a small rate: the last step into
+# a well is straight, and it shifts the psi of the cut by about K i b times its length
+CUT_SAMPLES = 1000
+CUT_START = 1e-6
+CUT_SLOW = 1e-2
+CUT_STOP = 1e-4
+CUT_NEAR = 0.1
+# Points on the circle around a well that give its psi intervals, radius as a fraction of the size of the grid
+CIRCLE_POINTS = 720
+CIRCLE_RADIUS = 1e-7
+# Angle (rad) of the points beside a cut on the circle
+CIRCLE_BESIDE = 1e-4
+
+
+def _angles(x, y, x_wells, y_wells):
+    # Angles in (0, 2 pi] of the points (m,) as seen from the wells (n,), branch cut along +x: (m, n)
+    # (-0. for a point on the ray: the angle 0 of the side above it)
+    return np.arctan2(-(y[:, np.newaxis] - y_wells), x_wells - x[:, np.newaxis]) + np.pi
+
+
+def multi_well_discharge(z, Q0, x_wells, y_wells, Q_wells):
+    # Discharge vector per unit width Qx + i Qy (m²/s) of the regional flow and the wells at the positions z
+    z = np.asarray(z, dtype=complex)
+    z_wells = np.asarray(x_wells, dtype=float) + 1j * np.asarray(y_wells, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        w = Q0 - (np.asarray(Q_wells, dtype=float) / (2 * np.pi) / (z[..., np.newaxis] - z_wells)).sum(axis=-1)
+    return np.conj(w)
+
+
+def stagnation_points(Q0, x_wells, y_wells, Q_wells, newton_steps=NEWTON_STEPS):
+    # Complex positions where the discharge vanishes (one per well)
+    z_wells = np.asarray(x_wells, dtype=float) + 1j * np.asarray(y_wells, dtype=float)
+    a = np.asarray(Q_wells, dtype=float) / (2 * np.pi)
+    z = np.linalg.eigvals(np.diag(z_wells) + np.outer(a / Q0, np.ones(len(a))))
+    for _ in range(newton_steps):
+        d = z[:, np.newaxis] - z_wells
+        # W(z) = Q0 - sum a_j / (z - z_j) and W'(z) = sum a_j / (z - z_j)^2
+        z = z - (Q0 - (a / d).sum(axis=1)) / (a / d ** 2).sum(axis=1)
+    return z
+
+
+def dividing_streamlines(Q0, x_wells, y_wells, Q_wells, stagnation, x_end, size):
+    # The two streamlines that leave each stagnation point, as (points, end) with end the index of the well
+    # that they enter, -1 if they reach x_end and None if neither (the points are sampled by arc length)
+    z_wells = np.asarray(x_wells, dtype=float) + 1j * np.asarray(y_wells, dtype=float)
+    a = np.asarray(Q_wells, dtype=float) / (2 * np.pi)
+    near = np.abs(stagnation[:, np.newaxis] - z_wells).min(axis=1)
+    stop = min(CUT_STOP * size, CUT_NEAR * near.min())
+
+    def direction(z):
+        # Unit vector along the streamlines, zero in a well (within stop) and beyond x_end; slower within
+        # CUT_SLOW of a well, so that the steps do not jump over it
+        d = z[:, np.newaxis] - z_wells
+        distance = np.abs(d).min(axis=1)
+        moving = (distance > stop) & (z.real < x_end)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            v = np.conj(Q0 - (a / d).sum(axis=1))
+            return np.where(moving & (np.abs(v) > 0), np.minimum(distance / (CUT_SLOW * size), 1.) * v / np.abs(v), 0.)
+
+    # At a stagnation point the streamlines leave along exp(-i arg(W') / 2) and the opposite direction
+    slope = (a / (stagnation[:, np.newaxis] - z_wells) ** 2).sum(axis=1)
+    out = np.exp(-0.5j * np.angle(slope)) * np.minimum(CUT_START * size, CUT_NEAR * near)
+    starts = np.concatenate((stagnation + out, stagnation - out))
+    # Arc length plus the time to slow down to a well
+    length = 2 * (x_end - min(np.min(x_wells), np.min(stagnation.real))) + 2 * size
+    length += 2 * CUT_SLOW * size * np.log(CUT_SLOW * size / stop)
+    paths, _ = track_particles(direction, starts, np.linspace(0., length, CUT_SAMPLES), atol=stop / 10)
+    streamlines = []
+    for k, z in enumerate(paths.T):
+        # (a particle that stopped in a well or at x_end repeats its position)
+        z = np.concatenate((starts[k:k + 1], z[np.isfinite(z)]))
+        z = z[np.append(True, np.diff(z) != 0)]
+        distance = np.abs(z[-1] - z_wells)
+        if distance.min() <= 2 * stop:
+            end = int(distance.argmin())
+            z = np.append(z, z_wells[end])
+        elif z[-1].real >= x_end:
+            end = -1
+        else:
+            end = None
+        streamlines.append((z, end))
+    n = len(stagnation)
+    return [(streamlines[k], streamlines[k + n]) for k in range(n)]
+
+
+def branch_cuts(Q0, x_wells, y_wells, Q_wells, stagnation, x_end, size):
+    # Branch cut of each well along streamlines, from the well to x_end as complex points (None: the ray along +x)
+    z_wells = np.asarray(x_wells, dtype=float) + 1j * np.asarray(y_wells, dtype=float)
+    n = len(z_wells)
+    # Graph of the streamlines that leave the stagnation points: nodes are the wells (0 .. n-1), the stagnation
+    # points (n .. 2n-1) and x_end (-1), edges (node, path) from a node to the other end of the path. A streamline
+    # that runs into another stagnation point (a symmetric arrangement of wells) stops there
+    edges = {node: [] for node in range(-1, 2 * n)}
+    for k, pair in enumerate(dividing_streamlines(Q0, x_wells, y_wells, Q_wells, stagnation, x_end, size)):
+        for path, end in pair:
+            if end is None:
+                distance = np.abs(path[-1] - stagnation)
+                distance[k] = np.inf
+                if distance.min() > CUT_SLOW * size:
+                    continue
+                end = n + int(distance.argmin())
+                path = np.append(path, stagnation[end - n])
+            edges[n + k].append((end, path))
+            edges[end].append((n + k, path[::-1]))
+    # Breadth first from x_end: the path of every node to x_end along the streamlines (the graph is a tree of
+    # 2n + 1 nodes and 2n edges when all streamlines are traced; the first path found is kept otherwise)
+    paths = {-1: np.array([x_end + 0j])}
+    queue = [-1]
+    for node in queue:
+        for other, path in edges[node]:
+            if other not in paths:
+                paths[other] = np.concatenate((path[::-1], paths[node][1:]))
+                queue.append(other)
+    return [paths.get(well) for well in range(n)]
+
+
+def _cut_pieces(x_well, y_well, cut):
+    # The cut and the ray along +x from the well to its end as pieces (x ascending, y, sign) that are monotone
+    # in x; sign is +1 for a piece that runs in the +x direction along the closed loop cut - ray
+    x_end = cut.real.max()
+    cut = cut[np.append(True, np.diff(cut) != 0)]
+    # Direction of each segment in x (a segment along y keeps the direction of the one before)
+    direction = np.sign(np.diff(cut.real))
+    for k in np.flatnonzero(direction == 0):
+        direction[k] = direction[k - 1] if k else 1.
+    turns = np.flatnonzero(direction[1:] != direction[:-1]) + 1
+    pieces = []
+    for piece in np.split(np.arange(len(cut)), turns):
+        piece = np.append(piece, min(piece[-1] + 1, len(cut) - 1))
+        z = cut[piece]
+        if z[-1].real < z[0].real:
+            pieces.append((z.real[::-1], z.imag[::-1], -1.))
+        else:
+            pieces.append((z.real, z.imag, 1.))
+    pieces.append((np.array([cut[-1].real, x_end]), np.full(2, cut[-1].imag), 1.))
+    pieces.append((np.array([x_well, x_end]), np.full(2, y_well), -1.))
+    return pieces
+
+
+def _cut_correction(x, y, pieces):
+    # Winding number of the loop of _cut_pieces around the points: the signed crossings above them
+    correction = np.zeros(x.shape)
+    for xp, yp, sign in pieces:
+        inside = (x >= xp[0]) & (x < xp[-1])
+        if inside.any():
+            correction[inside] += sign * (np.interp(x[inside], xp, yp) >= y[inside])
+    return correction
+
+
+def _grid_correction(x, y, Q_wells, pieces):
+    # sum_j Q_j _cut_correction on the grid of the ascending axes x and y, (len(y), len(x)), for the pieces of
+    # the cuts of the wells: the rows below a piece are a run from row 0 in every column, added as a difference
+    difference = np.zeros((len(y) + 1, len(x)))
+    for Q, well_pieces in zip(Q_wells, pieces):
+        for xp, yp, sign in well_pieces:
+            columns = np.flatnonzero((x >= xp[0]) & (x < xp[-1]))
+            rows = np.searchsorted(y, np.interp(x[columns], xp, yp), side='right')
+            difference[0, columns] += sign * Q
+            np.add.at(difference, (rows, columns), -sign * Q)
+    return np.cumsum(difference, axis=0)[:-1]
+
+
+def _angle_sum(x, y, x_wells, y_wells, Q_wells, chunk_elements):
+    # sum_j Q_j theta_j / (2 pi) at the flat points x, y, in chunks of at most chunk_elements points x wells
+    total = np.empty(len(x))
+    rows = max(chunk_elements // max(len(Q_wells), 1), 1)
+    for start in range(0, len(x), rows):
+        chunk = slice(start, start + rows)
+        total[chunk] = _angles(x[chunk], y[chunk], x_wells, y_wells) @ (Q_wells / (2 * np.pi))
+    return total
+
+
+def stream_function(x, y, Q0, x_wells, y_wells, Q_wells, cuts=None, chunk_elements=CHUNK_ELEMENTS):
+    # psi (m³/s) at the points x, y (any shape) of the regional flow Q0 = K i b and the wells, with the branch
+    # cuts of branch_cuts (None: all cuts along +x)
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    x_wells, y_wells, Q_wells = (np.atleast_1d(np.asarray(a, dtype=float)) for a in (x_wells, y_wells, Q_wells))
+    flat_x, flat_y = x.ravel(), y.ravel()
+    psi = -Q0 * flat_y + _angle_sum(flat_x, flat_y, x_wells, y_wells, Q_wells, chunk_elements)
+    for j, cut in enumerate(cuts or ()):
+        if cut is not None:
+            psi += Q_wells[j] * _cut_correction(flat_x, flat_y, _cut_pieces(x_wells[j], y_wells[j], cut))
+    return psi.reshape(x.shape)
+
+
+def stream_function_grid(x, y, Q0, x_wells, y_wells, Q_wells, cuts=None, chunk_elements=CHUNK_ELEMENTS):
+    # stream_function on the grid of the ascending axes x and y: (len(y), len(x))
+    x_wells, y_wells, Q_wells = (np.atleast_1d(np.asarray(a, dtype=float)) for a in (x_wells, y_wells, Q_wells))
+    X, Y = np.meshgrid(x, y)
+    psi = -Q0 * Y + _angle_sum(X.ravel(), Y.ravel(), x_wells, y_wells, Q_wells, chunk_elements).reshape(X.shape)
+    traced = [j for j, cut in enumerate(cuts or ()) if cut is not None]
+    if traced:
+        psi += _grid_correction(x, y, Q_wells[traced],
+                                [_cut_pieces(x_wells[j], y_wells[j], cuts[j]) for j in traced])
+    return psi
+
+
+def capture_intervals(Q0, x_wells, y_wells, Q_wells, cuts=None, size=1.):
+    # psi intervals of the streamlines that enter the wells: (m, 3) rows of lower, upper and the index of the well
+    x_wells, y_wells, Q_wells = (np.atleast_1d(np.asarray(a, dtype=float)) for a in (x_wells, y_wells, Q_wells))
+    z_wells = x_wells + 1j * y_wells
+    # Half a step off the axes, so that no point lies on a straight cut
+    uniform = 2 * np.pi * (np.arange(CIRCLE_POINTS) + 0.5) / CIRCLE_POINTS
+    intervals = []
+    for j, z_well in enumerate(z_wells):
+        # Angles at which cuts cross the circle: the +x ray and the segments of the cuts next to the well (the
+        # streamlines of a cut end exactly in the wells that they enter, and they are straight within the circle,
+        # whose radius is at most a tenth of these segments). The points just beside them are the ends of the arcs,
+        # and the bounds are extended by the growth of psi over CIRCLE_BESIDE, so that they are exact
+        neighbours = []
+        for cut in cuts or ():
+            if cut is not None:
+                for k in np.flatnonzero(cut == z_well):
+                    neighbours.extend(cut[[m for m in (k - 1, k + 1) if 0 <= m < len(cut)]] - z_well)
+        crossings = np.append(0., np.angle(neighbours))
+        radius = min(CIRCLE_RADIUS * size, 0.1 * np.min(np.abs(neighbours), initial=np.inf))
+        angles = np.sort(np.concatenate((uniform, crossings - CIRCLE_BESIDE, crossings + CIRCLE_BESIDE)) % (2 * np.pi))
+        circle = z_well + radius * np.exp(1j * angles)
+        psi = stream_function(circle.real, circle.imag, Q0, x_wells, y_wells, Q_wells, cuts)
+        # psi grows by Q_j over the circle, Q_j / (2 pi) per radian, and jumps by the rate of a well at a cut (cyclic:
+        # a cut along +x crosses the circle between its last and its first point). What is left of a step after the
+        # growth of the well itself is a jump if it is more than half the smallest rate, however much larger Q_j is
+        step = np.roll(psi, -1) - psi - Q_wells[j] / (2 * np.pi) * ((np.roll(angles, -1) - angles) % (2 * np.pi))
+        jumps = np.flatnonzero(np.abs(step) > 0.5 * Q_wells.min()) + 1
+        arcs = np.split(np.roll(psi, -jumps[0]), jumps[1:] - jumps[0]) if len(jumps) else [psi]
+        beside = Q_wells[j] / (2 * np.pi) * CIRCLE_BESIDE if len(jumps) else 0.
+        for arc in arcs:
+            intervals.append((arc.min() - beside, arc.max() + beside, j))
+    return np.array(intervals)
+
+
+def capture_zones(K, i, b, x_wells, y_wells, Q_wells, x_range, y_range, n_points=GRID_POINTS,
+                  chunk_elements=CHUNK_ELEMENTS):
+    # Stream function and capture zone labels (index of the well, -1 outside) on an n_points x n_points grid,
+    # the psi intervals, the stagnation points, the branch cuts and a report with the seconds of the steps
+    start = time.perf_counter()
+    Q0 = K * i * b
+    x_wells, y_wells, Q_wells = (np.atleast_1d(np.asarray(a, dtype=float)) for a in (x_wells, y_wells, Q_wells))
+    if len(np.unique(x_wells + 1j * y_wells)) < len(Q_wells):
+        raise ValueError("Two wells are at the same position, merge them into one well with the sum of their rates")
+    size = max(x_range[1] - x_range[0], y_range[1] - y_range[0])
+    stagnation = stagnation_points(Q0, x_wells, y_wells, Q_wells)
+    # (beyond the stagnation points outside of the grid, whose streamlines can lead back to the wells)
+    x_end = max(x_range[1], x_wells.max(), stagnation.real.max()) + 0.01 * size
+    cuts = branch_cuts(Q0, x_wells, y_wells, Q_wells, stagnation, x_end, size)
+    intervals = capture_intervals(Q0, x_wells, y_wells, Q_wells, cuts, size)
+    traced = time.perf_counter()
+
+    x, y = np.linspace(*x_range, n_points), np.linspace(*y_range, n_points)
+    X, Y = np.meshgrid(x, y)
+    psi = stream_function_grid(x, y, Q0, x_wells, y_wells, Q_wells, cuts, chunk_elements)
+    # The intervals do not overlap (but for the rounding at their ends): the last lower bound below psi
+    order = np.argsort(intervals[:, 0])
+    lower, upper, well = intervals[order].T
+    k = np.clip(np.searchsorted(lower, psi, side='right') - 1, 0, len(order) - 1)
+    labels = np.where((psi >= lower[k]) & (psi <= upper[k]), well[k].astype(int), -1)
+    report = {'wells': len(Q_wells), 'grid points': X.size,
+              'chunks': -(-X.size // max(chunk_elements // len(Q_wells), 1)),
+              'traced cuts': sum(cut is not None for cut in cuts),
+              'cut seconds': traced - start, 'seconds': time.perf_counter() - start}
+    return X, Y, psi, labels, intervals, stagnation, cuts, report
@@ -0,0 +1,143 @@
+"""Time-of-travel capture zones by backward particle tracking.
+
+Particles are released on a small circle around the well, evenly spaced in
+angle so that each carries the same share of Q, and tracked backward in time
+(against the seepage velocity of capture.py) with the Dormand-Prince
+Runge-Kutta 4(5) pair. The whole swarm is one complex NumPy array: every
+stage of a step evaluates the velocity of all active particles at once, and
+every particle has its own step size, which the embedded error estimate
+grows where the flow is smooth (far upstream) and shrinks near the well and
+the stagnation point. Steps are cut at the output times, so the positions
+of all particles at 1, 5 and 10 years are exact points of the trajectories;
+joined in the order of the release angles they give the isochrones, the
+zones from which water reaches the well within that time.
+
+Close to the well the flow is radial, so a particle on the release circle of
+radius r0 has already travelled pi r0^2 b n / Q; the tracking starts at that
+time. The particles next to the +x axis run into the stagnation point and
+then, once they have passed it, up along the separating streamline. Water on
+the streamline itself never reaches the well, so from then on the zone
+reaches along the separating streamline to the stagnation point; this edge
+is added between the first and the last particle.
+
+track_particles itself takes the velocity as any function of the complex
+positions, so it also tracks the flow of several wells (multiwell.py).
+"""
+import time
+
+import numpy as np
+
+from .capture import seepage_velocity, separating_streamline_x, x0_conf
+
+YEAR = 365.25 * 86400.
+ISOCHRONE_YEARS = (1., 5., 10.)
+N_PARTICLES = 2000
+# Radius of the release circle in m, at most START_FRACTION of the distance of the stagnation point
+START_RADIUS = 0.1
+START_FRACTION = 0.01
+# Points of the edge along the separating streamline of each side
+EDGE_POINTS = 50
+# Error tolerance of a step: ATOL in m plus RTOL times the distance from the origin
+RTOL = 1e-6
+ATOL = 1e-2
+# Limits of the change of the step size per step
+MIN_FACTOR, MAX_FACTOR, SAFETY = 0.2, 5., 0.9
+MAX_STEPS = 20000
+
+# Dormand-Prince 5(4) tableau (the velocity field does not depend on time, so the nodes are not needed):
+# stages, 5th order weights and the difference to the 4th order weights
+_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0., 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+]
+_B = np.array([35 / 384, 0., 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.])
+_E = _B - np.array([5179 / 57600, 0., 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40])
+
+
+def track_particles(velocity, z0, t_out, t0=0., rtol=RTOL, atol=ATOL, max_steps=MAX_STEPS):
+    # Complex positions (len(t_out), n) of the particles that start at z0 (time t0) at the ascending times t_out
+    # velocity(z) returns dz/dt for an array of positions. Returns the positions and a report with the number
+    # of steps (of the slowest particle), rejected steps, velocity evaluations (particle-stages) and seconds
+    start = time.perf_counter()
+    t_out = np.asarray(t_out, dtype=float)
+    z = np.array(z0, dtype=complex).ravel()
+    n = len(z)
+    t = np.full(n, float(t0))
+    out = np.full((len(t_out), n), np.nan + 0j)
+    # Next output of each particle; outputs before t0 are the start positions
+    k = np.searchsorted(t_out, t0, side='right')
+    out[:k] = z
+    k = np.full(n, k)
+    # First step: about 1 % of the distance to the origin (or atol) at the start velocity
+    speed = np.abs(velocity(z))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        h = np.where(speed > 0, 0.01 * np.maximum(np.abs(z), atol) / speed, np.inf)
+    steps = rejected = evaluations = 0
+    active = np.flatnonzero(k < len(t_out))
+    while len(active) and steps < max_steps:
+        za, ta = z[active], t[active]
+        remaining = t_out[k[active]] - ta
+        ha = np.minimum(h[active], remaining)
+        stages = []
+        for c_row in _A:
+            zi = za + ha * sum(a * s for a, s in zip(c_row, stages)) if c_row else za
+            stages.append(velocity(zi))
+        evaluations += len(_A) * len(active)
+        z_new = za + ha * sum(w * s for w, s in zip(_B, stages) if w)
+        error = np.abs(ha * sum(e * s for e, s in zip(_E, stages) if e))
+        scale = atol + rtol * np.maximum(np.abs(za), np.abs(z_new))
+        ratio = error / scale
+        ok = np.isfinite(ratio) & (ratio <= 1.)
+        # Particles at the stagnation point do not move (zero velocity, zero error)
+        with np.errstate(divide='ignore'):
+            factor = np.clip(SAFETY * np.where(ratio > 0, ratio, 1e-10) ** -0.2, MIN_FACTOR, MAX_FACTOR)
+        factor = np.where(np.isfinite(ratio), factor, MIN_FACTOR)
+
+        accepted = active[ok]
+        z[accepted] = z_new[ok]
+        reached = ok & (ha >= remaining)
+        t[accepted] = np.where(reached[ok], t_out[k[accepted]], ta[ok] + ha[ok])
+        out[k[active[reached]], active[reached]] = z[active[reached]]
+        k[active[reached]] += 1
+        # A step that was cut at an output time does not shrink the next step
+        h[active] = np.where(reached, np.maximum(h[active], ha * factor), ha * factor)
+        rejected += int(np.count_nonzero(~ok))
+        steps += 1
+        active = active[k[active] < len(t_out)]
+    report = {'particles': n, 'steps': steps, 'rejected': rejected, 'evaluations': evaluations,
+              'unfinished': len(active), 'seconds': time.perf_counter() - start}
+    return out, report
+
+
+def release_points(n_particles=N_PARTICLES, radius=START_RADIUS, center=0j):
+    # n_particles positions evenly spaced in angle on a circle around center, starting just above the +x axis
+    # (half a spacing off the axis: a particle on the axis would be tracked into the stagnation point, where it
+    # would stop and the explicit steps become unstable)
+    angles = 2 * np.pi * (np.arange(n_particles) + 0.5) / n_particles
+    return center + radius * np.exp(1j * angles)
+
+
+def travel_time_zones(Q, K, i, b, n, years=ISOCHRONE_YEARS, n_particles=N_PARTICLES):
+    # Isochrones of a well at the origin in uniform flow: a list of (years, x, y) of closed curves and the
+    # report of track_particles (empty list if the well does not pump)
+    if Q <= 0:
+        return [], {'particles': 0, 'steps': 0, 'rejected': 0, 'evaluations': 0, 'unfinished': 0, 'seconds': 0.}
+    radius = min(START_RADIUS, START_FRACTION * x0_conf(Q, K, i, b))
+    t0 = np.pi * radius ** 2 * b * n / Q
+    t_out = np.asarray(years, dtype=float) * YEAR
+    positions, report = track_particles(lambda z: -seepage_velocity(z, Q, K, i, b, n),
+                                        release_points(n_particles, radius), t_out, t0=t0, atol=min(ATOL, radius))
+    zones = []
+    for years_i, z in zip(years, positions):
+        # The first particle is upstream of the stagnation point if it flows towards it (vx > 0)
+        if seepage_velocity(z[0], Q, K, i, b, n).real > 0:
+            y = np.linspace(z[-1].imag, z[0].imag, 2 * EDGE_POINTS)
+            z = np.concatenate((z, separating_streamline_x(y, Q, K, i, b) + 1j * y))
+        z = np.append(z, z[:1])
+        zones.append((years_i, z.real, z.imag))
+    return zones, report
@@ -0,0 +1,89 @@
+"""Probability of capture for uncertain aquifer parameters (Monte Carlo).
+
+K, i, b and Q are sampled (K log-normal, the others normal and truncated to
+positive values; a mean that is not positive, such as Q = 0, is not sampled)
+and every sample gives a capture envelope. All envelopes have the same
+shape: the capture zone of a sample is the zone of ymax = 1 scaled by its
+ymax = Q / (2 K i b), and that zone is star-shaped around the well, so a
+larger ymax contains every point of a smaller one. A point at
+(x, y) lies inside the envelope of a sample if and only if the ymax of the
+sample exceeds
+
+    r(x, y) = pi |y| / atan2(|y|, x)
+
+(the separating streamline x = y / tan(pi y / ymax) solved for ymax; pi x on
+the +x axis, 0 on the -x axis). Testing all envelopes against all grid points
+is therefore one comparison per sample and point, done in a batch for a
+chunk of samples: the ymax of the chunk are sorted and np.searchsorted counts
+the samples with ymax > r at every grid point. The counts of the chunks add
+up to the probability-of-capture raster; the contour of probability p is
+the envelope of the (1 - p) quantile of ymax. Chunks are counted one after
+the other and reported to a progress function. A million samples on a
+400 x 400 grid take about 0.6 s (benchmarks/bench_probability.py), less than
+sending the chunks to worker processes, and no process is forked from the
+multithreaded server.
+"""
+import time
+
+import numpy as np
+
+from .capture import ymax_conf
+
+N_SAMPLES = 5000
+CHUNK_SAMPLES = 10000
+PROBABILITY_LEVELS = (0.05, 0.5, 0.95)
+
+
+def _positive_normal(rng, mean, cv, n_samples):
+    # Normal samples with the coefficient of variation cv, drawn again where they are not positive; the mean
+    # itself if it is not positive (a well that does not pump) or certain (cv = 0)
+    if mean <= 0 or cv == 0:
+        return np.full(n_samples, float(mean))
+    values = rng.normal(mean, cv * mean, n_samples)
+    bad = values <= 0
+    while bad.any():
+        values[bad] = rng.normal(mean, cv * mean, np.count_nonzero(bad))
+        bad = values <= 0
+    return values
+
+
+def sample_parameters(K, i, b, Q, sigma_log_K, cv_i, cv_b, cv_Q, n_samples=N_SAMPLES, seed=0):
+    # Samples of K (log-normal, median K and standard deviation sigma_log_K of log10 K) and of i, b and Q
+    # (normal with the means i, b, Q and the coefficients of variation cv_i, cv_b, cv_Q, positive)
+    rng = np.random.default_rng(seed)
+    K_samples = 10 ** rng.normal(np.log10(K), sigma_log_K, n_samples)
+    return (K_samples, _positive_normal(rng, i, cv_i, n_samples), _positive_normal(rng, b, cv_b, n_samples),
+            _positive_normal(rng, Q, cv_Q, n_samples))
+
+
+def critical_ymax(x, y):
+    # Smallest ymax of a capture envelope that contains the points x, y (well at the origin)
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    angle = np.arctan2(np.abs(y), x)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = np.pi * np.abs(y) / angle
+    return np.where(y == 0, np.where(x > 0, np.pi * x, 0.), r)
+
+
+def count_captures(ymax, r):
+    # Number of the envelopes ymax that contain each point with the critical ymax r
+    return len(ymax) - np.searchsorted(np.sort(ymax), r, side='right')
+
+
+def capture_probability(K, i, b, Q, x, y, chunk_samples=CHUNK_SAMPLES, progress=None):
+    # Fraction of the samples K, i, b, Q whose capture envelope contains each point x, y (any shape), in chunks
+    # of chunk_samples; progress(done, total) is called after every chunk. Returns the probability and a report
+    # with the samples, chunks and seconds
+    start = time.perf_counter()
+    ymax = np.atleast_1d(ymax_conf(Q, K, i, b))
+    r = critical_ymax(x, y)
+    chunks = [ymax[k:k + chunk_samples] for k in range(0, len(ymax), chunk_samples)]
+    counts = np.zeros(r.shape, dtype=np.int64)
+    done = 0
+    for chunk in chunks:
+        counts += count_captures(chunk, r)
+        done += len(chunk)
+        if progress is not None:
+            progress(done, len(ymax))
+    report = {'samples': len(ymax), 'chunks': len(chunks), 'seconds': time.perf_counter() - start}
+    return counts / len(ymax), report
@@ -0,0 +1,66 @@
+"""Adaptive sampling of the curves of the plan view.
+
+The envelope of a capture zone is almost straight far upstream and bends
+sharply around the stagnation point, so evenly spaced points either miss
+the bend or waste most points on the straight arms. adaptive_curve starts
+from a coarse uniform grid of the curve parameter t and evaluates the curve
+at the midpoints of all segments at once. A segment is split at its
+midpoint where that point lies further than the tolerance from the segment
+(the sagitta, about the curvature times the squared arc length over 8) or
+where the segment is longer than a largest length (so that a feature
+between two points that happen to lie on a straight line is not missed).
+Segments that pass are final, so every pass only evaluates the curve at the
+midpoints of the segments split in the pass before, and a segment that
+lies beyond one edge of the view (both ends and the midpoint) is not
+refined, as it is not drawn. Distances are measured in units of the spans
+of the view, so the tolerance is the visual accuracy of the drawn curve
+(benchmarks/bench_sampling.py).
+"""
+import numpy as np
+
+# Largest distance of the curve from a segment and largest length of a segment (fractions of the axis spans)
+TOLERANCE = 1e-3
+MAX_SEGMENT = 0.1
+START_POINTS = 9
+MAX_POINTS = 2000
+
+
+def adaptive_curve(curve, t_start, t_stop, scale=(1., 1.), tolerance=TOLERANCE, max_segment=MAX_SEGMENT,
+                   view=None, start_points=START_POINTS, max_points=MAX_POINTS):
+    # Parameters t and points x, y of curve(t) -> (x, y) (vectorized in t) from t_start to t_stop, refined until
+    # every segment lies within tolerance of the curve and is at most max_segment long, in units of scale (the
+    # spans of the axes); at most about max_points points.
+    # Segments with a point that is not finite, or beyond an edge of view ((x_min, x_max), (y_min, y_max)), are
+    # not refined
+    def display(x, y):
+        return np.asarray(x, dtype=float) / scale[0], np.asarray(y, dtype=float) / scale[1]
+
+    t = np.linspace(t_start, t_stop, start_points)
+    x, y = (np.asarray(v, dtype=float) for v in curve(t))
+    px, py = display(x, y)
+    edges = display(*view) if view is not None else None
+    active = np.ones(len(t) - 1, dtype=bool)
+    while active.any() and len(t) < max_points:
+        k = np.flatnonzero(active)
+        t_mid = 0.5 * (t[k] + t[k + 1])
+        x_mid, y_mid = (np.asarray(v, dtype=float) for v in curve(t_mid))
+        mx, my = display(x_mid, y_mid)
+        dx, dy = px[k + 1] - px[k], py[k + 1] - py[k]
+        length = np.hypot(dx, dy)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s = np.clip(((mx - px[k]) * dx + (my - py[k]) * dy) / length ** 2, 0., 1.)
+        deviation = np.hypot(mx - px[k] - np.nan_to_num(s) * dx, my - py[k] - np.nan_to_num(s) * dy)
+        split = (deviation > tolerance) | (length > max_segment)
+        if edges is not None:
+            for p, m, (low, high) in ((px, mx, edges[0]), (py, my, edges[1])):
+                split &= ~(np.maximum(np.maximum(p[k], p[k + 1]), m) < low)
+                split &= ~(np.minimum(np.minimum(p[k], p[k + 1]), m) > high)
+        # (not below the resolution of t)
+        split &= (t_mid > t[k]) & (t_mid < t[k + 1])
+        at = k[split] + 1
+        refined = np.zeros(len(t) - 1, dtype=bool)
+        refined[k[split]] = True
+        t, x, y = np.insert(t, at, t_mid[split]), np.insert(x, at, x_mid[split]), np.insert(y, at, y_mid[split])
+        px, py = np.insert(px, at, mx[split]), np.insert(py, at, my[split])
+        active = np.insert(refined, at, True)
+    return t, x, y
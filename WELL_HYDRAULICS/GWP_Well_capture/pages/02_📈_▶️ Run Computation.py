@@ -1,23 +1,14 @@
 # Initialize librarys
 import matplotlib
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import numpy as np
 import math
 from math import pi, tan
 import streamlit as st
+from capture_engine import GRID_POINTS, ISOCHRONE_YEARS, MAX_DOWNSTREAM, N_SAMPLES, PLUME_X, PLUME_Y, PROBABILITY_LEVELS, adaptive_separating_streamline, capture_probability, capture_zones, minimum_pumping_rate, optimal_well, sample_parameters, travel_time_zones, x0_conf, ymax_conf
 
 st.title('Well capture zone for a confined aquifer')
 
-# Function for catchment width (maximale Breite des Einzugsgebietes)
-def ymax_conf(Q, K, i, b):
-    ymax = Q/(2.*K*i*b)
-    return ymax
-
-# Function for the culmination point (Kulminationspunkt)
-def x0_conf(Q, K, i, b):
-    x0 = Q/(2.*np.pi*K*i*b)
-    return x0
-
 # Computaton of the well catchment (Berechnung der Trennstromlinie)
 
 # Get input data
@@ -34,6 +25,27 @@ columns = st.columns((1,1), gap = 'large')
 with columns[0]:
     x_scale = st.slider('_Plot scaling in x direction_', 0.5, 10., 0.5, 0.5)
     y_scale = st.slider('_Plot scaling in y direction_', 0.5, 10., 0.5, 0.5)
+    isochrones = st.toggle('**Travel-time capture zones** (%s years, particle tracking)' % ', '.join('%g' % t for t in ISOCHRONE_YEARS))
+    multiple = st.toggle('**Multiple wells** (capture zones of all wells from the stream function)')
+    if multiple:
+        # Wells at x, y with the pumping rates Q (rows can be added and removed)
+        wells = st.data_editor({'x (m)': [0., -300., -200.], 'y (m)': [0., 150., -200.], 'Q (m3/s)': [0.005, 0.003, 0.004]},
+                               num_rows='dynamic', key='wells')
+        n_grid = st.slider('_Grid points per axis_', 100, 1000, GRID_POINTS, 100)
+    probabilistic = st.toggle('**Capture probability** (Monte Carlo of uncertain K, i, b and Q)', disabled = multiple) and not multiple
+    if probabilistic:
+        # K is log-normal, i, b and Q are normal (positive)
+        n_samples = st.select_slider('_Number of samples_', (1000, 5000, 10000, 50000, 100000, 1000000), N_SAMPLES)
+        sigma_log_K = st.slider('_Standard deviation of log10 K_', 0., 1., 0.3, 0.05)
+        cv_i = st.slider('_Coefficient of variation of the gradient (%)_', 0, 50, 10, 5) / 100
+        cv_b = st.slider('_Coefficient of variation of the thickness (%)_', 0, 50, 10, 5) / 100
+        cv_Q = st.slider('_Coefficient of variation of the pumping rate (%)_', 0, 50, 10, 5) / 100
+    design = st.toggle('**Capture design** (smallest pumping rate whose capture zone contains a plume)', disabled = multiple) and not multiple
+    if design:
+        # Vertices of the plume polygon (rows can be added and removed)
+        plume = st.data_editor({'x (m)': list(PLUME_X), 'y (m)': list(PLUME_Y)}, num_rows='dynamic', key='plume')
+        optimise = st.toggle('Optimise the well position')
+        max_downstream = st.slider('_Largest distance of the well downstream of the plume (m)_', 0., 1000., MAX_DOWNSTREAM, 10., disabled = not optimise)
     #revers = st.toggle('Reverse x-axis')
 with columns[1]:
     b = st.slider('**Aquifer thickness (m)**', 1., 100.,20., 0.1, format="%5.2f")
@@ -42,37 +54,78 @@ with columns[1]:
     i = 10 ** i_slider_value   
     # Display the logarithmic value
     st.write("_Gradient of regional flow (dimensionless):_ %5.2e" %i)    
-    Q = st.slider('**Pumping rate (m3/s)**', 0., 0.2,0.005, 0.001, format="%5.3f")
+    Q = st.slider('**Pumping rate (m3/s)**', 0., 0.2,0.005, 0.001, format="%5.3f", disabled = multiple)
     K_slider_value=st.slider('(log of) **Hydr. conductivity (m/s)**', log_min,log_max,-3.0,0.01,format="%4.2f" )
     # Convert the slider value to the logarithmic scale
     K = 10 ** K_slider_value
     # Display the logarithmic value
     st.write("_Hydraulic conductivity (m/s):_ %5.2e" %K)
+    n = st.slider('**Porosity (dimensionless)**', 0.01, 0.5, 0.25, 0.01, format="%4.2f", disabled = not isochrones)
 
 
 x_max= 1000 #fixed(x_max),
 ymax = ymax_conf(Q, K, i, b)
 x0   = x0_conf(Q, K, i, b)
 
-y = np.linspace(-ymax*0.999, ymax*0.999, 100)
-
 x_well = 0
 y_well = 0
 
-# Compute catchment
-#x = -1*y/(np.tan(2*np.pi*K*i*b*y/Q))
-x = y/(np.tan(2*np.pi*K*i*b*y/Q))
-
 x_plot = 500 * x_scale
 y_plot = 1000 * y_scale
+
+# Compute catchment, with points placed by the curvature of the envelope in the plot up to its left edge
+#x = -1*y/(np.tan(2*np.pi*K*i*b*y/Q))
+x, y = adaptive_separating_streamline(Q, K, i, b, ((-10*x_plot, x_plot), (-y_plot, y_plot)))
     
 # Plot
-fig = plt.figure(figsize=(8,6))
+fig = Figure(figsize=(8,6))
 ax = fig.add_subplot(1, 1, 1)
 
-ax.plot(x,y, label='Well capture zone')
-ax.plot(x_well,y_well, marker='o', color='r',linestyle ='None', label='pumping well') 
-ax.set(xlabel='x (m)', ylabel='y (m)',title='Well capture zone of a pumping well')
+if multiple:
+    # Wells with a pumping rate > 0 (rows of the table that are not complete are skipped)
+    x_w, y_w, Q_w = (np.array([np.nan if v is None else v for v in wells[c]], dtype=float) for c in wells)
+    use = np.isfinite(x_w) & np.isfinite(y_w) & np.isfinite(Q_w) & (Q_w > 0)
+    x_w, y_w, Q_w = x_w[use], y_w[use], Q_w[use]
+    # Rows at the same position are one well with the sum of their rates
+    z_w = x_w + 1j * y_w
+    first = np.array([k for k in range(len(z_w)) if z_w[k] not in z_w[:k]], dtype=int)
+    x_w, y_w, Q_w = x_w[first], y_w[first], np.array([Q_w[z_w == z_w[k]].sum() for k in first], dtype=float)
+if multiple and len(Q_w):
+    X, Y, psi, labels, intervals, stagnation, cuts, report = capture_zones(K, i, b, x_w, y_w, Q_w, (-10*x_plot, x_plot), (-y_plot, y_plot), n_grid)
+    colors = matplotlib.colormaps['tab10'](np.arange(len(Q_w)) % 10)
+    ax.contourf(X, Y, labels, levels=np.arange(-0.5, len(Q_w)), colors=colors, alpha=.2)
+    # Zone boundaries: the streamlines at the bounds of the psi intervals of the wells
+    ax.contour(X, Y, psi, levels=np.unique(intervals[:, :2]), colors='blue', linewidths=0.8)
+    ax.plot(x_w, y_w, marker='o', color='r', linestyle='None', label='pumping wells')
+    ax.plot(stagnation.real, stagnation.imag, marker='x', color='k', linestyle='None', label='stagnation points')
+    ax.set(xlabel='x (m)', ylabel='y (m)',title='Well capture zones of %d pumping wells' % len(Q_w))
+else:
+    if probabilistic:
+        # Probability of capture from the envelopes of all samples, with a running counter of the envelopes
+        counter = st.progress(0., text='Capture envelopes')
+        X, Y = np.meshgrid(np.linspace(-10*x_plot, x_plot, GRID_POINTS), np.linspace(-y_plot, y_plot, GRID_POINTS))
+        probability, sampling = capture_probability(*sample_parameters(K, i, b, Q, sigma_log_K, cv_i, cv_b, cv_Q, n_samples), X, Y,
+                                                    progress=lambda done, total: counter.progress(done / total, text='Capture envelopes: %d of %d' % (done, total)))
+        shading = ax.contourf(X, Y, probability, levels=np.linspace(0, 1, 11), cmap='Blues', alpha=.5)
+        fig.colorbar(shading, ax=ax, label='Probability of capture')
+        lines = ax.contour(X, Y, probability, levels=PROBABILITY_LEVELS, colors=['lightsteelblue', 'steelblue', 'navy'])
+        ax.clabel(lines, fmt=lambda p: '%g %%' % (100*p))
+    ax.plot(x,y, label='Well capture zone')
+    ax.plot(x_well,y_well, marker='o', color='r',linestyle ='None', label='pumping well') 
+    if design:
+        x_p, y_p = (np.array([np.nan if v is None else v for v in plume[c]], dtype=float) for c in plume)
+        use = np.isfinite(x_p) & np.isfinite(y_p)
+        x_p, y_p = x_p[use], y_p[use]
+    if design and len(x_p) >= 3:
+        if optimise:
+            Q_design, x_design, y_design, search = optimal_well(x_p, y_p, K, i, b, max_downstream)
+        else:
+            Q_design, x_design, y_design = minimum_pumping_rate(x_p, y_p, K, i, b, x_well, y_well), x_well, y_well
+        ax.fill(x_p, y_p, color='red', alpha=.3, label='plume')
+        x_env, y_env = adaptive_separating_streamline(Q_design, K, i, b, ((-10*x_plot - x_design, x_plot - x_design), (-y_plot - y_design, y_plot - y_design)))
+        ax.plot(x_env + x_design, y_env + y_design, color='green', linestyle='--', label='design capture zone')
+        ax.plot(x_design, y_design, marker='o', color='green', linestyle='None', label='design well')
+    ax.set(xlabel='x (m)', ylabel='y (m)',title='Well capture zone of a pumping well')
 ax.set(xlim=(-10*x_plot,x_plot), ylim=(-y_plot, y_plot))
 #if revers:
 #    ax.set(xlim=(10*x_plot,-x_plot,), ylim=(-y_plot, y_plot))
@@ -80,13 +133,38 @@ ax.set(xlim=(-10*x_plot,x_plot), ylim=(-y_plot, y_plot))
 #    ax.set(xlim=(-x_plot,10*x_plot), ylim=(-y_plot, y_plot))
     
 
-plt.fill_between(x,y,color='blue', alpha=.1)
-plt.fill_between(x,-y,color='blue', alpha=.1)
+if not multiple and not probabilistic:
+    ax.fill_between(x,y,color='blue', alpha=.1)
+    ax.fill_between(x,-y,color='blue', alpha=.1)
+if isochrones and not multiple:
+    # Positions of the backward tracked particles after 1, 5 and 10 years
+    zones, tracking = travel_time_zones(Q, K, i, b, n)
+    for (years, x_zone, y_zone), color in zip(zones, ['darkorange', 'red', 'darkred']):
+        ax.plot(x_zone, y_zone, color=color, linestyle='--', label='%g-year travel time' % years)
 ax.grid()
-plt.legend()
+ax.legend()
 
 st.pyplot(fig)
     
-st.write("Width of capture zone (m): %5.2f" %(2*ymax))
-st.write('Culmination point x_0 (m):  %5.2f' %x0)
+if multiple:
+    if len(Q_w):
+        st.write("Capture zones: %d wells on %d grid points (%d chunks), %d branch cuts traced along the dividing streamlines, in %5.3f s"
+                 % (report['wells'], report['grid points'], report['chunks'], report['traced cuts'], report['seconds']))
+    else:
+        st.write("Enter at least one well with a pumping rate > 0.")
+else:
+    st.write("Width of capture zone (m): %5.2f" %(2*ymax))
+    st.write('Culmination point x_0 (m):  %5.2f' %x0)
+if design and len(x_p) >= 3:
+    st.write("Smallest pumping rate that captures the plume (m3/s): %6.4f, well at x = %.1f m, y = %.1f m" % (Q_design, x_design, y_design))
+    if optimise:
+        st.write("Well position: bounded Powell search, %d evaluations in %5.3f s" % (search['evaluations'], search['seconds']))
+elif design:
+    st.write("Enter at least three vertices of the plume.")
+if probabilistic:
+    st.write("Capture probability: %d samples in %d chunks, %5.3f s"
+             % (sampling['samples'], sampling['chunks'], sampling['seconds']))
+if isochrones and not multiple and zones:
+    st.write("Travel-time zones: %d particles tracked backward in %d adaptive RK45 steps (%d rejected) in %5.3f s"
+             % (tracking['particles'], tracking['steps'], tracking['rejected'], tracking['seconds']))
     
@@ -0,0 +1,54 @@
+"""The design rate is the smallest pumping rate whose capture zone contains the plume."""
+import numpy as np
+import pytest
+
+import capture_engine
+
+K, i, b = 1E-3, 1E-3, 20.
+PLUME_X, PLUME_Y = np.array(capture_engine.PLUME_X), np.array(capture_engine.PLUME_Y)
+
+
+def plume_edges(points=50):
+    # Points along the edges of the plume polygon
+    s = np.linspace(0., 1., points, endpoint=False)
+    x_next, y_next = np.roll(PLUME_X, -1), np.roll(PLUME_Y, -1)
+    return ((PLUME_X + np.outer(s, x_next - PLUME_X)).ravel(), (PLUME_Y + np.outer(s, y_next - PLUME_Y)).ravel())
+
+
+@pytest.mark.parametrize('x_well, y_well', [(0., 0.), (-100., 50.), (200., -30.)])
+def test_minimum_rate_just_captures_the_plume(x_well, y_well):
+    Q = capture_engine.minimum_pumping_rate(PLUME_X, PLUME_Y, K, i, b, x_well, y_well)
+    x_edge, y_edge = plume_edges()
+    assert capture_engine.in_capture_zone(x_edge, y_edge, Q, K, i, b, x_well, y_well).all()
+    assert not capture_engine.in_capture_zone(PLUME_X, PLUME_Y, 0.999 * Q, K, i, b, x_well, y_well).all()
+
+
+def test_minimum_rate_is_the_limit_of_a_bisection():
+    low, high = 0., 1.
+    for _ in range(60):
+        middle = 0.5 * (low + high)
+        if capture_engine.in_capture_zone(PLUME_X, PLUME_Y, middle, K, i, b).all():
+            high = middle
+        else:
+            low = middle
+    assert capture_engine.minimum_pumping_rate(PLUME_X, PLUME_Y, K, i, b) == pytest.approx(high, rel=1e-9)
+
+
+def test_optimal_well_is_no_worse_than_a_grid_search():
+    Q, x_well, y_well, report = capture_engine.optimal_well(PLUME_X, PLUME_Y, K, i, b)
+    assert PLUME_X.min() <= x_well <= PLUME_X.max() + capture_engine.MAX_DOWNSTREAM
+    assert PLUME_Y.min() <= y_well <= PLUME_Y.max()
+    X, Y = np.meshgrid(np.linspace(PLUME_X.min(), PLUME_X.max() + capture_engine.MAX_DOWNSTREAM, 41),
+                       np.linspace(PLUME_Y.min(), PLUME_Y.max(), 41))
+    grid = min(capture_engine.minimum_pumping_rate(PLUME_X, PLUME_Y, K, i, b, xw, yw)
+               for xw, yw in zip(X.ravel(), Y.ravel()))
+    assert Q <= grid * (1 + 1e-6)
+    assert Q == pytest.approx(capture_engine.minimum_pumping_rate(PLUME_X, PLUME_Y, K, i, b, x_well, y_well))
+
+
+def test_a_well_further_downstream_needs_less_water():
+    rates = [capture_engine.optimal_well(PLUME_X, PLUME_Y, K, i, b, max_downstream)[0]
+             for max_downstream in (0., 100., 500.)]
+    assert rates == sorted(rates, reverse=True)
+    # (towards K i b times the width of the plume)
+    assert rates[-1] > K * i * b * (PLUME_Y.max() - PLUME_Y.min())
@@ -0,0 +1,80 @@
+"""The capture zones of several wells agree with forward particle tracking."""
+import numpy as np
+import pytest
+
+import capture_engine
+
+EXTENT = (-1000., 1000.)
+CHECK_POINTS = 300
+# A tracked point within this distance (m) of a well has entered it
+ENTERED = 0.3
+
+
+def tracked_wells(points, Q0, x_w, y_w, Q_w):
+    # Index of the well that each point flows into, -1 for the points that leave downstream
+    z_wells = x_w + 1j * y_w
+
+    def velocity(z):
+        v = capture_engine.multi_well_discharge(z, Q0, x_w, y_w, Q_w)
+        return np.where(np.abs(z[:, np.newaxis] - z_wells).min(axis=1) > ENTERED / 2, v, 0.)
+
+    paths, _ = capture_engine.track_particles(velocity, points, np.linspace(1e3, 3e9, 3000), rtol=1e-8, atol=1e-3,
+                                      max_steps=10 ** 6)
+    distance = np.abs(paths[:, :, np.newaxis] - z_wells).min(axis=0)
+    return np.where(distance.min(axis=1) < ENTERED, distance.argmin(axis=1), -1)
+
+
+def zone_labels(points, Q0, x_w, y_w, Q_w, intervals, cuts):
+    # Index of the well whose psi intervals contain the psi of each point, -1 outside of all intervals
+    psi = capture_engine.stream_function(points.real, points.imag, Q0, x_w, y_w, Q_w, cuts)
+    lower, upper, well = intervals[np.argsort(intervals[:, 0])].T
+    k = np.clip(np.searchsorted(lower, psi, side='right') - 1, 0, len(lower) - 1)
+    return np.where((psi >= lower[k]) & (psi <= upper[k]), well[k].astype(int), -1)
+
+
+def random_wells(n_wells, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-800, 800, n_wells), rng.uniform(-800, 800, n_wells), rng.uniform(0.001, 0.003, n_wells)
+
+
+@pytest.mark.parametrize('K, i, b, x_w, y_w, Q_w', [
+    # In line with the flow: the downstream well draws water from both sides of the upstream zone
+    (1E-3, 1E-3, 20., (-300., 0.), (0., 0.), (0.003, 0.003)),
+    # Side by side, close together and far apart (a stagnation point between the wells)
+    (1E-3, 1E-3, 20., (0., 0.), (9., -9.), (0.003, 0.003)),
+    (1E-4, 0.002, 10., (0., 0.), (300., -300.), (0.01, 0.01)),
+    (1E-3, 1E-3, 20., *random_wells(5)),
+    # Rates 500 times apart: the stagnation point of the small well lies 8 cm from it
+    (1E-3, 1E-3, 20., (0., -300.), (0., 50.), (0.005, 1e-5)),
+], ids=['in line', 'side by side 18 m', 'side by side 600 m', '5 random wells', 'rates 500 times apart'])
+def test_labels_agree_with_forward_tracking(K, i, b, x_w, y_w, Q_w):
+    x_w, y_w, Q_w = (np.asarray(a, dtype=float) for a in (x_w, y_w, Q_w))
+    Q0 = K * i * b
+    _, _, _, _, intervals, _, cuts, _ = capture_engine.capture_zones(K, i, b, x_w, y_w, Q_w, EXTENT, EXTENT, 100)
+    rng = np.random.default_rng(1)
+    points = rng.uniform(*EXTENT, CHECK_POINTS) + 1j * rng.uniform(*EXTENT, CHECK_POINTS)
+    tracked = tracked_wells(points, Q0, x_w, y_w, Q_w)
+    assert np.count_nonzero(tracked >= 0) > 10
+    np.testing.assert_array_equal(zone_labels(points, Q0, x_w, y_w, Q_w, intervals, cuts), tracked)
+
+
+def test_interval_widths_are_the_pumping_rates():
+    x_w, y_w, Q_w = random_wells(5)
+    intervals = capture_engine.capture_zones(1E-3, 1E-3, 20., x_w, y_w, Q_w, EXTENT, EXTENT, 100)[4]
+    widths = np.bincount(intervals[:, 2].astype(int), intervals[:, 1] - intervals[:, 0], minlength=len(Q_w))
+    np.testing.assert_allclose(widths, Q_w, rtol=1e-3)
+
+
+@pytest.mark.parametrize('Q_w', [(0.005, 1e-5), (1e-5, 0.005), (0.005, 1e-7)])
+def test_intervals_of_very_different_rates_do_not_overlap(Q_w):
+    intervals = capture_engine.capture_zones(1E-3, 1E-3, 20., (0., -300.), (0., 50.), Q_w, (-5000., 500.), EXTENT,
+                                             100)[4]
+    lower, upper, _ = intervals[np.argsort(intervals[:, 0])].T
+    assert np.all(upper[:-1] <= lower[1:] + 0.05 * min(Q_w))
+    widths = np.bincount(intervals[:, 2].astype(int), intervals[:, 1] - intervals[:, 0], minlength=2)
+    np.testing.assert_allclose(widths, Q_w, rtol=1e-3)
+
+
+def test_wells_at_the_same_position_are_rejected():
+    with pytest.raises(ValueError):
+        capture_engine.capture_zones(1E-3, 1E-3, 20., (0., 0.), (10., 10.), (0.003, 0.002), EXTENT, EXTENT, 100)
@@ -0,0 +1,45 @@
+"""Backward particle tracking gives the time-of-travel zones of a well."""
+import numpy as np
+import pytest
+
+import capture_engine
+
+# Defaults of the page and a porosity of 0.25
+Q, K, i, b, n = 0.005, 1E-3, 1E-3, 20., 0.25
+
+
+def test_particles_in_uniform_flow_move_with_it():
+    velocity = 1e-5 - 2e-6j
+    z0 = np.array([0j, 10. + 5j, -3. - 40j])
+    t_out = np.array([1e5, 1e6, 3e7])
+    positions, report = capture_engine.track_particles(lambda z: np.full(z.shape, velocity), z0, t_out, t0=1e4)
+    np.testing.assert_allclose(positions, z0 + velocity * (t_out[:, np.newaxis] - 1e4), atol=1e-8)
+    assert report['unfinished'] == 0
+
+
+def test_travel_time_along_the_upstream_axis_is_exact():
+    # A particle on the -x axis travels L - x0 ln(1 + L / x0) in the time t K i / n
+    zones, report = capture_engine.travel_time_zones(Q, K, i, b, n)
+    x0 = capture_engine.x0_conf(Q, K, i, b)
+    for years, x, y in zones:
+        L = -x[capture_engine.N_PARTICLES // 2]
+        t = n / (K * i) * (L - x0 * np.log(1 + L / x0))
+        assert t == pytest.approx(years * capture_engine.YEAR, rel=1e-4)
+
+
+def test_isochrones_are_nested_and_inside_the_capture_zone():
+    zones, report = capture_engine.travel_time_zones(Q, K, i, b, n)
+    ymax = capture_engine.ymax_conf(Q, K, i, b)
+    reach = [-x.min() for years, x, y in zones]
+    assert reach == sorted(reach)
+    for years, x, y in zones:
+        assert np.all(np.abs(y) < ymax)
+        # (the edge along the separating streamline lies on it)
+        x_envelope = capture_engine.separating_streamline_x(y, Q, K, i, b)
+        assert np.all(x <= x_envelope + 1e-6 * ymax)
+
+
+def test_a_well_that_does_not_pump_has_no_zones():
+    zones, report = capture_engine.travel_time_zones(0., K, i, b, n)
+    assert zones == []
+    assert report['particles'] == 0
@@ -0,0 +1,48 @@
+"""The probability of capture counts the capture envelopes of the samples."""
+import numpy as np
+import pytest
+
+import capture_engine
+
+K, i, b, Q = 1e-3, 1e-3, 20., 0.005
+
+
+def test_a_well_that_does_not_pump_captures_nothing():
+    # Q = 0 is not sampled (the redraw of the samples <= 0 never ended)
+    samples = capture_engine.sample_parameters(K, i, b, 0., 0.3, 0.1, 0.1, 0.1, 1000)
+    assert np.all(samples[3] == 0.)
+    X, Y = np.meshgrid(np.linspace(-1000., 100., 50), np.linspace(-300., 300., 40))
+    probability, report = capture_engine.capture_probability(*samples, X, Y)
+    assert np.all(probability == 0.)
+    assert report['samples'] == 1000
+
+
+def test_certain_parameters_are_not_sampled():
+    samples = capture_engine.sample_parameters(K, i, b, Q, 0., 0., 0., 0., 100)
+    for sample, value in zip(samples, (K, i, b, Q)):
+        np.testing.assert_allclose(sample, value)
+
+
+def test_samples_are_positive():
+    samples = capture_engine.sample_parameters(K, i, b, Q, 0.3, 0.5, 0.5, 0.5, 10000)
+    assert all(np.all(sample > 0) for sample in samples)
+
+
+def test_certain_parameters_capture_inside_the_separating_streamline():
+    ymax = capture_engine.ymax_conf(Q, K, i, b)
+    y = np.linspace(-0.9, 0.9, 19) * ymax
+    x = capture_engine.separating_streamline_x(y, Q, K, i, b)
+    samples = capture_engine.sample_parameters(K, i, b, Q, 0., 0., 0., 0., 10)
+    probability, report = capture_engine.capture_probability(*samples, np.concatenate([x - 10., x + 10.]),
+                                                             np.concatenate([y, y]))
+    np.testing.assert_array_equal(probability, np.repeat([1., 0.], len(y)))
+
+
+@pytest.mark.parametrize('chunk_samples', [1, 333, 10 ** 6])
+def test_chunks_add_up_to_the_same_probability(chunk_samples):
+    samples = capture_engine.sample_parameters(K, i, b, Q, 0.3, 0.1, 0.1, 0.1, 1000)
+    X, Y = np.meshgrid(np.linspace(-1000., 100., 30), np.linspace(-300., 300., 20))
+    probability, report = capture_engine.capture_probability(*samples, X, Y, chunk_samples=chunk_samples)
+    expected, _ = capture_engine.capture_probability(*samples, X, Y, chunk_samples=1000)
+    np.testing.assert_array_equal(probability, expected)
+    assert report['chunks'] == -(-1000 // chunk_samples)
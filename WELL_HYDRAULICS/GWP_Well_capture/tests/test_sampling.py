@@ -0,0 +1,59 @@
+"""Adaptive sampling draws the curves within the tolerance of the plot."""
+import numpy as np
+import pytest
+
+import capture_engine
+
+Q, K, i, b = 0.005, 1E-3, 1E-3, 20.
+# The default view of the page: x from -5000 to 500 m, y from -1000 to 1000 m
+VIEW = ((-5000., 500.), (-1000., 1000.))
+
+
+def deviation(curve, t, x, y, scale):
+    # Distance of the curve at the middle of every segment from the segment, and the lengths of the segments, in
+    # units of scale
+    x_mid, y_mid = curve(0.5 * (t[1:] + t[:-1]))
+    px, py, mx, my = x / scale[0], y / scale[1], x_mid / scale[0], y_mid / scale[1]
+    dx, dy = np.diff(px), np.diff(py)
+    length = np.hypot(dx, dy)
+    s = np.clip(((mx - px[:-1]) * dx + (my - py[:-1]) * dy) / length ** 2, 0., 1.)
+    return np.hypot(mx - px[:-1] - s * dx, my - py[:-1] - s * dy), length
+
+
+@pytest.mark.parametrize('tolerance', [1e-2, 1e-3, 1e-4])
+def test_segments_are_within_the_tolerance_of_a_circle(tolerance):
+    circle = lambda t: (np.cos(t), np.sin(t))
+    t, x, y = capture_engine.adaptive_curve(circle, 0., 2 * np.pi, tolerance=tolerance)
+    distance, length = deviation(circle, t, x, y, (1., 1.))
+    assert distance.max() <= tolerance
+    assert length.max() <= capture_engine.MAX_SEGMENT
+    # (the sagitta of a segment of length l is l^2 / 8: about pi / sqrt(2 tolerance) points, not many more)
+    assert len(t) < 3 * np.pi / np.sqrt(2 * tolerance) + 2 * np.pi / capture_engine.MAX_SEGMENT
+
+
+def test_separating_streamline_is_drawn_within_the_tolerance_of_the_view():
+    x, y = capture_engine.adaptive_separating_streamline(Q, K, i, b, VIEW)
+    spans = (VIEW[0][1] - VIEW[0][0], VIEW[1][1] - VIEW[1][0])
+    np.testing.assert_allclose(x, capture_engine.separating_streamline_x(y, Q, K, i, b), rtol=1e-12)
+    # Both arms run past the left edge of the view
+    assert x[0] < VIEW[0][0] and x[-1] < VIEW[0][0]
+    ymax = capture_engine.ymax_conf(Q, K, i, b)
+    streamline = lambda t: (capture_engine.separating_streamline_x(t * ymax, Q, K, i, b), t * ymax)
+    distance, length = deviation(streamline, y / ymax, x, y, spans)
+    assert distance.max() <= capture_engine.TOLERANCE
+    # (100 points evenly spaced in y leave gaps of kilometres along the arms)
+    assert len(x) < 100
+
+
+def test_segments_beyond_the_view_are_not_refined():
+    circle = lambda t: (np.cos(t), np.sin(t))
+    t, x, y = capture_engine.adaptive_curve(circle, 0., 2 * np.pi, tolerance=1e-4, view=((-2., 0.), (-2., 2.)))
+    distance, _ = deviation(circle, t, x, y, (1., 1.))
+    left = (x[:-1] < 0) & (x[1:] < 0)
+    assert distance[left].max() <= 1e-4
+    assert np.count_nonzero(x > 0) < np.count_nonzero(x < 0) / 4
+
+
+def test_the_number_of_points_is_bounded():
+    t, x, y = capture_engine.adaptive_curve(lambda t: (t, np.sin(1e3 * t)), 0., 1., tolerance=1e-6, max_points=500)
+    assert len(t) < 2 * 500